@@ -0,0 +1,205 @@
+"""
+Ko'p CV ni Telegramsiz yaratish — JSONL (har qatorda bitta user_data) dan.
+
+    python -m cv_generator batch records.jsonl -o out/ -f both
+    python -m cv_generator batch records.jsonl --combined all.pdf
+    cat records.jsonl | python -m cv_generator batch - -o out/
+
+Yozuvlar oqim bilan o'qiladi: pool'da bir vaqtda ko'pi bilan --window ta ish
+turadi, fayllarni ishchi jarayonlarning o'zi yozadi — xotira yozuvlar soniga
+bog'liq emas. --combined rejimida hamma CV bitta PDF ga (har biri alohida
+sahifa) asosiy jarayonda ketma-ket chiziladi: ReportLab canvas'ini jarayonlar
+orasida bo'lib bo'lmaydi.
+
+Oxirida: nechta hujjat, soniyada nechta, va xato bo'lgan qatorlar ro'yxati.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from cv_model import CVModel, SECTIONS
+from render_cache import LIST_FIELDS, TEXT_FIELDS
+from render_pool import RENDER_WORKERS, _init_worker, render
+
+KINDS = {'pdf': ['pdf'], 'docx': ['docx'], 'both': ['pdf', 'docx']}
+
+
+class RecordError(ValueError):
+    """Yozuv user_data shakliga mos emas"""
+
+
+# ─── Yozuvlar ─────────────────────────────────────────────────────────────────
+
+def read_records(stream):
+    """(qator raqami, dict yoki RecordError) — bo'sh qatorlar o'tkazib yuboriladi"""
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield lineno, RecordError(f"invalid JSON: {e}")
+            continue
+        try:
+            yield lineno, check_record(rec)
+        except RecordError as e:
+            yield lineno, e
+
+
+def check_record(rec):
+    """Renderer kutgan turlarni tekshiradi, xatoni aniq aytadi"""
+    if not isinstance(rec, dict):
+        raise RecordError(f"expected an object, got {type(rec).__name__}")
+    for k in TEXT_FIELDS:
+        if rec.get(k) is not None and not isinstance(rec[k], str):
+            raise RecordError(f"{k}: expected a string")
+    for k in LIST_FIELDS:
+        v = rec.get(k)
+        if v is not None and not (isinstance(v, list) and all(isinstance(x, str) for x in v)):
+            raise RecordError(f"{k}: expected a list of strings")
+    for name in SECTIONS:
+        rec.pop(name, None)     # tahlil qilingan bo'limlar faqat bot ichida
+    return rec
+
+
+def _slug(text):
+    return re.sub(r'[^\w-]+', '_', text).strip('_')[:40]
+
+
+def output_name(lineno, rec, kind):
+    who = _slug(f"{rec.get('first_name', '')}_{rec.get('last_name', '')}") or 'CV'
+    return f"{lineno:05d}_{who}.{kind}"
+
+
+# ─── Render ───────────────────────────────────────────────────────────────────
+
+def _render_one(lineno, rec, kinds, out_dir):
+    """Ishchi jarayonda: fayllarni yozadi, yo'llarini qaytaradi"""
+    model = CVModel.from_data(rec)
+    paths = []
+    for kind in kinds:
+        path = os.path.join(out_dir, output_name(lineno, rec, kind))
+        with open(path + '.tmp', 'wb') as f:
+            f.write(render(kind, model))
+        os.replace(path + '.tmp', path)
+        paths.append(path)
+    return paths
+
+
+def run_files(records, kinds, out_dir, workers, window, report):
+    """Har bir yozuv uchun alohida fayl(lar), ProcessPoolExecutor da"""
+    os.makedirs(out_dir, exist_ok=True)
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+
+        def collect(done):
+            for fut in done:
+                lineno = pending.pop(fut)
+                try:
+                    report.ok(lineno, len(fut.result()))
+                except Exception as e:
+                    report.fail(lineno, e)
+
+        for lineno, rec in records:
+            if isinstance(rec, Exception):
+                report.fail(lineno, rec)
+                continue
+            if len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[pool.submit(_render_one, lineno, rec, kinds, out_dir)] = lineno
+        collect(wait(pending).done)
+
+
+def run_combined(records, path, report):
+    """Hamma CV bitta PDF da, har biri alohida sahifa"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas as rl_canvas
+
+    from cv_generator import draw_pdf
+
+    c = rl_canvas.Canvas(path, pagesize=A4, invariant=1)
+    for lineno, rec in records:
+        if isinstance(rec, Exception):
+            report.fail(lineno, rec)
+            continue
+        try:
+            model = CVModel.from_data(rec)
+            draw_pdf(c, model)
+        except Exception as e:
+            report.fail(lineno, e)
+            continue
+        c.showPage()
+        report.ok(lineno, 1)
+    c.save()
+
+
+# ─── Hisobot ──────────────────────────────────────────────────────────────────
+
+class Report:
+
+    def __init__(self, out=sys.stderr, every=100):
+        self.out      = out
+        self.every    = every
+        self.records  = 0
+        self.docs     = 0
+        self.failures = []      # (qator, xato)
+        self.started  = time.perf_counter()
+
+    def ok(self, lineno, docs):
+        self.records += 1
+        self.docs += docs
+        if self.records % self.every == 0:
+            print(f"  {self.records} records, {self.rate():.1f} docs/s", file=self.out)
+
+    def fail(self, lineno, err):
+        self.failures.append((lineno, err))
+
+    def rate(self):
+        return self.docs / max(time.perf_counter() - self.started, 1e-9)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        print(f"{self.docs} documents from {self.records} records in {elapsed:.2f} s "
+              f"({self.rate():.1f} docs/s), {len(self.failures)} failed", file=self.out)
+        for lineno, err in sorted(self.failures, key=lambda f: f[0]):
+            print(f"  line {lineno}: {type(err).__name__}: {err}", file=self.out)
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m cv_generator')
+    sub = ap.add_subparsers(dest='command', required=True)
+    b = sub.add_parser('batch', help="JSONL dan ko'p CV yaratish")
+    b.add_argument('input', help="JSONL fayl ('-' — stdin)")
+    b.add_argument('-o', '--out', default='cv_out', help="natija papkasi")
+    b.add_argument('-f', '--format', choices=sorted(KINDS), default='pdf')
+    b.add_argument('--combined', metavar='FILE.pdf',
+                   help="hamma CV ni bitta PDF ga yozish (--format e'tiborsiz)")
+    b.add_argument('-j', '--workers', type=int, default=RENDER_WORKERS)
+    b.add_argument('--window', type=int, default=0,
+                   help="pool'dagi ishlar chegarasi (0 = workers*4)")
+    args = ap.parse_args(argv)
+
+    report = Report()
+    stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    try:
+        records = read_records(stream)
+        if args.combined:
+            run_combined(records, args.combined, report)
+        else:
+            workers = max(1, args.workers)
+            run_files(records, KINDS[args.format], args.out, workers,
+                      args.window or workers * 4, report)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    report.summary()
+    return 1 if report.failures else 0
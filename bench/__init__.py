@@ -0,0 +1,15 @@
+"""
+Render yo'llari uchun benchmark to'plami.
+
+    python -m bench                          # hammasi, natija ekranga
+    python -m bench --json out.json          # natijani JSON ga yozish
+    python -m bench --baseline base.json     # saqlangan natija bilan solishtirish
+    python -m bench --only render imports    # faqat tanlangan guruhlar
+
+Modullar:
+  data     — sintetik CV profillari (minimal ... maksimal, kirill, rasm bilan)
+  legacy   — eski algoritmlar (bir xillik tekshiruvi uchun)
+  suite    — bir xillik tekshiruvlari va vaqt o'lchovlari
+  imports  — sovuq va iliq import / birinchi render vaqti
+  report   — JSON natija va baseline bilan solishtirish
+"""
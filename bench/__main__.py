@@ -0,0 +1,38 @@
+import argparse
+import sys
+
+from bench import report
+from bench.imports import bench_imports, bench_startup
+from bench.load import bench_load
+from bench.suite import GROUPS
+
+GROUPS = dict(GROUPS, imports=bench_imports, startup=bench_startup,
+              load=bench_load)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m bench')
+    ap.add_argument('--only', nargs='+', choices=list(GROUPS), help="faqat shu guruhlar")
+    ap.add_argument('--json', metavar='FILE', help="natijani JSON ga yozish")
+    ap.add_argument('--baseline', metavar='FILE', help="shu natija bilan solishtirish")
+    ap.add_argument('--tolerance', type=float, default=0.2,
+                    help="ruxsat etilgan sekinlashish (0.2 = 20%%)")
+    args = ap.parse_args(argv)
+
+    results = {}
+    for name in args.only or GROUPS:
+        print(f"\n── {name} " + '─' * (60 - len(name)))
+        results.update(GROUPS[name]())
+
+    if args.json:
+        report.save(args.json, results)
+    if args.baseline:
+        regressions = report.compare(results, report.load(args.baseline), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
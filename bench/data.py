@@ -0,0 +1,80 @@
+"""
+Sintetik CV ma'lumotlari — user_data shaklida, seed bo'yicha takrorlanuvchi.
+"""
+
+import os
+import random
+import tempfile
+
+WORDS_EN = ("backend developer building reliable services payments platform api design "
+            "mentoring code review postgresql redis kubernetes observability latency "
+            "throughput migration architecture internationalization").split()
+WORDS_RU = ("разработка сервисов платежной платформы проектирование наставничество "
+            "ревью кода миграция архитектура мониторинг").split()
+
+NAMES_EN = ['Ali', 'Valiyev', 'Dilnoza', 'Karimova', 'Jasur', 'Rahimov']
+NAMES_RU = ['Алишер', 'Усманов', 'Екатерина', 'Смирнова', 'Дмитрий', 'Кузнецов']
+LEVELS   = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2', 'Native', 'Intermediate']
+
+
+def corpus(n, words, seed=1):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        k = rnd.randint(5, 400)
+        out.append(' '.join(rnd.choice(words) for _ in range(k)))
+    return out
+
+
+def cv_data(rnd, items, words=WORDS_EN + WORDS_RU, names=NAMES_EN, objective=(10, 60)):
+    """items ta yozuvli tasodifiy user_data"""
+    def phrase(lo, hi):
+        return ' '.join(rnd.choice(words) for _ in range(rnd.randint(lo, hi)))
+    return {
+        'first_name': rnd.choice(names), 'last_name': rnd.choice(names),
+        'email': 'user@example.com', 'phone': '+998901234567',
+        'address': phrase(2, 5), 'dob': '01.01.1990', 'nationality': phrase(1, 1),
+        'linkedin': 'linkedin.com/in/user', 'github': 'github.com/user',
+        'objective': phrase(*objective), 'hobbies': phrase(3, 10),
+        'education_list': [f"{phrase(2,4)} | {phrase(2,5)} | 2015-2019 | 3.{i}" for i in range(items)],
+        'work_list': [f"{phrase(1,3)} | {phrase(1,3)} | 20{10+i}-20{11+i} | "
+                      + ', '.join(phrase(4, 12) for _ in range(rnd.randint(1, 5)))
+                      for i in range(items)],
+        'skills_list': [f"{phrase(1,2)}: {phrase(3,8)}" for _ in range(items)],
+        'lang_list': [f"{phrase(1,1)} | {rnd.choice(LEVELS)}" for _ in range(items)],
+        'cert_list': [f"{phrase(1,4)} | {phrase(1,2)} | 2020" for _ in range(items)],
+    }
+
+
+def make_photo(path, size=(1600, 1200)):
+    """Telegram'dan kelgandek katta JPEG"""
+    from PIL import Image
+
+    w, h = size
+    img = Image.linear_gradient('L').resize(size).convert('RGB')
+    img.paste((40, 90, 160), (w // 4, h // 4, w // 2, h // 2))
+    img.save(path, 'JPEG', quality=90)
+    return path
+
+
+def profiles(seed=7, photo_dir=None):
+    """nom → user_data. Rasmli profillar uchun photo_dir ga JPEG yoziladi."""
+    from photo import prepare_avatar
+
+    rnd = random.Random(seed)
+    minimal = {'first_name': 'Ali', 'last_name': 'Valiyev', 'email': 'ali@example.com'}
+    typical = cv_data(rnd, 2, words=WORDS_EN)
+    typical['work_list'].append(cv_data(rnd, 1, words=WORDS_EN)['work_list'][0])
+    maximal = cv_data(rnd, 12, words=WORDS_EN, objective=(120, 160))
+    cyrillic = cv_data(rnd, 10, words=WORDS_RU, names=NAMES_RU, objective=(80, 120))
+
+    out = {'minimal': minimal, 'typical': typical, 'maximal': maximal, 'cyrillic': cyrillic}
+
+    photo_dir = photo_dir or tempfile.mkdtemp(prefix='cv_bench_')
+    raw = make_photo(os.path.join(photo_dir, 'raw.jpg'))
+    ready = os.path.join(photo_dir, 'avatar.jpg')
+    with open(raw, 'rb') as f, open(ready, 'wb') as g:
+        g.write(prepare_avatar(f.read()))
+    out['photo_raw']   = dict(typical, photo=raw)
+    out['photo_ready'] = dict(typical, photo=ready, photo_ready=True)
+    return out
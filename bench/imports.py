@@ -0,0 +1,98 @@
+"""
+Sovuq va iliq import, birinchi render.
+
+Har o'lchov yangi python jarayonida qilinadi (sys.modules bo'sh):
+  import.<modul>.cold  — toza jarayonda import
+  import.<modul>.warm  — reportlab/docx/PIL/telegram oldindan yuklangan
+                         jarayonda — faqat bizning modullar narxi
+  first_render.<kind>.cold / .warm — jarayondagi birinchi va ikkinchi render
+
+bench_startup — bot importi uchun byudjet: render kutubxonalari yuklanmasligi
+va bot modullarining o'z import vaqti STARTUP_BUDGET_MS dan oshmasligi shart.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['cv_generator', 'docx_stream', 'bot']
+DEPS = ('import reportlab.pdfgen.canvas, docx, PIL.Image, telegram.ext\n')
+
+# bot ishga tushishida yuklanmasligi kerak bo'lgan modullar
+HEAVY = ('reportlab', 'docx', 'lxml', 'PIL', 'cv_generator', 'docx_stream', 'textlayout', 'preview')
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "60"))
+
+_IMPORT = '''
+import time, json
+{pre}
+t = time.perf_counter()
+import {mod}
+print(json.dumps((time.perf_counter() - t) * 1000))
+'''
+
+_RENDER = '''
+import time, json
+from cv_generator import render_pdf_bytes, render_docx_bytes
+data = {data!r}
+out = {{}}
+for kind, fn in (('pdf', render_pdf_bytes), ('docx', render_docx_bytes)):
+    t = time.perf_counter(); fn(data); cold = time.perf_counter() - t
+    t = time.perf_counter(); fn(data); warm = time.perf_counter() - t
+    out[kind] = (cold * 1000, warm * 1000)
+print(json.dumps(out))
+'''
+
+
+_STARTUP = '''
+import sys, time, json
+import telegram.ext
+t = time.perf_counter()
+import bot
+dt = (time.perf_counter() - t) * 1000
+print(json.dumps([dt, [m for m in {heavy!r} if m in sys.modules]]))
+'''
+
+
+def _child(code):
+    res = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                         capture_output=True, text=True)
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def bench_imports(runs=5):
+    from bench.data import profiles
+
+    r = {}
+    for mod in MODULES:
+        cold = [_child(_IMPORT.format(pre='', mod=mod)) for _ in range(runs)]
+        warm = [_child(_IMPORT.format(pre=DEPS, mod=mod)) for _ in range(runs)]
+        r[f'import.{mod}.cold'] = statistics.median(cold)
+        r[f'import.{mod}.warm'] = statistics.median(warm)
+        print(f"import {mod:<13} cold {r[f'import.{mod}.cold']:7.1f} ms   "
+              f"warm {r[f'import.{mod}.warm']:7.1f} ms")
+
+    data = profiles()['typical']
+    samples = [_child(_RENDER.format(data=data)) for _ in range(runs)]
+    for kind in ('pdf', 'docx'):
+        cold = statistics.median(s[kind][0] for s in samples)
+        warm = statistics.median(s[kind][1] for s in samples)
+        r[f'first_render.{kind}.cold'] = cold
+        r[f'first_render.{kind}.warm'] = warm
+        print(f"render {kind:<13} first {cold:6.1f} ms   second {warm:6.1f} ms")
+    return r
+
+
+def bench_startup(runs=5, budget_ms=STARTUP_BUDGET_MS):
+    """import bot: telegram'dan tashqari o'z modullarimiz narxi va taqiqlangan importlar"""
+    samples = [_child(_STARTUP.format(heavy=HEAVY)) for _ in range(runs)]
+    ms = statistics.median(dt for dt, _ in samples)
+    loaded = sorted({m for _, mods in samples for m in mods})
+    print(f"import bot (telegram preloaded) {ms:6.1f} ms   budget {budget_ms:.0f} ms")
+    assert not loaded, f"render libraries imported at bot startup: {loaded}"
+    assert ms <= budget_ms, f"bot import {ms:.1f} ms exceeds budget {budget_ms:.0f} ms"
+    print("startup budget: OK")
+    return {'startup.bot': ms}
@@ -0,0 +1,382 @@
+"""
+Eski algoritmlar — yangilari bilan natija bir xilligini tekshirish va
+tezlikni solishtirish uchun.
+"""
+
+import os
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from cv_model import CVModel
+from textlayout import truncate, wrap
+
+
+def legacy_wrap(text, font, size, max_w):
+    words = str(text).split()
+    lines, line = [], ''
+    for w in words:
+        t = (line + ' ' + w).strip()
+        if stringWidth(t, font, size) <= max_w:
+            line = t
+        else:
+            lines.append(line)
+            line = w
+    if line:
+        lines.append(line)
+    return lines
+
+
+def legacy_truncate(text, font, size, max_w):
+    text = str(text)
+    if stringWidth(text, font, size) <= max_w:
+        return text
+    while text and stringWidth(text + '...', font, size) > max_w:
+        text = text[:-1]
+    return text + '...'
+
+
+def legacy_docx_skeleton():
+    """Har renderda Document() va jadvalni noldan qurish (eski generate_docx boshi)"""
+    from docx import Document
+    from docx.shared import Cm
+    from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
+    from docx.oxml.ns import qn
+    from docx.oxml import OxmlElement
+
+    doc = Document()
+    for sec in doc.sections:
+        sec.top_margin, sec.bottom_margin = Cm(0), Cm(1)
+        sec.left_margin, sec.right_margin = Cm(0), Cm(0)
+        sec.page_width, sec.page_height = Cm(21), Cm(29.7)
+    tbl = doc.add_table(rows=1, cols=2)
+    tbl.alignment = WD_TABLE_ALIGNMENT.LEFT
+    tbl.allow_autofit = False
+    sc, mc = tbl.cell(0,0), tbl.cell(0,1)
+    for cell, twips, hx in ((sc, 3570, '1B3A6B'), (mc, 8250, 'FFFFFF')):
+        tcPr = cell._tc.get_or_add_tcPr()
+        tcW = tcPr.find(qn('w:tcW'))
+        if tcW is None:
+            tcW = OxmlElement('w:tcW')
+            tcPr.append(tcW)
+        tcW.set(qn('w:w'), str(twips))
+        tcW.set(qn('w:type'), 'dxa')
+        shd = OxmlElement('w:shd')
+        shd.set(qn('w:val'),'clear')
+        shd.set(qn('w:color'),'auto')
+        shd.set(qn('w:fill'), hx)
+        tcPr.append(shd)
+        cell.vertical_alignment = WD_ALIGN_VERTICAL.TOP
+    return doc, sc, mc
+
+
+# ─── PDF: shablon rejasidan oldingi draw_pdf ──────────────────────────────────
+
+PAGE_W, PAGE_H = A4          # 595 x 842 pt
+SB_W   = 63 * mm             # sidebar kengligi
+MN_X   = SB_W                # main ustun boshlanishi
+MN_W   = PAGE_W - SB_W
+PAD    = 7 * mm              # ichki bo'shliq
+
+# ── Ranglar ───────────────────────────────────────────────────────────────────
+BG     = colors.HexColor('#1B3A6B')   # sidebar fon
+ACCENT = colors.HexColor('#2761AB')   # asosiy ko'k
+GOLD   = colors.HexColor('#E9B949')   # oltin
+WHITE  = colors.white
+DARK   = colors.HexColor('#1C1C1C')
+GRAY   = colors.HexColor('#5A5A5A')
+LGRAY  = colors.HexColor('#E8EEF6')   # bo'limlar orasidagi chiziq
+
+# ── Shriftlar ─────────────────────────────────────────────────────────────────
+RG = 'Helvetica'
+BD = 'Helvetica-Bold'
+IT = 'Helvetica-Oblique'
+
+# ── Razmlar ───────────────────────────────────────────────────────────────────
+S_NAME = 19
+S_SEC  = 11
+S_JOB  = 10
+S_BODY = 9.5
+S_SM   = 8.5
+S_SB_T = 7.5   # sidebar title
+S_SB_V = 8.5   # sidebar value
+
+
+def sb_draw(c, text, font, size, x, y, max_w):
+    """Matnni max_w ga sig'masa qisqartiradi"""
+    c.drawString(x, y, truncate(str(text), font, size, max_w))
+
+
+def sb_wrap(c, text, font, size, x, y, max_w, lh):
+    """Matnni qatorlarga bo'lib chiqaradi, sidebar uchun"""
+    for line in wrap(str(text), font, size, max_w):
+        c.drawString(x, y, line)
+        y -= lh
+    return y
+
+
+def mn_wrap(c, text, font, size, x, y, max_w, lh, color=DARK):
+    """Main ustun uchun word wrap"""
+    c.setFillColor(color)
+    c.setFont(font, size)
+    for line in wrap(str(text), font, size, max_w):
+        c.drawString(x, y, line)
+        y -= lh
+    return y
+
+
+# ─── Til darajasi doiralari ───────────────────────────────────────────────────
+
+def draw_dots(c, x, y, filled, total=5):
+    r, gap = 2.5, 7
+    for i in range(total):
+        c.setFillColor(GOLD if i < filled else colors.HexColor('#334F7A'))
+        c.circle(x + i*gap, y, r, fill=1, stroke=0)
+
+
+
+def legacy_draw_pdf(c, data):
+    """Shablonsiz, qo'lda yozilgan Europass chizish (pdf_plan dan oldingi draw_pdf)"""
+    cv = CVModel.from_data(data)
+
+    # =====================================================================
+    # SIDEBAR
+    # =====================================================================
+    c.setFillColor(BG)
+    c.rect(0, 0, SB_W, PAGE_H, fill=1, stroke=0)
+
+    # ── RASM ─────────────────────────────────────────────────────────────
+    first = cv.first_name
+    last  = cv.last_name
+    photo = cv.photo
+    sz    = 48 * mm
+    px    = (SB_W - sz) / 2
+    py    = PAGE_H - sz - 10*mm
+    cxp   = px + sz/2
+    cyp   = py + sz/2
+
+    if photo and os.path.exists(photo):
+        try:
+            if cv.photo_ready:
+                # photo.prepare_avatar tayyorlagan JPEG — PIL siz joylanadi
+                img = photo
+            else:
+                from reportlab.lib.utils import ImageReader
+                from photo import prepare_avatar
+                with open(photo, 'rb') as f:
+                    img = ImageReader(BytesIO(prepare_avatar(f.read())))
+            c.saveState()
+            path = c.beginPath()
+            path.circle(cxp, cyp, sz/2)
+            c.clipPath(path, stroke=0, fill=0)
+            c.drawImage(img, px, py, width=sz, height=sz,
+                        preserveAspectRatio=True, mask='auto')
+            c.restoreState()
+        except Exception:
+            c.setFillColor(ACCENT)
+            c.circle(cxp, cyp, sz/2, fill=1, stroke=0)
+            initials = (first[:1]+last[:1]).upper()
+            c.setFillColor(GOLD)
+            c.setFont(BD, 26)
+            tw = c.stringWidth(initials, BD, 26)
+            c.drawString(cxp-tw/2, cyp-9, initials)
+    else:
+        c.setFillColor(ACCENT)
+        c.circle(cxp, cyp, sz/2, fill=1, stroke=0)
+        initials = (first[:1]+last[:1]).upper()
+        c.setFillColor(GOLD)
+        c.setFont(BD, 26)
+        tw = c.stringWidth(initials, BD, 26)
+        c.drawString(cxp-tw/2, cyp-9, initials)
+
+    # Aylana chegara
+    c.setStrokeColor(GOLD)
+    c.setLineWidth(2.5)
+    c.circle(cxp, cyp, sz/2, fill=0, stroke=1)
+
+    sb_y = py - 7*mm
+    sb_max = SB_W - PAD*2   # sidebar matn maksimal kengligi
+
+    def sb_sec(title, y):
+        y -= 9*mm
+        c.setFillColor(GOLD)
+        c.setFont(BD, S_SB_T)
+        c.drawString(PAD, y, title.upper())
+        y -= 3
+        c.setStrokeColor(GOLD)
+        c.setLineWidth(0.5)
+        c.line(PAD, y, SB_W-PAD, y)
+        return y - 4.5
+
+    def sb_lbl(label, y):
+        c.setFillColor(colors.HexColor('#9BB8D4'))
+        c.setFont(BD, 6.5)
+        c.drawString(PAD, y, label.upper())
+        return y - 3.5*mm
+
+    def sb_val(text, y):
+        if not text: return y
+        c.setFillColor(WHITE)
+        c.setFont(RG, S_SB_V)
+        y = sb_wrap(c, text, RG, S_SB_V, PAD, y, sb_max, 3.8*mm)
+        return y - 1.5*mm
+
+    # ── CONTACT ───────────────────────────────────────────────────────────
+    sb_y = sb_sec('Contact', sb_y)
+    for lbl, key in [('Email','email'),('Phone','phone'),('Address','address')]:
+        v = getattr(cv, key)
+        if v:
+            sb_y = sb_lbl(lbl, sb_y)
+            sb_y = sb_val(v, sb_y)
+    for lbl, key in [('LinkedIn','linkedin'),('GitHub','github'),('Website','website')]:
+        v = getattr(cv, key)
+        if v:
+            sb_y = sb_lbl(lbl, sb_y)
+            sb_y = sb_val(v, sb_y)
+
+    # ── PERSONAL ──────────────────────────────────────────────────────────
+    sb_y = sb_sec('Personal', sb_y)
+    if cv.dob:
+        sb_y = sb_lbl('Date of Birth', sb_y)
+        sb_y = sb_val(cv.dob, sb_y)
+    if cv.nationality:
+        sb_y = sb_lbl('Nationality', sb_y)
+        sb_y = sb_val(cv.nationality, sb_y)
+
+    # ── LANGUAGES ─────────────────────────────────────────────────────────
+    if cv.languages:
+        sb_y = sb_sec('Languages', sb_y)
+        for lg in cv.languages:
+            c.setFillColor(WHITE)
+            c.setFont(BD, 9)
+            sb_draw(c, lg.lang, BD, 9, PAD, sb_y, sb_max)
+            sb_y -= 3.8*mm
+            c.setFillColor(GOLD)
+            c.setFont(IT, 8)
+            c.drawString(PAD, sb_y, lg.level)
+            draw_dots(c, PAD + 24*mm, sb_y + 1.5, lg.dots)
+            sb_y -= 6*mm
+
+    # ── SKILLS ────────────────────────────────────────────────────────────
+    if cv.skills:
+        sb_y = sb_sec('Skills', sb_y)
+        for sk in cv.skills:
+            c.setFillColor(GOLD)
+            c.setFont(BD, 7.5)
+            c.drawString(PAD, sb_y, sk.cat.upper())
+            sb_y -= 3.5*mm
+            c.setFillColor(WHITE)
+            c.setFont(RG, S_SB_V)
+            sb_y = sb_wrap(c, sk.sk, RG, S_SB_V, PAD, sb_y, sb_max, 3.8*mm)
+            sb_y -= 2*mm
+
+    # =====================================================================
+    # MAIN USTUN
+    # =====================================================================
+
+    # Yuqori sariq chiziq
+    c.setFillColor(GOLD)
+    c.rect(MN_X, PAGE_H - 36*mm, 4, 36*mm, fill=1, stroke=0)
+
+    # ── ISMO ─────────────────────────────────────────────────────────────
+    mn_y = PAGE_H - 11*mm
+    c.setFillColor(BG)
+    c.setFont(BD, S_NAME)
+    name_str = first.upper()
+    c.drawString(MN_X + PAD, mn_y, name_str)
+    nw = c.stringWidth(name_str + ' ', BD, S_NAME)
+    c.setFillColor(ACCENT)
+    c.drawString(MN_X + PAD + nw, mn_y, last.upper())
+    mn_y -= 6*mm
+
+    # ── OBJECTIVE ─────────────────────────────────────────────────────────
+    obj = cv.objective
+    if obj:
+        mn_y = mn_wrap(c, obj, IT, S_BODY,
+                       MN_X+PAD, mn_y, MN_W-PAD*2, 4.5*mm, GRAY)
+    mn_y -= 3*mm
+
+    mn_max = MN_W - PAD*2
+
+    def mn_sec(title, y):
+        y -= 6*mm
+        # Section chiziq
+        c.setStrokeColor(ACCENT)
+        c.setLineWidth(1.5)
+        c.line(MN_X+PAD, y+1*mm, MN_X+PAD+4*mm, y+1*mm)
+        c.setFillColor(DARK)
+        c.setFont(BD, S_SEC)
+        c.drawString(MN_X+PAD+5.5*mm, y, title.upper())
+        y -= 2*mm
+        c.setStrokeColor(LGRAY)
+        c.setLineWidth(0.8)
+        c.line(MN_X+PAD, y, PAGE_W-PAD, y)
+        return y - 4*mm
+
+    def mn_entry(title, subtitle, years, bullets, y):
+        # Sarlavha + yil
+        c.setFillColor(DARK)
+        c.setFont(BD, S_JOB)
+        c.drawString(MN_X+PAD, y, title)
+        c.setFillColor(GRAY)
+        c.setFont(IT, S_SM)
+        rw = c.stringWidth(years, IT, S_SM)
+        c.drawString(PAGE_W-PAD-rw, y, years)
+        y -= 4.5*mm
+
+        # Subtitle (kompaniya / muassasa)
+        if subtitle:
+            c.setFillColor(ACCENT)
+            c.setFont(BD, S_SM)
+            c.drawString(MN_X+PAD, y, subtitle)
+            y -= 4*mm
+
+        # Tavsif
+        for line in bullets:
+            c.setFillColor(ACCENT)
+            c.setFont(BD, S_BODY)
+            c.drawString(MN_X+PAD, y, '•')
+            y = mn_wrap(c, line, RG, S_BODY,
+                        MN_X+PAD+4.5*mm, y, mn_max-4.5*mm, 4.5*mm, DARK)
+
+        y -= 2*mm
+        return y
+
+    # ── EDUCATION ─────────────────────────────────────────────────────────
+    if cv.education:
+        mn_y = mn_sec('Education', mn_y)
+        for e in cv.education:
+            yr = e.years + (f'  GPA: {e.gpa}' if e.gpa else '')
+            mn_y = mn_entry(e.degree, e.institution, yr, (), mn_y)
+
+    # ── WORK EXPERIENCE ───────────────────────────────────────────────────
+    if cv.work:
+        mn_y = mn_sec('Work Experience', mn_y)
+        for w in cv.work:
+            mn_y = mn_entry(w.position, w.company, w.years, w.bullets, mn_y)
+
+    # ── CERTIFICATES ──────────────────────────────────────────────────────
+    if cv.certificates:
+        mn_y = mn_sec('Certificates', mn_y)
+        for cert in cv.certificates:
+            nm = cert.name + (f'  —  {cert.org}' if cert.org else '')
+            yr = cert.year
+            c.setFillColor(DARK)
+            c.setFont(BD, S_BODY)
+            c.drawString(MN_X+PAD, mn_y, nm)
+            if yr:
+                c.setFillColor(GRAY)
+                c.setFont(IT, S_SM)
+                rw = c.stringWidth(yr, IT, S_SM)
+                c.drawString(PAGE_W-PAD-rw, mn_y, yr)
+            mn_y -= 5*mm
+
+    # ── HOBBIES ───────────────────────────────────────────────────────────
+    hobbies = cv.hobbies
+    if hobbies:
+        mn_y = mn_sec('Interests', mn_y)
+        mn_y = mn_wrap(c, hobbies, RG, S_BODY, MN_X+PAD, mn_y, mn_max, 4.5*mm, DARK)
+
@@ -0,0 +1,192 @@
+"""
+Yuklama testi: cluster.py (front + N worker) soxta Bot API server bilan.
+
+Bench jarayoni Bot API ni o'zi o'ynaydi (BOT_API_URL) va webhook orqali
+update lar yuboradi: har foydalanuvchi suhbat boshini o'tadi (/start, til,
+/skip, ism, familiya). O'lchov — barcha javoblar (sendMessage) kelguncha
+ketgan vaqt. Har foydalanuvchi javoblari ketma-ketligi bir xil bo'lishi
+shart: update lar tartibi buzilsa yoki boshqa worker ga tushsa suhbat
+holati boshqacha bo'lib, javoblar farq qiladi.
+
+Sozlamalar (env):
+  LOAD_WORKERS         — sinaladigan worker sonlari (standart: "1 2 4")
+  LOAD_USERS           — foydalanuvchilar soni
+  LOAD_MIN_EFFICIENCY  — N worker tezligi / (N × 1 worker) quyi chegarasi;
+                         faqat CPU yetarli bo'lsa (N + 1 yadro) tekshiriladi
+  LOAD_SETTLE          — o'lchovdan oldin kutish, soniya (render pool'lar
+                         isib bo'lishi uchun — ular o'lchovga CPU olmasin)
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+from webhook import serve_http
+
+LOAD_WORKERS        = [int(x) for x in os.getenv("LOAD_WORKERS", "1 2 4").split()]
+LOAD_USERS          = int(os.getenv("LOAD_USERS", "200"))
+LOAD_MIN_EFFICIENCY = float(os.getenv("LOAD_MIN_EFFICIENCY", "0.7"))
+LOAD_SETTLE         = float(os.getenv("LOAD_SETTLE", "3"))
+
+TOKEN  = '123456:LOAD-TEST'
+SCRIPT = ['/start', '🇬🇧 English', '/skip', 'Ali', 'Valiyev']
+ROOT   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BATCH  = 50     # bitta webhook so'rovidagi update lar
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class FakeBotAPI:
+    """getMe/setWebhook/sendMessage ga javob beradi, sendMessage larni yozib boradi"""
+
+    def __init__(self):
+        self.replies = defaultdict(list)    # chat_id → [matn]
+        self.sent    = 0
+        self.getme   = 0
+        self.changed = asyncio.Event()
+
+    def routes(self):
+        base = f'/bot{TOKEN}/'
+        return {base + m: self._handler(m) for m in
+                ('getMe', 'setWebhook', 'deleteWebhook', 'sendMessage')}
+
+    def _handler(self, method):
+
+        async def handle(_, headers, body):
+            params = {k: json.loads(v[0]) if v[0][:1] in '{["' else v[0]
+                      for k, v in parse_qs(body.decode()).items()}
+            if method == 'getMe':
+                self.getme += 1
+                result = {'id': 1, 'is_bot': True, 'first_name': 'CV', 'username': 'cv_bot'}
+            elif method == 'sendMessage':
+                chat = int(params['chat_id'])
+                self.replies[chat].append(params.get('text', ''))
+                self.sent += 1
+                result = {'message_id': self.sent, 'date': int(time.time()),
+                          'chat': {'id': chat, 'type': 'private'}, 'text': params.get('text', '')}
+            else:
+                result = True
+            self.changed.set()
+            return 200, 'application/json', json.dumps({'ok': True, 'result': result}).encode()
+
+        return handle
+
+    async def wait(self, predicate, timeout):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self.changed.clear()
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise TimeoutError
+            try:
+                await asyncio.wait_for(self.changed.wait(), left)
+            except asyncio.TimeoutError:
+                pass
+
+
+def _update(n, uid, text):
+    msg = {'message_id': n, 'date': int(time.time()), 'text': text,
+           'chat': {'id': uid, 'type': 'private'},
+           'from': {'id': uid, 'is_bot': False, 'first_name': 'U'}}
+    if text.startswith('/'):
+        msg['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text)}]
+    return {'update_id': n, 'message': msg}
+
+
+async def _post(port, path, items):
+    body = json.dumps(items).encode()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = (await reader.readline()).split()[1]
+    writer.close()
+    assert status == b'200', status
+
+
+async def _run(workers, users):
+    api = FakeBotAPI()
+    api_port, port = _free_port(), _free_port()
+    server = await serve_http(api.routes(), '127.0.0.1', api_port)
+    tmp = tempfile.mkdtemp(prefix='cv_load_')
+    env = dict(os.environ, BOT_TOKEN=TOKEN, BOT_API_URL=f'http://127.0.0.1:{api_port}/bot',
+               WEBHOOK_URL=f'http://127.0.0.1:{port}/hook', WEBHOOK_HOST='127.0.0.1',
+               PORT=str(port), BOT_WORKERS=str(workers), STATE_DB=os.path.join(tmp, 'state.db'),
+               SCRATCH_DIR=os.path.join(tmp, 'scratch'), RENDER_CACHE_DIR=os.path.join(tmp, 'cache'),
+               METRICS_PORT='0', RENDER_WORKERS='1')
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, 'cluster.py', cwd=ROOT, env=env,
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+    try:
+        # front + har worker getMe qiladi; keyin har worker ga bittadan isitish xabari
+        await api.wait(lambda: api.getme >= workers + (workers > 1), 60)
+        warm = [_update(i + 1, 10**9 + i, '/start') for i in range(workers)]
+        for _ in range(100):
+            try:
+                await _post(port, '/hook', warm)
+                break
+            except OSError:
+                await asyncio.sleep(0.1)
+        await api.wait(lambda: api.sent >= workers, 60)
+        await asyncio.sleep(LOAD_SETTLE)
+
+        base = api.sent
+        total = users * len(SCRIPT)
+        n = 100
+        t = time.perf_counter()
+        for text in SCRIPT:
+            batch = []
+            for uid in range(1, users + 1):
+                n += 1
+                batch.append(_update(n, uid, text))
+            for i in range(0, len(batch), BATCH):
+                await _post(port, '/hook', batch[i:i + BATCH])
+        await api.wait(lambda: api.sent - base >= total, 120)
+        elapsed = time.perf_counter() - t
+    finally:
+        proc.terminate()
+        await proc.wait()
+        server.close()
+        await server.wait_closed()
+
+    sequences = {tuple(api.replies[uid]) for uid in range(1, users + 1)}
+    assert len(sequences) == 1 and len(next(iter(sequences))) == len(SCRIPT), \
+        f"{workers} workers: replies differ between users (ordering/stickiness broken)"
+    return total, elapsed
+
+
+def bench_load():
+    r, rates = {}, {}
+    cpus = os.cpu_count() or 1
+    print(f"{LOAD_USERS} users × {len(SCRIPT)} updates, {cpus} CPU")
+    print(f"{'workers':<10}{'updates/s':>12}{'ms/update':>12}{'scaling':>10}")
+    for workers in LOAD_WORKERS:
+        total, elapsed = asyncio.run(_run(workers, LOAD_USERS))
+        rates[workers] = total / elapsed
+        r[f'load.workers{workers}'] = elapsed / total * 1000
+        first = LOAD_WORKERS[0]
+        scaling = rates[workers] / rates[first] / (workers / first)
+        print(f"{workers:<10}{rates[workers]:12.0f}{r[f'load.workers{workers}']:12.2f}{scaling:10.0%}")
+    print("ordering: OK (every user got the same reply sequence)")
+    first = LOAD_WORKERS[0]
+    checked = [w for w in LOAD_WORKERS[1:] if cpus >= w + 1]
+    for w in checked:
+        eff = rates[w] / rates[first] / (w / first)
+        assert eff >= LOAD_MIN_EFFICIENCY, \
+            f"{w} workers: scaling {eff:.0%} below {LOAD_MIN_EFFICIENCY:.0%}"
+    skipped = [w for w in LOAD_WORKERS[1:] if w not in checked]
+    if skipped:
+        print(f"scaling check skipped for {skipped} workers: needs workers + 1 CPUs")
+    elif checked:
+        print("scaling: OK")
+    return r
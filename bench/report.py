@@ -0,0 +1,64 @@
+"""
+Natijani JSON ga yozish va saqlangan baseline bilan solishtirish.
+
+Fayl shakli:
+  {"meta": {...}, "results": {"render.pdf.typical": 12.3, ...}}   # ms
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from bench.imports import ROOT
+
+
+def meta():
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True).stdout.strip()
+    except OSError:
+        rev = ''
+    return {
+        'time':     time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git':      rev,
+        'python':   sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine':  platform.machine(),
+    }
+
+
+def save(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta(), 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Baseline'dan tolerance dan ko'proq sekinlashgan o'lchovlar ro'yxati.
+    Faqat hozir o'lchanganlar solishtiriladi (--only bilan ham ishlaydi)."""
+    regressions = []
+    print(f"\n{'metric':<34}{'baseline':>12}{'now':>12}{'change':>9}")
+    for name in sorted(results):
+        old, new = baseline.get(name), results[name]
+        if old is None:
+            print(f"{name:<34}{_ms(old):>12}{_ms(new):>12}{'':>9}")
+            continue
+        change = new / old - 1 if old else 0.0
+        mark = ''
+        # *.legacy — eski algoritm, faqat solishtirish uchun; regressiya hisoblanmaydi
+        if change > tolerance and not name.endswith('.legacy'):
+            regressions.append((name, old, new))
+            mark = '  !'
+        print(f"{name:<34}{_ms(old):>12}{_ms(new):>12}{change:>+8.0%}{mark}")
+    return regressions
+
+
+def _ms(v):
+    return '—' if v is None else f"{v:.3f}"
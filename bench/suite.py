@@ -0,0 +1,271 @@
+"""
+Bir xillik tekshiruvlari va vaqt o'lchovlari.
+
+Har bir guruh funksiyasi {nom: ms} qaytaradi (bitta amal uchun, eng yaxshi
+urinish) va qisqa jadvalni ekranga chiqaradi. Natija avval eski yo'l bilan
+solishtiriladi, so'ng vaqt o'lchanadi.
+"""
+
+import os
+import random
+import statistics
+import time
+
+import cv_generator
+import docx_stream
+import pdf_plan
+import pdf_profiles
+import textlayout
+
+from bench.data import WORDS_EN, WORDS_RU, corpus, cv_data, profiles
+from bench.legacy import legacy_docx_skeleton, legacy_draw_pdf, legacy_truncate, legacy_wrap
+
+FONTS = ['Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique']
+
+# PNG eskiz byudjeti (bitta render, median) va to'liq PDF+DOCX ga nisbatan ulushi
+PREVIEW_BUDGET_MS = float(os.getenv("PREVIEW_BUDGET_MS", "40"))
+PREVIEW_MAX_SHARE = float(os.getenv("PREVIEW_MAX_SHARE", "0.75"))
+
+
+def per_op(fn, items, repeat=3):
+    """items ustida fn — bitta chaqiruv uchun ms (repeat urinishning eng yaxshisi)"""
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for x in items:
+            fn(x)
+        best = min(best, time.perf_counter() - t)
+    return best / len(items) * 1000
+
+
+# ─── Matn ─────────────────────────────────────────────────────────────────────
+
+def bench_wrap():
+    texts = corpus(200, WORDS_EN) + corpus(200, WORDS_RU, seed=2)
+    texts.append('supercalifragilisticexpialidocious-without-any-spaces ' * 3)
+    max_w = 150.0
+
+    # Bir xillik: eski algoritm birinchi so'z sig'masa bo'sh qator qo'yardi
+    for font in FONTS:
+        for s in texts:
+            old = [x for x in legacy_wrap(s, font, 9.5, max_w) if x]
+            assert list(textlayout.wrap(s, font, 9.5, max_w)) == old, s[:60]
+            short = s[:120]
+            assert textlayout.truncate(short, font, 8.5, max_w) == legacy_truncate(short, font, 8.5, max_w)
+    print(f"equivalence: OK ({len(texts) * len(FONTS)} texts)")
+
+    font = 'Helvetica'
+    r = {}
+    r['wrap.legacy'] = per_op(lambda s: legacy_wrap(s, font, 9.5, max_w), texts)
+    textlayout.wrap.cache_clear()
+    r['wrap.new'] = per_op(lambda s: textlayout.wrap.__wrapped__(s, font, 9.5, max_w), texts)
+    r['wrap.cached'] = per_op(lambda s: textlayout.wrap(s, font, 9.5, max_w), texts)
+    print(f"wrap      legacy {r['wrap.legacy']:8.3f} ms   new {r['wrap.new']:7.3f} ms "
+          f"({r['wrap.legacy']/r['wrap.new']:4.1f}x)   cached {r['wrap.cached']:6.4f} ms")
+
+    # Sidebar qiymatlari (email, manzil) qisqa bo'ladi
+    shorts = [s[:120] for s in texts]
+    r['truncate.legacy'] = per_op(lambda s: legacy_truncate(s, font, 8.5, max_w), shorts)
+    textlayout.truncate.cache_clear()
+    r['truncate.new'] = per_op(lambda s: textlayout.truncate.__wrapped__(s, font, 8.5, max_w), shorts)
+    print(f"truncate  legacy {r['truncate.legacy']:8.3f} ms   new {r['truncate.new']:7.3f} ms "
+          f"({r['truncate.legacy']/r['truncate.new']:4.1f}x)")
+    return r
+
+
+# ─── DOCX ─────────────────────────────────────────────────────────────────────
+
+def bench_docx(n=30):
+    from lxml import etree
+
+    old, _, _ = legacy_docx_skeleton()
+    new, _, _ = cv_generator.docx_skeleton()
+    assert etree.tostring(old.element) == etree.tostring(new.element)
+    print("docx skeleton equivalence: OK")
+
+    r = {}
+    steps = [None] * n
+    r['docx_skeleton.legacy'] = per_op(lambda _: legacy_docx_skeleton(), steps)
+    r['docx_skeleton.new'] = per_op(lambda _: cv_generator.docx_skeleton(), steps)
+    print(f"docx skel legacy {r['docx_skeleton.legacy']:8.2f} ms   new {r['docx_skeleton.new']:7.2f} ms "
+          f"({r['docx_skeleton.legacy']/r['docx_skeleton.new']:4.1f}x)   per render")
+
+    rnd = random.Random(3)
+    records = [cv_data(rnd, k) for k in (0, 1, 3, 8, 20) for _ in range(4)]
+    for d in records:
+        assert (docx_stream.render_docx_stream_bytes(d)
+                == cv_generator.render_docx_bytes(d, backend='python-docx'))
+    print(f"docx stream equivalence: OK ({len(records)} CVs, byte-identical)")
+    return r
+
+
+# ─── Render ───────────────────────────────────────────────────────────────────
+
+def bench_render(n=10):
+    """Har bir profil × renderer: generate_pdf, python-docx va stream DOCX"""
+    renderers = {
+        'pdf':         cv_generator.render_pdf_bytes,
+        'docx':        lambda d: cv_generator.render_docx_bytes(d, backend='python-docx'),
+        'docx_stream': lambda d: cv_generator.render_docx_bytes(d, backend='stream'),
+    }
+    r = {}
+    print(f"{'profile':<12}" + ''.join(f"{k:>14}" for k in renderers))
+    for name, data in profiles().items():
+        row = f"{name:<12}"
+        for kind, fn in renderers.items():
+            fn(data)    # birinchi chaqiruv (skelet, shrift jadvallari) hisobga olinmaydi
+            ms = r[f'render.{kind}.{name}'] = per_op(fn, [data] * n)
+            row += f"{ms:11.2f} ms"
+        print(row)
+    return r
+
+
+def bench_template(n=10):
+    """Shablon rejasi: qo'lda yozilgan draw_pdf bilan bayt-bayt bir xil va undan sekin emas"""
+    from io import BytesIO
+    from reportlab.pdfgen import canvas as rl_canvas
+
+    def legacy_pdf(data):
+        buf = BytesIO()
+        c = rl_canvas.Canvas(buf, pagesize=pdf_plan.compile_plan().pagesize, invariant=1)
+        legacy_draw_pdf(c, data)
+        c.save()
+        return buf.getvalue()
+
+    rnd = random.Random(5)
+    records = list(profiles().values()) + [cv_data(rnd, k) for k in (0, 1, 3, 8, 20) for _ in range(4)]
+    for d in records:
+        assert cv_generator.render_pdf_bytes(d, profile='standard') == legacy_pdf(d)
+    print(f"template equivalence: OK ({len(records)} CVs, byte-identical)")
+
+    pdf_plan.compile_plan.cache_clear()
+    t = time.perf_counter()
+    pdf_plan.compile_plan()
+    r = {'template.compile': (time.perf_counter() - t) * 1000}
+    print(f"compile   {r['template.compile']:8.3f} ms   (bir marta, jarayon boshida)")
+    print(f"{'profile':<12}{'legacy':>14}{'plan':>14}")
+    for name, data in profiles().items():
+        legacy = r[f'template.legacy.{name}'] = per_op(legacy_pdf, [data] * n)
+        new = r[f'template.plan.{name}'] = per_op(
+            lambda d: cv_generator.render_pdf_bytes(d, profile='standard'), [data] * n)
+        print(f"{name:<12}{legacy:11.2f} ms{new:11.2f} ms  ({legacy / new:4.2f}x)")
+    return r
+
+
+def bench_preview(n=20):
+    """PNG eskiz: byudjet ichida va to'liq render (PDF + stream DOCX) dan arzon bo'lishi shart"""
+    r = {}
+    print(f"{'profile':<12}{'preview':>14}{'pdf+docx':>14}{'share':>8}{'png KB':>8}")
+    for name, data in profiles().items():
+        png = cv_generator.render_preview_bytes(data)
+        assert png[:8] == b'\x89PNG\r\n\x1a\n', name
+        times = []
+        for _ in range(n):
+            t = time.perf_counter()
+            cv_generator.render_preview_bytes(data)
+            times.append((time.perf_counter() - t) * 1000)
+        ms = r[f'preview.{name}'] = statistics.median(times)
+        full = (per_op(cv_generator.render_pdf_bytes, [data] * 5)
+                + per_op(lambda d: cv_generator.render_docx_bytes(d, backend='stream'), [data] * 5))
+        print(f"{name:<12}{ms:11.2f} ms{full:11.2f} ms{ms / full:8.0%}{len(png) / 1024:8.1f}")
+        assert ms <= PREVIEW_BUDGET_MS, f"preview {name}: {ms:.1f} ms exceeds budget {PREVIEW_BUDGET_MS:.0f} ms"
+        assert ms <= full * PREVIEW_MAX_SHARE, f"preview {name}: {ms:.1f} ms is not cheaper than full render"
+    print("preview budget: OK")
+    return r
+
+
+def bench_profiles(n=5):
+    """PDF profillari: hajm va render vaqti; compact chegaradan oshmasligi shart"""
+    import tempfile
+
+    from PIL import Image
+
+    from photo import prepare_avatar
+
+    data = profiles()
+    # Eng og'ir holat: shovqinli rasm JPEG da yomon siqiladi
+    tmp = tempfile.mkdtemp(prefix='cv_bench_')
+    noisy = os.path.join(tmp, 'noisy.jpg')
+    Image.merge('RGB', [Image.effect_noise((1200, 1200), 90 + 10 * i) for i in range(3)]) \
+        .save(noisy, 'JPEG', quality=95)
+    ready = os.path.join(tmp, 'noisy_avatar.jpg')
+    with open(noisy, 'rb') as f, open(ready, 'wb') as g:
+        g.write(prepare_avatar(f.read()))
+    data['photo_noisy'] = dict(data['maximal'], photo=ready, photo_ready=True)
+
+    limit = pdf_profiles.pdf_profile('compact')['max_bytes']
+    names = list(pdf_profiles.PDF_PROFILES)
+    r = {}
+    print(f"{'profile':<12}" + ''.join(f"{k:>20}" for k in names))
+    for name, d in data.items():
+        row = f"{name:<12}"
+        for p in names:
+            size = len(cv_generator.render_pdf_bytes(d, profile=p))
+            ms = r[f'profile.{p}.{name}'] = per_op(
+                lambda x: cv_generator.render_pdf_bytes(x, profile=p), [d] * n)
+            r[f'profile.{p}.{name}.kb'] = size / 1024
+            row += f"{size / 1024:8.1f} KB{ms:7.1f} ms"
+            if p == 'compact':
+                assert size <= limit, f"compact {name}: {size} bytes exceeds {limit}"
+        print(row)
+    print(f"compact budget: OK (<= {limit // 1024} KB)")
+    return r
+
+
+# ─── Sessiyalar ───────────────────────────────────────────────────────────────
+
+def bench_sessions(n=2000):
+    """user_data: dict va Session — bir xil mazmun, xotira va get() vaqti"""
+    import copy
+    import pickle
+    import tracemalloc
+
+    from cv_model import SECTIONS, parse_section
+    from sessions import Session
+
+    rnd = random.Random(11)
+    records = []
+    for i in range(n):
+        d = dict(cv_data(rnd, rnd.choice((1, 2, 3))), lang='en', photo=None, format='both')
+        for name in SECTIONS:
+            parse_section(d, name)
+        records.append(d)
+    for d in records[:50]:
+        s = Session(d)
+        assert dict(s) == d and s == d
+        assert dict(copy.deepcopy(s)) == d and pickle.loads(pickle.dumps(s)) == d
+    print("session equivalence: OK")
+
+    def held(make):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [make(d) for d in records]
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del kept
+        return used / n
+
+    # Qiymatlar ikkala holatda umumiy — faqat idish o'lchanadi
+    r = {'session.dict_bytes': held(dict), 'session.slots_bytes': held(Session)}
+    estimate = sum(Session(d).nbytes() for d in records) / n
+    keys = ['lang', 'first_name', 'photo', 'work_list', 'missing']
+    r['session.get.dict'] = per_op(lambda d: [d.get(k) for k in keys], records[:500])
+    sessions = [Session(d) for d in records[:500]]
+    r['session.get.slots'] = per_op(lambda d: [d.get(k) for k in keys], sessions)
+    print(f"container   dict {r['session.dict_bytes']:6.0f} B   Session {r['session.slots_bytes']:6.0f} B "
+          f"({r['session.dict_bytes'] / r['session.slots_bytes']:3.1f}x)   "
+          f"with values ~{estimate / 1024:.1f} KB (nbytes)")
+    print(f"get x{len(keys)}     dict {r['session.get.dict'] * 1000:6.2f} us  "
+          f"Session {r['session.get.slots'] * 1000:6.2f} us")
+    return r
+
+
+GROUPS = {
+    'wrap':    bench_wrap,
+    'docx':    bench_docx,
+    'render':  bench_render,
+    'template': bench_template,
+    'preview': bench_preview,
+    'profiles': bench_profiles,
+    'sessions': bench_sessions,
+}
@@ -5,20 +5,38 @@ Tillar: O'zbek, Rus, Ingliz
 Format: PDF va DOCX
 """
 
+import asyncio
 import logging
 import os
+import time
 from dotenv import load_dotenv
-from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import (
+    Update, ReplyKeyboardMarkup, ReplyKeyboardRemove, InlineKeyboardButton, InlineKeyboardMarkup,
+    InputMediaDocument,
+)
+from telegram.error import BadRequest, TelegramError
 
 load_dotenv()  # local .env fayldan o'qiydi (Railway da kerak emas)
-from dotenv import load_dotenv
-
-load_dotenv()  # .env fayldan o'qiydi (local test uchun)
 from telegram.ext import (
     Application, CommandHandler, MessageHandler, ConversationHandler,
-    CallbackQueryHandler, filters, ContextTypes
+    CallbackQueryHandler, TypeHandler, filters, ContextTypes
 )
-from cv_generator import generate_pdf, generate_docx
+# PendingState — block=False handler holati; ochiq nomi yo'q (PTB 20.7)
+from telegram.ext._conversationhandler import PendingState
+# cv_generator (ReportLab, python-docx) bu yerda import qilinmaydi — faqat
+# render jarayonlarida yuklanadi, bot tezroq ishga tushadi
+from render_pool import RenderPool, render
+from scheduler import RENDER_CONCURRENCY, Busy, RenderScheduler
+from render_cache import RenderCache, cache_key
+from scratch import Scratch
+from cv_model import SECTIONS, TEMPLATE_VERSION, CVModel, parse_section
+from cv_import import MAX_BYTES as IMPORT_MAX_BYTES, TEMPLATE, SubmissionError, parse_submission
+from pdf_profiles import PDF_PROFILE, pdf_profile
+from photo import PHOTO_MAX_BYTES, PhotoError, pick_size, prepare_avatar
+from sessions import SESSION_TIMEOUT, Session, Timeouts
+from storage import SQLitePersistence
+from webhook import ALLOWED_UPDATES, BOT_TOKEN, WEBHOOK_URL, api_urls, run_webhook, serve_http
+import metrics
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -26,15 +44,57 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-BOT_TOKEN = os.getenv("BOT_TOKEN", "8516447460:AAG3YTQiXrtUAl4316hOFUCz0KHfYHSSgi0")
+# PDF/DOCX alohida jarayonlarda yaratiladi (RENDER_WORKERS, RENDER_QUEUE)
+render_pool = RenderPool()
+RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", "60"))   # har bir format uchun, soniya
+# Tasdiqlashdagi PNG eskiz: shu vaqtda tayyor bo'lmasa faqat matn (0 = o'chirilgan)
+PREVIEW_TIMEOUT = float(os.getenv("PREVIEW_TIMEOUT", "3"))
+# Yuklangan rasmni tayyorlash (render pool navbati bilan) kutish chegarasi, soniya
+PHOTO_TIMEOUT = float(os.getenv("PHOTO_TIMEOUT", "10"))
+render_cache = RenderCache()
+# Kesh kaliti: dizayn versiyasi va PDF profili (o'zgarsa eski natijalar ishlatilmaydi)
+RENDER_VERSION = [TEMPLATE_VERSION, PDF_PROFILE, pdf_profile()]
+# Foydalanuvchi rasmlari: noyob nomlar, hajm chegarasi, TTL (SCRATCH_*)
+scratch = Scratch()
+# handle_confirm ishlari: umumiy chegara, navbat, foydalanuvchiga bittadan
+scheduler = RenderScheduler(RENDER_CONCURRENCY or render_pool.workers)
+# Suhbatlarning oxirgi faolligi — SESSION_TIMEOUT da yakunlash uchun
+timeouts = Timeouts()
+
+# format → caption
+OUTPUTS = {
+    'pdf':  "📄 CV - PDF format",
+    'docx': "📝 CV - Word format",
+}
+
+# /stats ni ko'ra oladigan foydalanuvchilar (vergul bilan: "123,456")
+ADMIN_IDS = {int(x) for x in os.getenv("ADMIN_IDS", "").replace(' ', '').split(',') if x}
+
+metrics.register(metrics.Gauge('cv_render_queue_depth', "Render pool'dagi ishlar",
+                               lambda: render_pool.pending))
+metrics.register(metrics.Gauge('cv_render_pool_restarts', "Ishchi o'lgani uchun pool qayta yaratilgan",
+                               lambda: render_pool.restarts))
+metrics.register(metrics.Gauge('cv_jobs_running', "Bajarilayotgan CV ishlari",
+                               lambda: scheduler.running))
+metrics.register(metrics.Gauge('cv_jobs_waiting', "Navbatdagi CV ishlari",
+                               lambda: scheduler.waiting))
+metrics.register(metrics.Gauge('cv_scratch_bytes', "Vaqtinchalik fayllar hajmi",
+                               lambda: scratch.usage()['bytes']))
+metrics.register(metrics.Gauge('cv_scratch_files', "Vaqtinchalik fayllar soni",
+                               lambda: scratch.usage()['files']))
+
+# /import uchun fayllar
+IMPORT_FILES = (filters.Document.FileExtension('json') | filters.Document.FileExtension('yaml')
+                | filters.Document.FileExtension('yml') | filters.Document.FileExtension('txt'))
+
 
 # ─── Conversation States ───────────────────────────────────────────────────────
 (
     LANG, PHOTO, FIRST_NAME, LAST_NAME, DATE_OF_BIRTH, NATIONALITY,
     EMAIL, PHONE, ADDRESS, LINKEDIN, GITHUB, WEBSITE,
     OBJECTIVE, EDUCATION, WORK_EXP, SKILLS, LANGUAGES, CERTIFICATES,
-    HOBBIES, FORMAT_CHOICE, CONFIRM
-) = range(21)
+    HOBBIES, FORMAT_CHOICE, CONFIRM, IMPORT
+) = range(22)
 
 # ─── Translations ──────────────────────────────────────────────────────────────
 T = {
@@ -42,6 +102,8 @@ T = {
         'welcome': "👋 Salom! Men sizga xalqaro Europa Pass uslubida professional CV tayyorlab beraman.\n\n📌 Boshlash uchun /start bosing.",
         'choose_lang': "🌐 Tilni tanlang / Choose language / Выберите язык:",
         'upload_photo': "📸 Profilingiz uchun rasm yuboring (ixtiyoriy).\n\nO'tkazib yuborish uchun /skip bosing.",
+        'photo_error': "⚠️ Rasmni o'qib bo'lmadi yoki u juda katta. Boshqa rasm yuboring yoki /skip bosing.",
+        'photo_busy': "⏳ Hozir band, rasmni tayyorlab bo'lmadi. Bir ozdan keyin qayta yuboring yoki /skip bosing.",
         'first_name': "👤 Ismingizni kiriting:",
         'last_name': "👤 Familiyangizni kiriting:",
         'dob': "🎂 Tug'ilgan sanangiz (Masalan: 15.03.1995):",
@@ -98,8 +160,15 @@ T = {
         'generating': "⏳ CV tayyorlanmoqda...",
         'done': "✅ CV tayyor! Yuklab oling 👇",
         'restart': "🔄 Yangi CV uchun /start bosing.",
+        'expired': "⌛ Uzoq vaqt javob bo'lmagani uchun suhbat yakunlandi, kiritilgan ma'lumotlar o'chirildi.\n\n🔄 Qaytadan boshlash uchun /start bosing.",
         'skip_done': "/skip - o'tkazib yuborish | /done - tugatish",
         'error': "❌ Xatolik yuz berdi. Iltimos qayta urinib ko'ring.",
+        'queued': "⏳ Navbatdasiz: #{pos}. CV tez orada tayyorlanadi...",
+        'busy_queue': "🚦 Hozir so'rovlar juda ko'p. Iltimos, {sec} soniyadan keyin qayta bosing.",
+        'busy_user': "⏳ CV ingiz allaqachon tayyorlanmoqda, biroz kuting.",
+        'busy_rate': "🚦 Juda tez-tez so'ralyapti. {sec} soniyadan keyin qayta bosing.",
+        'import_help': "📋 Butun CV ni bitta xabarda yuboring — quyidagi shablon bo'yicha matn yoki .json/.yaml/.txt fayl:",
+        'import_errors': "⚠️ Xatolarni tuzatib, qayta yuboring:",
         'confirm': "✅ Ma'lumotlarni tasdiqlaysizmi?",
         'yes': "Ha, tasdiqlash",
         'no': "Yo'q, qaytadan",
@@ -111,6 +180,8 @@ T = {
         'welcome': "👋 Привет! Я помогу вам создать профессиональное CV в стиле международного Europa Pass.\n\n📌 Нажмите /start чтобы начать.",
         'choose_lang': "🌐 Выберите язык / Choose language / Tilni tanlang:",
         'upload_photo': "📸 Отправьте фото для профиля (необязательно).\n\nЧтобы пропустить, нажмите /skip.",
+        'photo_error': "⚠️ Не удалось прочитать фото или оно слишком большое. Отправьте другое или нажмите /skip.",
+        'photo_busy': "⏳ Сервер сейчас занят, фото не обработано. Отправьте его чуть позже или нажмите /skip.",
         'first_name': "👤 Введите ваше имя:",
         'last_name': "👤 Введите вашу фамилию:",
         'dob': "🎂 Дата рождения (Пример: 15.03.1995):",
@@ -167,8 +238,15 @@ T = {
         'generating': "⏳ Создаём ваше CV...",
         'done': "✅ CV готово! Скачайте ниже 👇",
         'restart': "🔄 Для нового CV нажмите /start.",
+        'expired': "⌛ Диалог завершён из-за долгого отсутствия ответа, введённые данные удалены.\n\n🔄 Чтобы начать заново, нажмите /start.",
         'skip_done': "/skip - пропустить | /done - завершить",
         'error': "❌ Произошла ошибка. Попробуйте снова.",
+        'queued': "⏳ Вы в очереди: #{pos}. CV скоро будет готово...",
+        'busy_queue': "🚦 Сейчас слишком много запросов. Нажмите снова через {sec} сек.",
+        'busy_user': "⏳ Ваше CV уже создаётся, подождите немного.",
+        'busy_rate': "🚦 Слишком часто. Нажмите снова через {sec} сек.",
+        'import_help': "📋 Отправьте всё CV одним сообщением — текст по шаблону ниже или файл .json/.yaml/.txt:",
+        'import_errors': "⚠️ Исправьте ошибки и отправьте снова:",
         'confirm': "✅ Подтвердите данные?",
         'yes': "Да, подтвердить",
         'no': "Нет, начать заново",
@@ -180,6 +258,8 @@ T = {
         'welcome': "👋 Hello! I'll help you create a professional CV in the international Europa Pass style.\n\n📌 Press /start to begin.",
         'choose_lang': "🌐 Choose language / Tilni tanlang / Выберите язык:",
         'upload_photo': "📸 Send your profile photo (optional).\n\nPress /skip to skip.",
+        'photo_error': "⚠️ Couldn't read the photo or it is too large. Send another one or press /skip.",
+        'photo_busy': "⏳ The server is busy and couldn't process the photo. Send it again in a moment or press /skip.",
         'first_name': "👤 Enter your first name:",
         'last_name': "👤 Enter your last name:",
         'dob': "🎂 Date of birth (Example: 15.03.1995):",
@@ -236,8 +316,15 @@ T = {
         'generating': "⏳ Generating your CV...",
         'done': "✅ CV is ready! Download below 👇",
         'restart': "🔄 Press /start for a new CV.",
+        'expired': "⌛ The conversation ended after a long period of inactivity and your data was deleted.\n\n🔄 Press /start to begin again.",
         'skip_done': "/skip - skip | /done - finish",
         'error': "❌ An error occurred. Please try again.",
+        'queued': "⏳ You are #{pos} in queue. Your CV will be ready soon...",
+        'busy_queue': "🚦 Too many requests right now. Please press again in {sec} s.",
+        'busy_user': "⏳ Your CV is already being prepared, please wait.",
+        'busy_rate': "🚦 Too many requests. Please press again in {sec} s.",
+        'import_help': "📋 Send the whole CV in one message — text following the template below, or a .json/.yaml/.txt file:",
+        'import_errors': "⚠️ Please fix these and send again:",
         'confirm': "✅ Confirm your data?",
         'yes': "Yes, confirm",
         'no': "No, start over",
@@ -253,10 +340,21 @@ def t(context: ContextTypes.DEFAULT_TYPE, key: str) -> str:
     return T[lang].get(key, T['en'].get(key, key))
 
 
+def default_lang(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Til tanlanmagan bo'lsa — Telegram ilovasi tili (uz/ru/en bo'lsa)"""
+    if 'lang' not in context.user_data and update.effective_user.language_code in T:
+        context.user_data['lang'] = update.effective_user.language_code
+
+
 def get_data(context, key, default=''):
     return context.user_data.get(key, default)
 
 
+def parse(context, section):
+    with metrics.PARSE.time(stage='section'):
+        parse_section(context.user_data, section)
+
+
 def append_list_data(context, key, value):
     if key not in context.user_data:
         context.user_data[key] = []
@@ -265,7 +363,22 @@ def append_list_data(context, key, value):
 
 # ─── Handlers ─────────────────────────────────────────────────────────────────
 
+def drop_photo(context):
+    """Sessiya rasmi endi kerak emas — faylni darhol o'chiramiz"""
+    scratch.discard(context.user_data.pop('photo', None))
+    context.user_data.pop('photo_ready', None)
+
+
+def end_session(update: Update, context, reason: str):
+    """Suhbat tugadi — rasm va user_data (xotira va baza) o'chiriladi.
+    Oxirgi xabarlardan keyin chaqiriladi: t() user_data dagi tilni o'qiydi."""
+    drop_photo(context)
+    context.application.drop_user_data(update.effective_user.id)
+    metrics.SESSIONS.inc(reason=reason)
+
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    drop_photo(context)
     context.user_data.clear()
     keyboard = [["🇺🇿 O'zbek", "🇷🇺 Русский", "🇬🇧 English"]]
     await update.message.reply_text(
@@ -292,17 +405,36 @@ async def set_language(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
 async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    if update.message.photo:
-        photo = update.message.photo[-1]
-        file = await photo.get_file()
-        photo_path = f"/tmp/cv_photo_{update.effective_user.id}.jpg"
-        await file.download_to_drive(photo_path)
-        context.user_data['photo'] = photo_path
-    await update.message.reply_text(t(context, 'first_name'))
+    msg = update.message
+    # Rasm yoki rasm-fayl (document): kerakli o'lchamdagisi xotiraga yuklanadi
+    if msg.photo:
+        source = pick_size(msg.photo)
+    else:
+        source = msg.document
+        if source.file_size and source.file_size > PHOTO_MAX_BYTES:
+            await msg.reply_text(t(context, 'photo_error'))
+            return PHOTO
+    try:
+        file = await source.get_file()
+        raw = await file.download_as_bytearray()
+        avatar = await asyncio.wait_for(render_pool.run(prepare_avatar, bytes(raw)), PHOTO_TIMEOUT)
+    except PhotoError as e:
+        logger.info(f"Photo rejected: {e}")
+        await msg.reply_text(t(context, 'photo_error'))
+        return PHOTO
+    except asyncio.TimeoutError:
+        metrics.ERRORS.inc(stage='timeout', format='photo')
+        await msg.reply_text(t(context, 'photo_busy'))
+        return PHOTO
+    drop_photo(context)
+    context.user_data['photo'] = scratch.write(avatar, '.jpg')
+    context.user_data['photo_ready'] = True
+    await msg.reply_text(t(context, 'first_name'))
     return FIRST_NAME
 
 
 async def skip_photo(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    drop_photo(context)
     context.user_data['photo'] = None
     await update.message.reply_text(t(context, 'first_name'))
     return FIRST_NAME
@@ -406,6 +538,7 @@ async def get_education(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
 async def done_education(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    parse(context, 'education')
     context.user_data.setdefault('work_list', [])
     await update.message.reply_text(t(context, 'work_exp'))
     return WORK_EXP
@@ -425,12 +558,14 @@ async def get_work(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def skip_work(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data['work_list'] = []
+    parse(context, 'work')
     context.user_data.setdefault('skills_list', [])
     await update.message.reply_text(t(context, 'skills'))
     return SKILLS
 
 
 async def done_work(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    parse(context, 'work')
     context.user_data.setdefault('skills_list', [])
     await update.message.reply_text(t(context, 'skills'))
     return SKILLS
@@ -448,6 +583,7 @@ async def get_skills(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
 async def done_skills(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    parse(context, 'skills')
     context.user_data.setdefault('lang_list', [])
     await update.message.reply_text(t(context, 'languages'))
     return LANGUAGES
@@ -465,6 +601,7 @@ async def get_languages(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
 async def done_languages(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    parse(context, 'languages')
     context.user_data.setdefault('cert_list', [])
     await update.message.reply_text(t(context, 'certificates'))
     return CERTIFICATES
@@ -481,11 +618,13 @@ async def get_certificates(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def skip_certificates(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data['cert_list'] = []
+    parse(context, 'certificates')
     await update.message.reply_text(t(context, 'hobbies'))
     return HOBBIES
 
 
 async def done_certificates(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    parse(context, 'certificates')
     await update.message.reply_text(t(context, 'hobbies'))
     return HOBBIES
 
@@ -500,6 +639,54 @@ async def skip_hobbies(update: Update, context: ContextTypes.DEFAULT_TYPE):
     return await show_format_choice(update, context)
 
 
+# ─── Bir xabarda import ────────────────────────────────────────────────────────
+
+async def import_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/import — shablon bilan yoki buyruqdan keyingi qatorlarda CV ning o'zi"""
+    default_lang(update, context)
+    _, _, body = update.message.text.partition('\n')
+    if body.strip():
+        return await apply_submission(update, context, body, '')
+    await update.message.reply_text(f"{t(context, 'import_help')}\n\n{TEMPLATE}")
+    return IMPORT
+
+
+async def import_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    return await apply_submission(update, context, update.message.text, '')
+
+
+async def import_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    default_lang(update, context)
+    doc = update.message.document
+    if doc.file_size and doc.file_size > IMPORT_MAX_BYTES:
+        return await import_errors(update, context, [f"file is larger than {IMPORT_MAX_BYTES // 1024} KB"])
+    raw = await (await doc.get_file()).download_as_bytearray()
+    return await apply_submission(update, context, raw, doc.file_name or '')
+
+
+async def import_errors(update, context, errors):
+    """Hamma xato bitta xabarda; suhbat IMPORT da qoladi — tuzatilgani qayta yuboriladi"""
+    shown = errors[:20] + ([f"... +{len(errors) - 20}"] if len(errors) > 20 else [])
+    await update.message.reply_text(
+        t(context, 'import_errors') + '\n' + '\n'.join(f"• {x}" for x in shown))
+    return IMPORT
+
+
+async def apply_submission(update, context, raw, filename):
+    try:
+        with metrics.PARSE.time(stage='import'):
+            data = parse_submission(raw, filename)
+    except SubmissionError as e:
+        return await import_errors(update, context, e.errors)
+    lang = data.pop('lang', None) or context.user_data.get('lang')
+    drop_photo(context)
+    context.user_data.clear()
+    context.user_data.update(data, lang=lang or 'uz', photo=None)
+    for name in SECTIONS:
+        parse(context, name)
+    return await show_format_choice(update, context)
+
+
 async def show_format_choice(update: Update, context: ContextTypes.DEFAULT_TYPE):
     keyboard = [
         [InlineKeyboardButton(t(context, 'pdf_and_docx'), callback_data='both')],
@@ -534,90 +721,318 @@ async def handle_format(update: Update, context: ContextTypes.DEFAULT_TYPE):
         [InlineKeyboardButton(t(context, 'yes'), callback_data='confirm_yes')],
         [InlineKeyboardButton(t(context, 'no'), callback_data='confirm_no')],
     ]
-    await query.edit_message_text(
-        f"{t(context, 'confirm')}\n\n{summary}",
+    png = await render_preview(data)
+    if png is None:
+        await query.edit_message_text(
+            f"{t(context, 'confirm')}\n\n{summary}",
+            parse_mode='Markdown',
+            reply_markup=InlineKeyboardMarkup(confirm_keyboard)
+        )
+        return CONFIRM
+    # Matnli xabarni rasmga aylantirib bo'lmaydi — eskiz yangi xabar, eskisi o'chiriladi
+    await context.bot.send_photo(
+        chat_id=update.effective_chat.id,
+        photo=png,
+        caption=f"{t(context, 'confirm')}\n\n{summary}",
         parse_mode='Markdown',
         reply_markup=InlineKeyboardMarkup(confirm_keyboard)
     )
+    try:
+        await query.delete_message()
+    except BadRequest:
+        pass
     return CONFIRM
 
 
+async def render_preview(data):
+    """PNG eskiz yoki None (o'chirilgan, pool band yoki xato) — tasdiqlash baribir ishlaydi"""
+    if PREVIEW_TIMEOUT <= 0:
+        return None
+    try:
+        key = cache_key(dict(data, photo=None), 'png', RENDER_VERSION)
+        png = render_cache.get(key)
+        metrics.CACHE.inc(result='miss' if png is None else 'hit')
+        if png is None:
+            with metrics.PARSE.time(stage='preview'):
+                model = CVModel.from_data(data)
+            with metrics.RENDER.time(format='png'):
+                png = await asyncio.wait_for(render_pool.run(render, 'png', model), PREVIEW_TIMEOUT)
+            render_cache.put(key, png)
+        return png
+    except Exception as e:
+        metrics.ERRORS.inc(stage='preview', format='png')
+        logger.warning(f"Preview skipped: {e!r}")
+        return None
+
+
+async def edit_status(query, text):
+    """Tasdiqlash xabari matn yoki eskiz (rasm) bo'lishi mumkin — rasmda izoh tahrirlanadi"""
+    if query.message is not None and query.message.photo:
+        await query.edit_message_caption(caption=text)
+    else:
+        await query.edit_message_text(text)
+
+
 async def handle_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
 
     if query.data == 'confirm_no':
-        await query.edit_message_text("🔄 Qaytadan boshlash uchun /start bosing.")
+        await query.answer()
+        await edit_status(query, "🔄 Qaytadan boshlash uchun /start bosing.")
+        end_session(update, context, 'declined')
         return ConversationHandler.END
 
-    await query.edit_message_text(t(context, 'generating'))
+    async def queued(pos):
+        await edit_status(query, t(context, 'queued').format(pos=pos))
 
     try:
-        data = context.user_data
-        fmt = data.get('format', 'both')
-        user_id = update.effective_user.id
-
-        pdf_path = None
-        docx_path = None
-
-        if fmt in ('pdf', 'both'):
-            pdf_path = f"/tmp/cv_{user_id}.pdf"
-            generate_pdf(data, pdf_path)
-
-        if fmt in ('docx', 'both'):
-            docx_path = f"/tmp/cv_{user_id}.docx"
-            generate_docx(data, docx_path)
-
-        await query.edit_message_text(t(context, 'done'))
-
-        chat_id = update.effective_chat.id
+        ticket = scheduler.admit(update.effective_user.id, queued)
+    except Busy as e:
+        # Xabar va tugmalar joyida qoladi — foydalanuvchi keyinroq yana bosadi
+        metrics.SHED.inc(reason=e.reason)
+        await query.answer(t(context, e.reason).format(sec=e.retry_after), show_alert=True)
+        return None
+    try:
+        await query.answer()
+    except BaseException:
+        # admit joy band qilgan — "Query is too old" kabi xatoda bo'shatilmasa,
+        # foydalanuvchi abadiy busy_user, navbat esa to'xtab qoladi
+        await ticket.__aexit__(None, None, None)
+        raise
+
+    started = time.perf_counter()
+    async with ticket:
+        return await _render_and_deliver(update, context, query, started)
+
+
+async def confirm_pending(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Oldingi block=False handler hali ishlayotganda bosilgan tugma
+    (ConversationHandler.WAITING) — javobsiz qolsa tugma aylanib turadi"""
+    metrics.SHED.inc(reason='busy_user')
+    await update.callback_query.answer(t(context, 'busy_user'), show_alert=True)
+
+
+async def _render_and_deliver(update, context, query, started):
+    await edit_status(query, t(context, 'generating'))
+
+    data = dict(context.user_data)
+    # Bo'limlar /done da tahlil qilingan — bu yerda faqat model yig'iladi
+    with metrics.PARSE.time(stage='confirm'):
+        model = CVModel.from_data(data)
+    fmt = data.get('format', 'both')
+    metrics.FORMATS.inc(format=fmt)
+    chat_id = update.effective_chat.id
+    kinds = ['pdf', 'docx'] if fmt == 'both' else [fmt]
+
+    async def produce(kind):
+        # Har bir format alohida: biri sekin/xato bo'lsa, ikkinchisi kutmaydi
+        try:
+            # Fayl xotirada yaratiladi va to'g'ridan-to'g'ri yuboriladi — /tmp kerak emas
+            key = cache_key(data, kind, RENDER_VERSION)
+            content = render_cache.get(key)
+            metrics.CACHE.inc(result='miss' if content is None else 'hit')
+            if content is None:
+                with metrics.RENDER.time(format=kind):
+                    content = await asyncio.wait_for(render_pool.run(render, kind, model), RENDER_TIMEOUT)
+                render_cache.put(key, content)
+            return content
+        except Exception as e:
+            stage = 'timeout' if isinstance(e, asyncio.TimeoutError) else 'render'
+            metrics.ERRORS.inc(stage=stage, format=kind)
+            logger.error(f"Error generating CV ({kind}): {e!r}")
+            return None
+
+    contents = await asyncio.gather(*(produce(k) for k in kinds))
+    drop_photo(context)
+    logger.info(f"Render cache: {render_cache.stats()}")
+    name = f"{data.get('first_name', 'CV')}_{data.get('last_name', '')}_CV"
+    docs = [(k, c, f"{name}.{k}", OUTPUTS[k]) for k, c in zip(kinds, contents) if c is not None]
+
+    delivered = False
+    if docs:
+        # "Yangi CV uchun /start" alohida xabar emas — oxirgi hujjat izohida
+        kind, content, filename, caption = docs[-1]
+        docs[-1] = (kind, content, filename, f"{caption}\n\n{t(context, 'restart')}")
+        try:
+            await send_documents(context, chat_id, docs)
+            delivered = True
+        except Exception as e:
+            for kind, *_ in docs:
+                metrics.ERRORS.inc(stage='upload', format=kind)
+            logger.error(f"Error sending CV ({fmt}): {e!r}")
+    if delivered:
+        await edit_status(query, t(context, 'done'))
+    if delivered and len(docs) == len(kinds):
+        metrics.CONFIRM.observe(time.perf_counter() - started)
+    else:
+        await context.bot.send_message(chat_id=chat_id, text=t(context, 'error'))
 
-        if pdf_path and os.path.exists(pdf_path):
-            with open(pdf_path, 'rb') as f:
-                await context.bot.send_document(
-                    chat_id=chat_id,
-                    document=f,
-                    filename=f"{data.get('first_name', 'CV')}_{data.get('last_name', '')}_CV.pdf",
-                    caption="📄 CV - PDF format"
-                )
+    end_session(update, context, 'done')
+    return ConversationHandler.END
 
-        if docx_path and os.path.exists(docx_path):
-            with open(docx_path, 'rb') as f:
-                await context.bot.send_document(
-                    chat_id=chat_id,
-                    document=f,
-                    filename=f"{data.get('first_name', 'CV')}_{data.get('last_name', '')}_CV.docx",
-                    caption="📝 CV - Word format"
-                )
 
-        await context.bot.send_message(chat_id=chat_id, text=t(context, 'restart'))
+async def send_documents(context, chat_id, docs):
+    """docs: [(kind, content, filename, caption)] — bitta so'rovda yuboradi:
+    bitta hujjat — sendDocument, ikkita — sendMediaGroup.
 
-    except Exception as e:
-        logger.error(f"Error generating CV: {e}")
-        await context.bot.send_message(
-            chat_id=update.effective_chat.id,
-            text=t(context, 'error')
+    Avval yuborilgan fayllar file_id bilan (qayta yuklanmaydi). Telegram
+    file_id ni qabul qilmasa, ular o'chiriladi va hammasi bir marta qayta yuklanadi."""
+    file_ids = context.application.persistence.file_ids
+    keys = [file_ids.key(content, filename) for _, content, filename, _ in docs]
+    cached = [file_ids.get(k) for k in keys]
+    label = docs[0][0] if len(docs) == 1 else 'both'
+    try:
+        with metrics.UPLOAD.time(format=label, via='file_id' if all(cached) else 'upload'):
+            msgs = await _send(context, chat_id, docs, cached)
+    except BadRequest as e:
+        if not any(cached):
+            raise
+        logger.warning(f"Stale file_id ({label}): {e}")
+        for k, fid in zip(keys, cached):
+            if fid is not None:
+                metrics.FILE_ID.inc(result='stale')
+                file_ids.drop(k)
+        cached = [None] * len(docs)
+        with metrics.UPLOAD.time(format=label, via='upload'):
+            msgs = await _send(context, chat_id, docs, cached)
+    for k, fid, msg in zip(keys, cached, msgs):
+        metrics.FILE_ID.inc(result='miss' if fid is None else 'hit')
+        if fid is None and msg.document is not None:
+            file_ids.put(k, msg.document.file_id)
+
+
+async def _send(context, chat_id, docs, cached):
+    if len(docs) == 1:
+        (_, content, filename, caption), fid = docs[0], cached[0]
+        msg = await context.bot.send_document(
+            chat_id=chat_id,
+            document=fid or content,
+            filename=None if fid else filename,
+            caption=caption
         )
-
-    return ConversationHandler.END
+        return [msg]
+    media = [InputMediaDocument(fid or content, filename=None if fid else filename, caption=caption)
+             for (_, content, filename, caption), fid in zip(docs, cached)]
+    return await context.bot.send_media_group(chat_id=chat_id, media=media)
 
 
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("❌ Bekor qilindi. Qayta boshlash uchun /start bosing.")
+    end_session(update, context, 'cancel')
     return ConversationHandler.END
 
 
+async def expire_sessions(app: Application):
+    """SESSION_TIMEOUT dan beri yozmagan foydalanuvchilar suhbatini yakunlaydi:
+    rasm va user_data o'chiriladi, foydalanuvchiga o'z tilida xabar boradi"""
+    conv = app.bot_data['conversation']
+    while True:
+        await asyncio.sleep(min(SESSION_TIMEOUT / 4, 600))
+        try:
+            # Suhbatni tashqaridan tugatishning ochiq API si yo'q (PTB buni JobQueue
+            # bilan conversation_timeout da qiladi)
+            states = conv._conversations
+            # block=False handler (CONFIRM) tugagan bo'lsa ham holat PendingState
+            # bo'lib qoladi, toki shu foydalanuvchidan yangi update kelguncha —
+            # natijani shu yerda qo'llaymiz (END bo'lsa kalit o'chadi)
+            for key, state in list(states.items()):
+                if isinstance(state, PendingState) and state.done():
+                    conv._update_state(state.resolve(), key)
+            for key in timeouts.expired(states):
+                if states.get(key) not in conv.states:
+                    continue    # render hali ishlayapti (PendingState)
+                conv._update_state(ConversationHandler.END, key)
+                timeouts.forget(key)
+                chat_id, user_id = key
+                data = app.user_data.get(user_id) or app.persistence.stored_user_data(user_id) or {}
+                scratch.discard(data.get('photo'))
+                app.drop_user_data(user_id)
+                metrics.SESSIONS.inc(reason='timeout')
+                try:
+                    await app.bot.send_message(chat_id, T.get(data.get('lang'), T['uz'])['expired'],
+                                               reply_markup=ReplyKeyboardRemove())
+                except TelegramError as e:
+                    logger.warning(f"Expiry notice to {chat_id} failed: {e!r}")
+        except Exception as e:
+            logger.error(f"Session expiry failed: {e!r}")
+
+
+async def stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Faqat ADMIN_IDS uchun: kechikish kvantillari, navbat va kesh"""
+    if update.effective_user.id not in ADMIN_IDS:
+        return
+    lines = [f"jobs: {scheduler.stats()}",
+             f"pool: {render_pool.pending} pending (workers {render_pool.workers}, "
+             f"restarts {render_pool.restarts})",
+             f"cache: {render_cache.stats()}",
+             f"scratch: {scratch.usage()}",
+             f"sessions: {len(context.application.user_data)} live, "
+             f"{session_bytes(context.application) // 1024} KB, {len(timeouts)} conversations",
+             metrics.summary() or 'no renders yet']
+    await update.message.reply_text('\n'.join(lines))
+
+
 # ─── Main ─────────────────────────────────────────────────────────────────────
 
-def main():
-    app = Application.builder().token(BOT_TOKEN).build()
+def session_bytes(app: Application) -> int:
+    return sum(s.nbytes() for s in app.user_data.values())
+
+
+async def post_init(app: Application):
+    render_pool.start()
+    app.bot_data['tasks'] = [asyncio.create_task(app.persistence.run_eviction(app)),
+                             asyncio.create_task(scratch.run_eviction())]
+    if SESSION_TIMEOUT > 0:
+        app.bot_data['tasks'].append(asyncio.create_task(expire_sessions(app)))
+    metrics.register(metrics.Gauge('cv_sessions_live', "Xotiradagi sessiyalar (user_data)",
+                                   lambda: len(app.user_data)))
+    metrics.register(metrics.Gauge('cv_session_bytes', "Xotiradagi sessiyalar hajmi (taxminan)",
+                                   lambda: session_bytes(app)))
+    if metrics.METRICS_PORT:
+        app.bot_data['metrics_server'] = await serve_http(
+            {'/metrics': metrics.metrics_handler()}, metrics.METRICS_HOST, metrics.METRICS_PORT)
+        logger.info(f"Metrics on http://{metrics.METRICS_HOST}:{metrics.METRICS_PORT}/metrics")
+
+
+async def post_shutdown(app: Application):
+    for task in app.bot_data.get('tasks', []):
+        task.cancel()
+    server = app.bot_data.pop('metrics_server', None)
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    render_pool.shutdown()
+
+
+def build_app(persistence=None, updater: bool = True) -> Application:
+    """Handler'lari ulangan Application. updater=False — update lar tashqaridan
+    (webhook, cluster front) update_queue ga qo'yiladi."""
+    builder = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .persistence(persistence or SQLitePersistence())
+        .context_types(ContextTypes(user_data=Session))
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+    )
+    urls = api_urls()
+    if urls:
+        builder = builder.base_url(urls['base_url']).base_file_url(urls['base_file_url'])
+    if not updater:
+        builder = builder.updater(None)
+    app = builder.build()
 
     conv_handler = ConversationHandler(
-        entry_points=[CommandHandler('start', start)],
+        entry_points=[
+            CommandHandler('start', start),
+            CommandHandler('import', import_start),
+            MessageHandler(IMPORT_FILES, import_document),
+        ],
         states={
             LANG: [MessageHandler(filters.TEXT & ~filters.COMMAND, set_language)],
             PHOTO: [
-                MessageHandler(filters.PHOTO, handle_photo),
+                # block=False — yuklash va tayyorlash paytida boshqa suhbatlar kutmaydi
+                MessageHandler(filters.PHOTO | filters.Document.IMAGE, handle_photo, block=False),
                 CommandHandler('skip', skip_photo),
             ],
             FIRST_NAME: [MessageHandler(filters.TEXT & ~filters.COMMAND, get_first_name)],
@@ -666,17 +1081,35 @@ def main():
                 MessageHandler(filters.TEXT & ~filters.COMMAND, get_hobbies),
                 CommandHandler('skip', skip_hobbies),
             ],
-            FORMAT_CHOICE: [CallbackQueryHandler(handle_format)],
-            CONFIRM: [CallbackQueryHandler(handle_confirm)],
+            # block=False — eskiz va CV render paytida boshqa suhbatlar to'xtab qolmaydi
+            FORMAT_CHOICE: [CallbackQueryHandler(handle_format, block=False)],
+            CONFIRM: [CallbackQueryHandler(handle_confirm, block=False)],
+            ConversationHandler.WAITING: [CallbackQueryHandler(confirm_pending)],
+            IMPORT: [
+                MessageHandler(filters.TEXT & ~filters.COMMAND, import_text),
+                MessageHandler(IMPORT_FILES, import_document),
+            ],
         },
         fallbacks=[CommandHandler('cancel', cancel)],
         allow_reentry=True,
+        name='cv_conversation',
+        persistent=True,
     )
 
+    app.add_handler(TypeHandler(Update, timeouts.touch), group=-1)
     app.add_handler(conv_handler)
+    app.add_handler(CommandHandler('stats', stats))
+    app.bot_data['conversation'] = conv_handler
+    return app
+
 
+def main():
+    app = build_app()
     print("✅ Bot ishga tushdi!")
-    app.run_polling(allowed_updates=Update.ALL_TYPES)
+    if WEBHOOK_URL:
+        asyncio.run(run_webhook(app, ALLOWED_UPDATES))
+    else:
+        app.run_polling(allowed_updates=ALLOWED_UPDATES)
 
 
 if __name__ == '__main__':
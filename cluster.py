@@ -0,0 +1,248 @@
+"""
+Ko'p jarayonli rejim: bitta front jarayon + BOT_WORKERS ta bot worker.
+
+Front update larni (webhook yoki polling) qabul qiladi va foydalanuvchi id
+bo'yicha (storage.shard_of) worker ga yo'naltiradi: bir foydalanuvchining
+barcha update lari doim bitta worker ga, kelgan tartibida boradi — suhbat
+holati o'sha worker xotirasida qoladi. Front update ni tahlil qilmaydi va
+handler ishlatmaydi, faqat yo'naltiradi.
+
+Har worker — oddiy bot Application (updater siz) o'z render pool'i, scratch
+va render kesh papkasi bilan. SQLite baza (STATE_DB) umumiy: har worker
+faqat o'z foydalanuvchilarini yozadi, qayta ishga tushganda shu bazadan
+tiklanadi. To'xtab qolgan worker qayta ishga tushiriladi; navbatidagi
+update lar yo'qolmaydi (navbat front da).
+
+Sozlamalar (env):
+  BOT_WORKERS  — worker jarayonlar soni (1 = oddiy bitta jarayon, bot.main)
+
+Worker uchun o'zgartiriladigan sozlamalar:
+  SCRATCH_DIR, RENDER_CACHE_DIR — <papka>/w<N>
+  METRICS_PORT                  — METRICS_PORT + N (0 bo'lsa o'chirilgan)
+  RENDER_WORKERS                — berilmagan bo'lsa CPU soni / BOT_WORKERS
+
+    python cluster.py
+"""
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import threading
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+load_dotenv()  # local .env fayldan o'qiydi (Railway da kerak emas)
+from telegram import Bot
+from telegram.error import RetryAfter, TelegramError
+
+from storage import shard_of
+from webhook import (ALLOWED_UPDATES, BOT_TOKEN, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_SECRET,
+                     WEBHOOK_URL, api_urls, payload_handler, running, serve_http, stop_event)
+
+logger = logging.getLogger(__name__)
+
+BOT_WORKERS = int(os.getenv("BOT_WORKERS", "1"))
+
+POLL_TIMEOUT = 30   # getUpdates long polling, soniya
+POLL_BACKOFF = 60   # ketma-ket xatolarda kutish chegarasi, soniya
+
+
+def user_id(update: dict) -> int:
+    """Update dagi foydalanuvchi: message.from, callback_query.from va h.k.
+    Foydalanuvchisi yo'q update lar chat yoki update_id bo'yicha taqsimlanadi."""
+    for value in update.values():
+        if isinstance(value, dict):
+            who = value.get('from') or value.get('chat')
+            if isinstance(who, dict) and 'id' in who:
+                return who['id']
+    return update.get('update_id', 0)
+
+
+def worker_env(index: int, count: int) -> dict:
+    """Worker jarayon sozlamalari — bot import qilinishidan oldin o'rnatiladi"""
+    # Ichkarida import: worker (spawn) cluster ni qayta import qilganda bu
+    # modullar eski sozlamalar bilan yuklanib qolmasin
+    from metrics import METRICS_PORT
+    from render_cache import RENDER_CACHE_DIR
+    from scratch import SCRATCH_DIR
+
+    env = {
+        'SCRATCH_DIR':      os.path.join(SCRATCH_DIR, f'w{index}'),
+        'RENDER_CACHE_DIR': os.path.join(RENDER_CACHE_DIR, f'w{index}'),
+        'METRICS_PORT':     str(METRICS_PORT + index if METRICS_PORT else 0),
+    }
+    if not int(os.getenv("RENDER_WORKERS", "0")):
+        env['RENDER_WORKERS'] = str(max(1, (os.cpu_count() or 1) // count))
+    return env
+
+
+# ─── Worker ───────────────────────────────────────────────────────────────────
+
+def _worker_main(index: int, count: int, queue, env: dict):
+    os.environ.update(env)
+    asyncio.run(_serve(index, count, queue))
+    # multiprocessing jarayoni threading'ni kutmasdan chiqadi — render pool
+    # (post_shutdown da wait=False bilan yopilgan) jarayonlari to'xtashini
+    # shu yerda kutamiz, aks holda ular yetim bo'lib qoladi
+    for p in mp.active_children():
+        p.join()
+
+
+async def _serve(index, count, queue):
+    import bot
+    from storage import SQLitePersistence
+    from telegram import Update
+
+    app = bot.build_app(SQLitePersistence(shard=(index, count)), updater=False)
+    stop = stop_event()
+    loop = asyncio.get_running_loop()
+
+    def deliver(item):
+        app.update_queue.put_nowait(Update.de_json(item, app.bot))
+
+    def pump():
+        # mp.Queue bloklaydi — alohida oqimda o'qib, event loop ga uzatamiz
+        while True:
+            item = queue.get()
+            if item is None:
+                break
+            loop.call_soon_threadsafe(deliver, item)
+        loop.call_soon_threadsafe(stop.set)
+
+    async with running(app):
+        threading.Thread(target=pump, name='cluster-pump', daemon=True).start()
+        logger.info(f"Worker {index}/{count} ready (pid {os.getpid()})")
+        await stop.wait()
+
+
+# ─── Front ────────────────────────────────────────────────────────────────────
+
+class Front:
+    """Worker jarayonlar va ularning navbatlari; route() — update ni yo'naltirish"""
+
+    def __init__(self, count: int = BOT_WORKERS):
+        self.count  = count
+        self._ctx   = mp.get_context('spawn')
+        self.queues = [self._ctx.Queue() for _ in range(count)]
+        self.procs  = [None] * count
+        self.routed = [0] * count
+        self.restarts = 0
+
+    def start(self):
+        for i in range(self.count):
+            self._spawn(i)
+
+    def _spawn(self, i):
+        p = self._ctx.Process(target=_worker_main, name=f'cv-worker-{i}',
+                              args=(i, self.count, self.queues[i], worker_env(i, self.count)))
+        p.start()
+        self.procs[i] = p
+
+    def route(self, update: dict):
+        i = shard_of(user_id(update), self.count)
+        self.queues[i].put(update)
+        self.routed[i] += 1
+
+    async def put(self, update: dict):
+        self.route(update)
+
+    async def supervise(self, interval: float = 1.0):
+        """To'xtab qolgan worker ni qayta ishga tushiradi (navbati saqlanadi)"""
+        while True:
+            await asyncio.sleep(interval)
+            for i, p in enumerate(self.procs):
+                if not p.is_alive():
+                    logger.error(f"Worker {i} exited with {p.exitcode}, restarting")
+                    self.restarts += 1
+                    self._spawn(i)
+
+    def stop(self, timeout: float = 30):
+        for q in self.queues:
+            q.put(None)
+        for p in self.procs:
+            p.join(timeout)
+            if p.is_alive():
+                p.terminate()
+
+
+async def _poll(bot: Bot, front: Front):
+    offset, delay = None, 1
+    while True:
+        try:
+            updates = await bot.get_updates(offset=offset, timeout=POLL_TIMEOUT,
+                                            allowed_updates=ALLOWED_UPDATES)
+        except RetryAfter as e:
+            logger.warning(f"getUpdates: flood control, retry in {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+            continue
+        except TelegramError as e:
+            # NetworkError, Conflict (boshqa poller) va h.k. — kutib qayta urinamiz
+            logger.warning(f"getUpdates failed: {e!r}, retry in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, POLL_BACKOFF)
+            continue
+        delay = 1
+        for u in updates:
+            front.route(u.to_dict())
+            offset = u.update_id + 1
+
+
+def _task_died(task: asyncio.Task, name: str, stop: asyncio.Event):
+    """Front vazifasi kutilmaganda tugasa — front to'xtaydi (Railway qayta ishga
+    tushiradi), aks holda worker lar sog' ko'rinib, update kelmay qoladi"""
+    if task.cancelled():
+        return
+    logger.error(f"{name} died: {task.exception()!r}", exc_info=task.exception())
+    stop.set()
+
+
+async def run_front(count: int = BOT_WORKERS):
+    front = Front(count)
+    front.start()
+    stop = stop_event()
+    bot = Bot(BOT_TOKEN, **api_urls())
+    tasks = [asyncio.create_task(front.supervise())]
+    tasks[0].add_done_callback(lambda t: _task_died(t, 'Supervisor', stop))
+    server = None
+    try:
+        async with bot:
+            if WEBHOOK_URL:
+                await bot.set_webhook(WEBHOOK_URL, allowed_updates=ALLOWED_UPDATES,
+                                      secret_token=WEBHOOK_SECRET or None)
+                path = urlparse(WEBHOOK_URL).path or '/'
+                server = await serve_http({path: payload_handler(front.put)},
+                                          WEBHOOK_HOST, WEBHOOK_PORT)
+                logger.info(f"Front: webhook on {WEBHOOK_HOST}:{WEBHOOK_PORT}{path}, {count} workers")
+            else:
+                await bot.delete_webhook()
+                poller = asyncio.create_task(_poll(bot, front))
+                poller.add_done_callback(lambda t: _task_died(t, 'Poller', stop))
+                tasks.append(poller)
+                logger.info(f"Front: polling, {count} workers")
+            await stop.wait()
+    finally:
+        for task in tasks:
+            task.cancel()
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(None, front.stop)
+        logger.info(f"Front stopped: routed {front.routed}, restarts {front.restarts}")
+
+
+def main():
+    if BOT_WORKERS <= 1:
+        import bot
+        return bot.main()
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
+    print(f"✅ Bot ishga tushdi! ({BOT_WORKERS} worker)")
+    asyncio.run(run_front(BOT_WORKERS))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,428 +5,186 @@ Barcha muammolar hal qilingan versiya:
 - Shrift bir xil (Helvetica)
 - O'lchamlar to'g'ri (10-11pt)
 - Rasm aylana ichida
+- PDF dizayni shablondan (templates.py → pdf_plan.py)
+- PDF hajmi/sifati profildan (pdf_profiles.py)
 """
 
 import os
+import struct
+from contextlib import contextmanager
+from copy import deepcopy
+from dataclasses import replace
 from io import BytesIO
+from reportlab import rl_config
 from reportlab.pdfgen import canvas as rl_canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import mm
-
-PAGE_W, PAGE_H = A4          # 595 x 842 pt
-SB_W   = 63 * mm             # sidebar kengligi
-MN_X   = SB_W                # main ustun boshlanishi
-MN_W   = PAGE_W - SB_W
-PAD    = 7 * mm              # ichki bo'shliq
-
-# ── Ranglar ───────────────────────────────────────────────────────────────────
-BG     = colors.HexColor('#1B3A6B')   # sidebar fon
-ACCENT = colors.HexColor('#2761AB')   # asosiy ko'k
-GOLD   = colors.HexColor('#E9B949')   # oltin
-WHITE  = colors.white
-DARK   = colors.HexColor('#1C1C1C')
-GRAY   = colors.HexColor('#5A5A5A')
-LGRAY  = colors.HexColor('#E8EEF6')   # bo'limlar orasidagi chiziq
-
-# ── Shriftlar ─────────────────────────────────────────────────────────────────
-RG = 'Helvetica'
-BD = 'Helvetica-Bold'
-IT = 'Helvetica-Oblique'
-
-# ── Razmlar ───────────────────────────────────────────────────────────────────
+
+from pdf_plan import compile_plan
+from pdf_profiles import PDF_PROFILE, pdf_profile
+from photo import AVATAR_PX, AVATAR_QUALITY, prepare_avatar
+from templates import DEFAULT_TEMPLATE, TEMPLATES
+from cv_model import TEMPLATE_VERSION, CVModel, lang_dots, pe, pw, psk, pl, pc  # noqa: F401
+
+# 'stream' — docx_stream (tez), 'python-docx' — generate_docx; natija bir xil
+DOCX_BACKEND = os.getenv("DOCX_BACKEND", "stream")
+
+# PDF joylashuvi templates.py da (ma'lumot), pdf_plan.py uni bir marta
+# render rejasiga kompilyatsiya qiladi. DOCX dagi ism o'lchami:
 S_NAME = 19
-S_SEC  = 11
-S_JOB  = 10
-S_BODY = 9.5
-S_SM   = 8.5
-S_SB_T = 7.5   # sidebar title
-S_SB_V = 8.5   # sidebar value
-
-
-# ─── Yordamchi: matnni chop etish, sidebar uchun (overflow = truncate) ────────
-
-def sb_draw(c, text, font, size, x, y, max_w):
-    """Matnni max_w ga sig'masa qisqartiradi"""
-    text = str(text)
-    if c.stringWidth(text, font, size) <= max_w:
-        c.drawString(x, y, text)
-        return
-    while text and c.stringWidth(text + '...', font, size) > max_w:
-        text = text[:-1]
-    c.drawString(x, y, text + '...')
-
-
-def sb_wrap(c, text, font, size, x, y, max_w, lh):
-    """Matnni qatorlarga bo'lib chiqaradi, sidebar uchun"""
-    words = str(text).split()
-    line  = ''
-    for w in words:
-        t = (line + ' ' + w).strip()
-        if c.stringWidth(t, font, size) <= max_w:
-            line = t
-        else:
-            c.drawString(x, y, line)
-            y  -= lh
-            line = w
-    if line:
-        c.drawString(x, y, line)
-        y -= lh
-    return y
-
-
-def mn_wrap(c, text, font, size, x, y, max_w, lh, color=DARK):
-    """Main ustun uchun word wrap"""
-    c.setFillColor(color)
-    c.setFont(font, size)
-    words = str(text).split()
-    line  = ''
-    for w in words:
-        t = (line + ' ' + w).strip()
-        if c.stringWidth(t, font, size) <= max_w:
-            line = t
-        else:
-            c.drawString(x, y, line)
-            y  -= lh
-            line = w
-    if line:
-        c.drawString(x, y, line)
-        y -= lh
-    return y
-
-
-# ─── Til darajasi doiralari ───────────────────────────────────────────────────
-
-def lang_dots(level):
-    m = {'a1':1,'a2':2,'b1':3,'b2':4,'c1':5,'c2':6,
-         'native':6,'ona tili':6,'родной':6,'beginner':1,
-         'elementary':2,'intermediate':3,'upper intermediate':4,
-         'advanced':5,'proficient':6}
-    return m.get(level.strip().lower(), 3)
-
-def draw_dots(c, x, y, filled, total=5):
-    r, gap = 2.5, 7
-    for i in range(total):
-        c.setFillColor(GOLD if i < filled else colors.HexColor('#334F7A'))
-        c.circle(x + i*gap, y, r, fill=1, stroke=0)
-
-
-# ─── Parse funksiyalari ───────────────────────────────────────────────────────
-
-def pe(lst):
-    r=[]
-    for item in lst:
-        p=[x.strip() for x in item.split('|')]
-        r.append({'degree':p[0] if p else '','institution':p[1] if len(p)>1 else '',
-                  'years':p[2] if len(p)>2 else '','gpa':p[3] if len(p)>3 else ''})
-    return r
-
-def pw(lst):
-    r=[]
-    for item in lst:
-        p=[x.strip() for x in item.split('|')]
-        r.append({'position':p[0] if p else '','company':p[1] if len(p)>1 else '',
-                  'years':p[2] if len(p)>2 else '','description':p[3] if len(p)>3 else ''})
-    return r
-
-def psk(lst):
-    r=[]
-    for item in lst:
-        if ':' in item:
-            cat,sk=item.split(':',1)
-            r.append({'cat':cat.strip(),'sk':sk.strip()})
-    return r
-
-def pl(lst):
-    r=[]
-    for item in lst:
-        p=[x.strip() for x in item.split('|')]
-        if len(p)>=2:
-            r.append({'lang':p[0],'level':p[1]})
-    return r
-
-def pc(lst):
-    r=[]
-    for item in lst:
-        p=[x.strip() for x in item.split('|')]
-        r.append({'name':p[0] if p else '','org':p[1] if len(p)>1 else '','year':p[2] if len(p)>2 else ''})
-    return r
 
 
 # ─── ASOSIY PDF ───────────────────────────────────────────────────────────────
 
-def generate_pdf(data: dict, output_path: str):
-    c = rl_canvas.Canvas(output_path, pagesize=A4)
-
-    # =====================================================================
-    # SIDEBAR
-    # =====================================================================
-    c.setFillColor(BG)
-    c.rect(0, 0, SB_W, PAGE_H, fill=1, stroke=0)
-
-    # ── RASM ─────────────────────────────────────────────────────────────
-    first = data.get('first_name','')
-    last  = data.get('last_name','')
-    photo = data.get('photo')
-    sz    = 48 * mm
-    px    = (SB_W - sz) / 2
-    py    = PAGE_H - sz - 10*mm
-    cxp   = px + sz/2
-    cyp   = py + sz/2
-
-    if photo and os.path.exists(photo):
-        try:
-            from PIL import Image as PILImage
-            img = PILImage.open(photo).convert('RGB')
-            w, h = img.size
-            m = min(w, h)
-            img = img.crop(((w-m)//2,(h-m)//2,(w+m)//2,(h+m)//2))
-            img = img.resize((320, 320))
-            buf = BytesIO()
-            img.save(buf, 'JPEG', quality=92)
-            buf.seek(0)
-            c.saveState()
-            path = c.beginPath()
-            path.circle(cxp, cyp, sz/2)
-            c.clipPath(path, stroke=0, fill=0)
-            c.drawImage(buf, px, py, width=sz, height=sz,
-                        preserveAspectRatio=True, mask='auto')
-            c.restoreState()
-        except Exception:
-            c.setFillColor(ACCENT)
-            c.circle(cxp, cyp, sz/2, fill=1, stroke=0)
-            initials = (first[:1]+last[:1]).upper()
-            c.setFillColor(GOLD)
-            c.setFont(BD, 26)
-            tw = c.stringWidth(initials, BD, 26)
-            c.drawString(cxp-tw/2, cyp-9, initials)
+def generate_pdf(data, output_path, template: str = DEFAULT_TEMPLATE, profile: str = PDF_PROFILE):
+    """data — CVModel yoki user_data; output_path — fayl yo'li yoki buffer (BytesIO);
+    profile — pdf_profiles.PDF_PROFILES kaliti"""
+    pdf = render_pdf_bytes(data, template, profile)
+    if hasattr(output_path, 'write'):
+        output_path.write(pdf)
     else:
-        c.setFillColor(ACCENT)
-        c.circle(cxp, cyp, sz/2, fill=1, stroke=0)
-        initials = (first[:1]+last[:1]).upper()
-        c.setFillColor(GOLD)
-        c.setFont(BD, 26)
-        tw = c.stringWidth(initials, BD, 26)
-        c.drawString(cxp-tw/2, cyp-9, initials)
-
-    # Aylana chegara
-    c.setStrokeColor(GOLD)
-    c.setLineWidth(2.5)
-    c.circle(cxp, cyp, sz/2, fill=0, stroke=1)
-
-    sb_y = py - 7*mm
-    sb_max = SB_W - PAD*2   # sidebar matn maksimal kengligi
-
-    def sb_sec(title, y):
-        y -= 9*mm
-        c.setFillColor(GOLD)
-        c.setFont(BD, S_SB_T)
-        c.drawString(PAD, y, title.upper())
-        y -= 3
-        c.setStrokeColor(GOLD)
-        c.setLineWidth(0.5)
-        c.line(PAD, y, SB_W-PAD, y)
-        return y - 4.5
-
-    def sb_lbl(label, y):
-        c.setFillColor(colors.HexColor('#9BB8D4'))
-        c.setFont(BD, 6.5)
-        c.drawString(PAD, y, label.upper())
-        return y - 3.5*mm
-
-    def sb_val(text, y):
-        if not text: return y
-        c.setFillColor(WHITE)
-        c.setFont(RG, S_SB_V)
-        y = sb_wrap(c, text, RG, S_SB_V, PAD, y, sb_max, 3.8*mm)
-        return y - 1.5*mm
-
-    # ── CONTACT ───────────────────────────────────────────────────────────
-    sb_y = sb_sec('Contact', sb_y)
-    for lbl, key in [('Email','email'),('Phone','phone'),('Address','address')]:
-        v = data.get(key,'')
-        if v:
-            sb_y = sb_lbl(lbl, sb_y)
-            sb_y = sb_val(v, sb_y)
-    for lbl, key in [('LinkedIn','linkedin'),('GitHub','github'),('Website','website')]:
-        v = data.get(key,'')
-        if v:
-            sb_y = sb_lbl(lbl, sb_y)
-            sb_y = sb_val(v, sb_y)
-
-    # ── PERSONAL ──────────────────────────────────────────────────────────
-    sb_y = sb_sec('Personal', sb_y)
-    if data.get('dob'):
-        sb_y = sb_lbl('Date of Birth', sb_y)
-        sb_y = sb_val(data['dob'], sb_y)
-    if data.get('nationality'):
-        sb_y = sb_lbl('Nationality', sb_y)
-        sb_y = sb_val(data['nationality'], sb_y)
-
-    # ── LANGUAGES ─────────────────────────────────────────────────────────
-    langs = pl(data.get('lang_list',[]))
-    if langs:
-        sb_y = sb_sec('Languages', sb_y)
-        for lg in langs:
-            c.setFillColor(WHITE)
-            c.setFont(BD, 9)
-            sb_draw(c, lg['lang'], BD, 9, PAD, sb_y, sb_max)
-            sb_y -= 3.8*mm
-            c.setFillColor(GOLD)
-            c.setFont(IT, 8)
-            c.drawString(PAD, sb_y, lg['level'])
-            dots = lang_dots(lg['level'])
-            draw_dots(c, PAD + 24*mm, sb_y + 1.5, min(dots,5))
-            sb_y -= 6*mm
-
-    # ── SKILLS ────────────────────────────────────────────────────────────
-    skills = psk(data.get('skills_list',[]))
-    if skills:
-        sb_y = sb_sec('Skills', sb_y)
-        for sk in skills:
-            c.setFillColor(GOLD)
-            c.setFont(BD, 7.5)
-            c.drawString(PAD, sb_y, sk['cat'].upper())
-            sb_y -= 3.5*mm
-            c.setFillColor(WHITE)
-            c.setFont(RG, S_SB_V)
-            sb_y = sb_wrap(c, sk['sk'], RG, S_SB_V, PAD, sb_y, sb_max, 3.8*mm)
-            sb_y -= 2*mm
-
-    # =====================================================================
-    # MAIN USTUN
-    # =====================================================================
-
-    # Yuqori sariq chiziq
-    c.setFillColor(GOLD)
-    c.rect(MN_X, PAGE_H - 36*mm, 4, 36*mm, fill=1, stroke=0)
-
-    # ── ISMO ─────────────────────────────────────────────────────────────
-    mn_y = PAGE_H - 11*mm
-    c.setFillColor(BG)
-    c.setFont(BD, S_NAME)
-    name_str = first.upper()
-    c.drawString(MN_X + PAD, mn_y, name_str)
-    nw = c.stringWidth(name_str + ' ', BD, S_NAME)
-    c.setFillColor(ACCENT)
-    c.drawString(MN_X + PAD + nw, mn_y, last.upper())
-    mn_y -= 6*mm
-
-    # ── OBJECTIVE ─────────────────────────────────────────────────────────
-    obj = data.get('objective','')
-    if obj:
-        mn_y = mn_wrap(c, obj, IT, S_BODY,
-                       MN_X+PAD, mn_y, MN_W-PAD*2, 4.5*mm, GRAY)
-    mn_y -= 3*mm
-
-    mn_max = MN_W - PAD*2
-
-    def mn_sec(title, y):
-        y -= 6*mm
-        # Section chiziq
-        c.setStrokeColor(ACCENT)
-        c.setLineWidth(1.5)
-        c.line(MN_X+PAD, y+1*mm, MN_X+PAD+4*mm, y+1*mm)
-        c.setFillColor(DARK)
-        c.setFont(BD, S_SEC)
-        c.drawString(MN_X+PAD+5.5*mm, y, title.upper())
-        y -= 2*mm
-        c.setStrokeColor(LGRAY)
-        c.setLineWidth(0.8)
-        c.line(MN_X+PAD, y, PAGE_W-PAD, y)
-        return y - 4*mm
-
-    def mn_entry(title, subtitle, years, desc, y):
-        # Sarlavha + yil
-        c.setFillColor(DARK)
-        c.setFont(BD, S_JOB)
-        c.drawString(MN_X+PAD, y, title)
-        c.setFillColor(GRAY)
-        c.setFont(IT, S_SM)
-        rw = c.stringWidth(years, IT, S_SM)
-        c.drawString(PAGE_W-PAD-rw, y, years)
-        y -= 4.5*mm
-
-        # Subtitle (kompaniya / muassasa)
-        if subtitle:
-            c.setFillColor(ACCENT)
-            c.setFont(BD, S_SM)
-            c.drawString(MN_X+PAD, y, subtitle)
-            y -= 4*mm
-
-        # Tavsif
-        if desc:
-            for line in desc.split(','):
-                line = line.strip()
-                if not line: continue
-                c.setFillColor(ACCENT)
-                c.setFont(BD, S_BODY)
-                c.drawString(MN_X+PAD, y, '•')
-                y = mn_wrap(c, line, RG, S_BODY,
-                            MN_X+PAD+4.5*mm, y, mn_max-4.5*mm, 4.5*mm, DARK)
-
-        y -= 2*mm
-        return y
-
-    # ── EDUCATION ─────────────────────────────────────────────────────────
-    edu = pe(data.get('education_list',[]))
-    if edu:
-        mn_y = mn_sec('Education', mn_y)
-        for e in edu:
-            yr = e['years'] + (f'  GPA: {e["gpa"]}' if e.get('gpa') else '')
-            mn_y = mn_entry(e['degree'], e['institution'], yr, '', mn_y)
-
-    # ── WORK EXPERIENCE ───────────────────────────────────────────────────
-    work = pw(data.get('work_list',[]))
-    if work:
-        mn_y = mn_sec('Work Experience', mn_y)
-        for w in work:
-            mn_y = mn_entry(w['position'], w['company'], w['years'], w['description'], mn_y)
-
-    # ── CERTIFICATES ──────────────────────────────────────────────────────
-    certs = pc(data.get('cert_list',[]))
-    if certs:
-        mn_y = mn_sec('Certificates', mn_y)
-        for cert in certs:
-            nm = cert['name'] + (f'  —  {cert["org"]}' if cert.get('org') else '')
-            yr = cert.get('year','')
-            c.setFillColor(DARK)
-            c.setFont(BD, S_BODY)
-            c.drawString(MN_X+PAD, mn_y, nm)
-            if yr:
-                c.setFillColor(GRAY)
-                c.setFont(IT, S_SM)
-                rw = c.stringWidth(yr, IT, S_SM)
-                c.drawString(PAGE_W-PAD-rw, mn_y, yr)
-            mn_y -= 5*mm
-
-    # ── HOBBIES ───────────────────────────────────────────────────────────
-    hobbies = data.get('hobbies','')
-    if hobbies:
-        mn_y = mn_sec('Interests', mn_y)
-        mn_y = mn_wrap(c, hobbies, RG, S_BODY, MN_X+PAD, mn_y, mn_max, 4.5*mm, DARK)
-
-    c.save()
+        with open(output_path, 'wb') as f:
+            f.write(pdf)
+
+
+def render_pdf_bytes(data, template: str = DEFAULT_TEMPLATE, profile: str = PDF_PROFILE) -> bytes:
+    """PDF baytlari. Profilda max_bytes bo'lsa va hujjat undan katta chiqsa —
+    rasm sifati quality_step bilan min_quality gacha pasaytiriladi, yetmasa
+    rasm o'rniga bosh harflar. Chegaradan faqat matnning o'zi katta bo'lsa oshadi."""
+    spec = pdf_profile(profile)
+    plan = compile_plan(template)
+    cv = CVModel.from_data(data)
+    quality = spec['quality']
+    pdf = _pdf(plan, _avatar(cv, spec, quality), spec)
+    limit = spec.get('max_bytes')
+    if limit is None or len(pdf) <= limit or not _has_photo(cv):
+        return pdf
+    while quality > spec['min_quality']:
+        quality = max(spec['min_quality'], quality - spec['quality_step'])
+        pdf = _pdf(plan, _avatar(cv, spec, quality), spec)
+        if len(pdf) <= limit:
+            return pdf
+    return _pdf(plan, replace(cv, photo=None), spec)
+
+
+def _pdf(plan, cv, spec) -> bytes:
+    buf = BytesIO()
+    with _ascii85(spec['ascii85']):
+        # invariant — sana va document ID qat'iy: bir xil ma'lumot → bir xil bayt
+        c = rl_canvas.Canvas(buf, pagesize=plan.pagesize, invariant=1,
+                             pageCompression=spec['compress'])
+        plan.draw(c, cv)
+        c.save()
+    return buf.getvalue()
+
+
+@contextmanager
+def _ascii85(on):
+    # ReportLab da bu faqat global sozlama; render jarayoni bitta oqimli
+    old, rl_config.useA85 = rl_config.useA85, on
+    try:
+        yield
+    finally:
+        rl_config.useA85 = old
+
+
+def _has_photo(cv) -> bool:
+    return isinstance(cv.photo, bytes) or bool(cv.photo and os.path.exists(cv.photo))
+
+
+def _avatar(cv, spec, quality):
+    """Profil uchun rasm. Yuklashda shu o'lcham va sifatda tayyorlangan fayl
+    o'zi qoladi (PIL siz joylanadi), aks holda fayldan JPEG bayt tayyorlanadi"""
+    if isinstance(cv.photo, bytes) or not _has_photo(cv):
+        return cv
+    if cv.photo_ready and spec['image_px'] == AVATAR_PX and quality == AVATAR_QUALITY:
+        return cv
+    try:
+        with open(cv.photo, 'rb') as f:
+            jpeg = prepare_avatar(f.read(), spec['image_px'], quality, upscale=False)
+    except Exception:
+        return cv       # pdf_plan o'zi bosh harflarga o'tadi
+    return replace(cv, photo=jpeg, photo_ready=True)
+
+
+def draw_pdf(c, data, template: str = DEFAULT_TEMPLATE):
+    """Bitta CV ni canvas ning joriy sahifasiga chizadi (batch — bir faylda ko'p CV)"""
+    compile_plan(template).draw(c, CVModel.from_data(data))
 
 
 # ─── DOCX ─────────────────────────────────────────────────────────────────────
 
-def generate_docx(data: dict, output_path: str):
+_docx_skeleton = None   # (DocumentPart, toza <w:body> nusxasi) — har jarayonda bir marta
+
+
+def docx_skeleton():
+    """Foydalanuvchiga bog'liq bo'lmagan DOCX qismi: margin'lar, ikki ustunli
+    jadval, kenglik va fon. Bir marta quriladi; har renderda faqat <w:body>
+    nusxalanadi — shablon package, styles va theme qayta o'qilmaydi.
+    (doc, sidebar_cell, main_cell) qaytaradi."""
+    global _docx_skeleton
     from docx import Document
+
+    if _docx_skeleton is None:
+        from docx.shared import Cm
+        from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
+        from docx.oxml.ns import qn
+        from docx.oxml import OxmlElement
+
+        doc = Document()
+        for sec in doc.sections:
+            sec.top_margin    = Cm(0)
+            sec.bottom_margin = Cm(1)
+            sec.left_margin   = Cm(0)
+            sec.right_margin  = Cm(0)
+            sec.page_width    = Cm(21)
+            sec.page_height   = Cm(29.7)
+
+        def hex_fill(cell, hx):
+            tcPr = cell._tc.get_or_add_tcPr()
+            shd  = OxmlElement('w:shd')
+            shd.set(qn('w:val'),'clear')
+            shd.set(qn('w:color'),'auto')
+            shd.set(qn('w:fill'), hx)
+            tcPr.append(shd)
+
+        def set_w(cell, twips):
+            tcPr = cell._tc.get_or_add_tcPr()
+            tcW  = tcPr.find(qn('w:tcW'))
+            if tcW is None:
+                tcW = OxmlElement('w:tcW')
+                tcPr.append(tcW)
+            tcW.set(qn('w:w'), str(twips))
+            tcW.set(qn('w:type'), 'dxa')
+
+        tbl = doc.add_table(rows=1, cols=2)
+        tbl.alignment = WD_TABLE_ALIGNMENT.LEFT
+        tbl.allow_autofit = False
+        sc = tbl.cell(0,0)
+        mc = tbl.cell(0,1)
+        set_w(sc, 3570)
+        set_w(mc, 8250)
+        hex_fill(sc,'1B3A6B')
+        hex_fill(mc,'FFFFFF')
+        sc.vertical_alignment = WD_ALIGN_VERTICAL.TOP
+        mc.vertical_alignment = WD_ALIGN_VERTICAL.TOP
+        _docx_skeleton = (doc.part, deepcopy(doc.element.body))
+
+    part, body = _docx_skeleton
+    root = part.element
+    root.replace(root.body, deepcopy(body))
+    doc = part.document
+    tbl = doc.tables[0]
+    return doc, tbl.cell(0,0), tbl.cell(0,1)
+
+
+def generate_docx(data, output_path):
+    """data — CVModel yoki user_data; output_path — fayl yo'li yoki buffer (BytesIO)"""
+    cv = CVModel.from_data(data)
     from docx.shared import Pt, Cm, RGBColor
     from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
     from docx.oxml.ns import qn
     from docx.oxml import OxmlElement
 
-    doc = Document()
-    for sec in doc.sections:
-        sec.top_margin    = Cm(0)
-        sec.bottom_margin = Cm(1)
-        sec.left_margin   = Cm(0)
-        sec.right_margin  = Cm(0)
-        sec.page_width    = Cm(21)
-        sec.page_height   = Cm(29.7)
+    doc, sc, mc = docx_skeleton()
 
     CBLU = RGBColor(27,58,107)
     CACC = RGBColor(39,97,171)
@@ -435,35 +193,6 @@ def generate_docx(data: dict, output_path: str):
     CDRK = RGBColor(28,28,28)
     CGRY = RGBColor(90,90,90)
 
-    def hex_fill(cell, hx):
-        tcPr = cell._tc.get_or_add_tcPr()
-        shd  = OxmlElement('w:shd')
-        shd.set(qn('w:val'),'clear')
-        shd.set(qn('w:color'),'auto')
-        shd.set(qn('w:fill'), hx)
-        tcPr.append(shd)
-
-    def set_w(cell, twips):
-        tcPr = cell._tc.get_or_add_tcPr()
-        tcW  = tcPr.find(qn('w:tcW'))
-        if tcW is None:
-            tcW = OxmlElement('w:tcW')
-            tcPr.append(tcW)
-        tcW.set(qn('w:w'), str(twips))
-        tcW.set(qn('w:type'), 'dxa')
-
-    tbl = doc.add_table(rows=1, cols=2)
-    tbl.alignment = WD_TABLE_ALIGNMENT.LEFT
-    tbl.allow_autofit = False
-    sc = tbl.cell(0,0)
-    mc = tbl.cell(0,1)
-    set_w(sc, 3570)
-    set_w(mc, 8250)
-    hex_fill(sc,'1B3A6B')
-    hex_fill(mc,'FFFFFF')
-    sc.vertical_alignment = WD_ALIGN_VERTICAL.TOP
-    mc.vertical_alignment = WD_ALIGN_VERTICAL.TOP
-
     def rn(p, text, size, bold=False, italic=False, color=CWHT):
         r = p.add_run(text)
         r.font.name  = 'Calibri'
@@ -505,8 +234,8 @@ def generate_docx(data: dict, output_path: str):
             sp(sc, text, size=9, color=CWHT, sa=2)
 
     # Sidebar — initials
-    first = data.get('first_name','')
-    last  = data.get('last_name','')
+    first = cv.first_name
+    last  = cv.last_name
     initials = (first[:1]+last[:1]).upper()
     sp(sc, initials, size=32, bold=True, color=CGLD,
        sb=18, sa=6, align=WD_ALIGN_PARAGRAPH.CENTER, indent=0)
@@ -514,33 +243,30 @@ def generate_docx(data: dict, output_path: str):
     sb_section('Contact')
     for lbl,key in [('Email','email'),('Phone','phone'),('Address','address'),
                      ('LinkedIn','linkedin'),('GitHub','github'),('Website','website')]:
-        v=data.get(key,'')
+        v=getattr(cv, key)
         if v:
             sb_lbl(lbl)
             sb_val(v)
 
     sb_section('Personal')
     for lbl,key in [('Date of Birth','dob'),('Nationality','nationality')]:
-        v=data.get(key,'')
+        v=getattr(cv, key)
         if v:
             sb_lbl(lbl)
             sb_val(v)
 
-    langs = pl(data.get('lang_list',[]))
-    if langs:
+    if cv.languages:
         sb_section('Languages')
-        for lg in langs:
-            sp(sc, lg['lang'], size=9, bold=True, color=CWHT, sb=3, sa=0)
-            dots = lang_dots(lg['level'])
-            bar  = '●'*min(dots,5) + '○'*(5-min(dots,5))
-            sp(sc, f"{lg['level']}  {bar}", size=8, italic=True, color=CGLD, sa=2)
-
-    skills = psk(data.get('skills_list',[]))
-    if skills:
+        for lg in cv.languages:
+            sp(sc, lg.lang, size=9, bold=True, color=CWHT, sb=3, sa=0)
+            bar  = '●'*lg.dots + '○'*(5-lg.dots)
+            sp(sc, f"{lg.level}  {bar}", size=8, italic=True, color=CGLD, sa=2)
+
+    if cv.skills:
         sb_section('Skills')
-        for sk in skills:
-            sp(sc, sk['cat'].upper(), size=7.5, bold=True, color=CGLD, sb=3, sa=0)
-            sp(sc, sk['sk'], size=9, color=CWHT, sa=2)
+        for sk in cv.skills:
+            sp(sc, sk.cat.upper(), size=7.5, bold=True, color=CGLD, sb=3, sa=0)
+            sp(sc, sk.sk, size=9, color=CWHT, sa=2)
 
     # ── MAIN ──────────────────────────────────────────────────────────────
     mc.paragraphs[0].clear()
@@ -577,45 +303,108 @@ def generate_docx(data: dict, output_path: str):
     rn(p, first.upper()+' ', S_NAME, bold=True, color=CBLU)
     rn(p, last.upper(),      S_NAME, bold=True, color=CACC)
 
-    if data.get('objective'):
-        mp(data['objective'], size=9.5, italic=True, color=CGRY, sa=6)
+    if cv.objective:
+        mp(cv.objective, size=9.5, italic=True, color=CGRY, sa=6)
 
-    edu = pe(data.get('education_list',[]))
-    if edu:
+    if cv.education:
         mn_section('Education')
-        for e in edu:
+        for e in cv.education:
             p = mp(sb=4, sa=1)
-            rn(p, e['degree'], 10, bold=True, color=CDRK)
-            if e.get('years'):
-                rn(p, f"  {e['years']}", 8.5, italic=True, color=CGRY)
-            mp(e['institution'], size=9, italic=True, color=CGRY, sa=4)
+            rn(p, e.degree, 10, bold=True, color=CDRK)
+            if e.years:
+                rn(p, f"  {e.years}", 8.5, italic=True, color=CGRY)
+            mp(e.institution, size=9, italic=True, color=CGRY, sa=4)
 
-    work = pw(data.get('work_list',[]))
-    if work:
+    if cv.work:
         mn_section('Work Experience')
-        for w in work:
+        for w in cv.work:
             p = mp(sb=4, sa=1)
-            rn(p, w['position'], 10, bold=True, color=CDRK)
-            if w.get('years'):
-                rn(p, f"  {w['years']}", 8.5, italic=True, color=CGRY)
-            mp(w['company'], size=9, italic=True, color=CGRY, sa=2)
-            if w.get('description'):
-                for desc in w['description'].split(','):
-                    desc=desc.strip()
-                    if desc:
-                        mp(f'• {desc}', size=9.5, color=CDRK, sa=1, indent=0.8)
-
-    certs = pc(data.get('cert_list',[]))
-    if certs:
+            rn(p, w.position, 10, bold=True, color=CDRK)
+            if w.years:
+                rn(p, f"  {w.years}", 8.5, italic=True, color=CGRY)
+            mp(w.company, size=9, italic=True, color=CGRY, sa=2)
+            for desc in w.bullets:
+                mp(f'• {desc}', size=9.5, color=CDRK, sa=1, indent=0.8)
+
+    if cv.certificates:
         mn_section('Certificates')
-        for cert in certs:
-            t = cert['name']
-            if cert.get('org'):  t += f' — {cert["org"]}'
-            if cert.get('year'): t += f'  ({cert["year"]})'
+        for cert in cv.certificates:
+            t = cert.name
+            if cert.org:  t += f' — {cert.org}'
+            if cert.year: t += f'  ({cert.year})'
             mp(f'• {t}', size=9.5, color=CDRK, sb=2, sa=1, indent=0.8)
 
-    if data.get('hobbies'):
+    if cv.hobbies:
         mn_section('Interests')
-        mp(data['hobbies'], size=9.5, color=CDRK, sa=2)
+        mp(cv.hobbies, size=9.5, color=CDRK, sa=2)
 
     doc.save(output_path)
+
+
+# ─── Xotirada render (diskka yozmasdan) ──────────────────────────────────────
+
+def render_docx_bytes(data, backend: str = DOCX_BACKEND) -> bytes:
+    if backend == 'stream':
+        from docx_stream import render_docx_stream_bytes
+        return render_docx_stream_bytes(data)
+    buf = BytesIO()
+    generate_docx(data, buf)
+    return _zip_fixed_times(buf.getvalue())
+
+
+def render_preview_bytes(data, width=None, template: str = DEFAULT_TEMPLATE) -> bytes:
+    """Tasdiqlashdan oldingi PNG eskiz: xuddi shu render rejasi, lekin PIL ga va
+    rasmsiz (foto o'rniga bosh harflar) — to'liq PDF+DOCX dan ancha arzon"""
+    from preview import PREVIEW_WIDTH, PreviewCanvas
+    plan = compile_plan(template)
+    c = PreviewCanvas(width or PREVIEW_WIDTH, pagesize=plan.pagesize)
+    plan.draw(c, replace(CVModel.from_data(data), photo=None))
+    return c.png()
+
+
+_DOS_EPOCH = struct.pack('<HH', 0, (1 << 5) | 1)   # 1980-01-01 00:00
+
+
+def _zip_fixed_times(raw: bytes) -> bytes:
+    """ZIP ichidagi fayllar vaqtini qat'iy qiladi (python-docx joriy vaqtni yozadi).
+    Siqilgan ma'lumot qayta ishlanmaydi — faqat sarlavhalardagi 4 bayt."""
+    buf = bytearray(raw)
+    end = buf.rfind(b'PK\x05\x06')
+    count, _, pos = struct.unpack_from('<HII', buf, end + 10)
+    for _ in range(count):
+        n, m, k = struct.unpack_from('<HHH', buf, pos + 28)
+        local, = struct.unpack_from('<I', buf, pos + 42)
+        buf[pos + 12:pos + 16] = _DOS_EPOCH
+        buf[local + 10:local + 14] = _DOS_EPOCH
+        pos += 46 + n + m + k
+    return bytes(buf)
+
+
+# ─── Oldindan isitish ─────────────────────────────────────────────────────────
+
+WARM_CHARS = (''.join(map(chr, range(32, 127))) + '●○•—…'
+              + 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+              + 'ЎўҚқҒғҲҳʻʼ')
+
+
+def warm_up():
+    """Render jarayoni uchun: shablon rejalari, shrift kengliklari, DOCX skeleti
+    va kichik sinov renderi (ReportLab/python-docx ichki keshlari shu yerda to'ladi)"""
+    import textlayout
+
+    for name, tpl in TEMPLATES.items():
+        compile_plan(name)
+        textlayout.warm(tuple(tpl['fonts'].values()), WARM_CHARS)
+    sample = {'first_name': 'A', 'last_name': 'B', 'email': 'a@b.c',
+              'work_list': ['X | Y | 2020 | z'], 'lang_list': ['English | B2']}
+    render_pdf_bytes(sample)
+    render_docx_bytes(sample, backend='python-docx')
+    if DOCX_BACKEND == 'stream':
+        render_docx_bytes(sample, backend='stream')
+    render_preview_bytes(sample)
+
+
+if __name__ == '__main__':
+    import sys
+    from batch import main
+    sys.exit(main())
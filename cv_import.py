@@ -0,0 +1,239 @@
+"""
+Butun CV ni bitta xabarda qabul qilish — 20 ta savol-javob o'rniga.
+
+Qabul qilinadigan shakllar:
+  - JSON (.json yoki '{' bilan boshlangan matn)
+  - YAML (.yaml/.yml) — PyYAML o'rnatilgan bo'lsa
+  - matn shablon (.txt yoki oddiy xabar), TEMPLATE ga qarang
+
+Bo'lim elementlari suhbatdagi kabi satr ("Bakalavr | TATU | 2018-2022 | 4.5")
+yoki maydonlari nomlangan obyekt bo'lishi mumkin — ikkalasi ham bir xil
+satrga keltiriladi va keyin cv_model dagi pe/pw/psk/pl/pc bilan tahlil
+qilinadi. Xatolar birinchisida to'xtamaydi — hammasi birga qaytariladi.
+
+    data = parse_submission(raw, filename)   # SubmissionError(errors)
+"""
+
+import datetime
+import json
+
+from cv_model import SECTIONS
+from render_cache import TEXT_FIELDS
+
+MAX_BYTES = 64 * 1024
+MAX_ITEMS = 30          # har bo'limda
+REQUIRED  = ('first_name', 'last_name')
+LANGS     = ('uz', 'ru', 'en')
+
+# bo'lim → obyekt ko'rinishidagi element maydonlari (satrdagi tartibda)
+ITEM_FIELDS = {
+    'education':    ('degree', 'institution', 'years', 'gpa'),
+    'work':         ('position', 'company', 'years', 'description'),
+    'skills':       ('category', 'skills'),
+    'languages':    ('language', 'level'),
+    'certificates': ('name', 'org', 'year'),
+}
+# suhbatdagi filtrlar bilan bir xil: shu belgisiz satr e'tiborsiz qolar edi
+ITEM_SEP = {'education': '|', 'work': '|', 'skills': ':', 'languages': '|', 'certificates': '|'}
+
+# bo'limni user_data kaliti bilan ham yozish mumkin: education_list, lang_list...
+SECTION_KEYS = {name: name for name in SECTIONS}
+SECTION_KEYS.update({key: name for name, (key, _) in SECTIONS.items()})
+
+TEMPLATE = """\
+first_name: Ali
+last_name: Valiyev
+dob: 15.03.1995
+nationality: O'zbek
+email: ali@example.com
+phone: +998901234567
+address: Toshkent, O'zbekiston
+linkedin: linkedin.com/in/ali
+github: github.com/ali
+website:
+objective: Backend dasturchi, yuqori yuklamali tizimlar
+education:
+- Bakalavr | TATU | 2014-2018 | 4.5
+work:
+- Backend developer | Uzum | 2020-2024 | API, to'lov tizimi, monitoring
+skills:
+- Backend: Python, Django, PostgreSQL
+languages:
+- O'zbek | Native
+- English | C1
+certificates:
+- AWS Solutions Architect | Amazon | 2023
+hobbies: Shaxmat, yugurish"""
+
+
+class SubmissionError(ValueError):
+    """Yuborilgan CV da xatolar bor; errors — hammasining ro'yxati"""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+# ─── Formatlar ────────────────────────────────────────────────────────────────
+
+def parse_submission(raw, filename: str = '') -> dict:
+    """Xom matn/bayt → user_data maydonlari (bo'limlar hali tahlil qilinmagan)"""
+    if isinstance(raw, (bytes, bytearray)):
+        if len(raw) > MAX_BYTES:
+            raise SubmissionError([f"file is larger than {MAX_BYTES // 1024} KB"])
+        try:
+            raw = bytes(raw).decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise SubmissionError(["file is not UTF-8 text"]) from None
+    text = raw.strip()
+    ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+
+    if ext == 'json' or (not ext and text.startswith('{')):
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise SubmissionError([f"invalid JSON: {e}"]) from None
+    elif ext in ('yaml', 'yml'):
+        obj = _load_yaml(text)
+    else:
+        obj, errors = parse_text(text)
+        return to_user_data(obj, errors)
+    return to_user_data(obj)
+
+
+def _load_yaml(text):
+    try:
+        import yaml
+    except ImportError:
+        raise SubmissionError(["YAML is not supported here, send JSON or text"]) from None
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        mark = getattr(e, 'problem_mark', None)
+        where = f" (line {mark.line + 1})" if mark is not None else ''
+        raise SubmissionError([f"invalid YAML: {getattr(e, 'problem', None) or e}{where}"]) from None
+
+
+def parse_text(text: str):
+    """'maydon: qiymat' qatorlari; bo'lim sarlavhasidan keyin '- ...' elementlar.
+    (data, qator xatolari) qaytaradi — maydon xatolari bilan birga ko'rsatiladi."""
+    data, errors, section = {}, [], None
+    for n, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line[0] in '-•' and section:
+            data[section].append(line[1:].strip())
+            continue
+        key, sep, value = line.partition(':')
+        key = key.strip().lower()
+        value = value.strip()
+        if sep and key in SECTION_KEYS:
+            section = key
+            data[key] = [value] if value else []
+        elif sep and (key in TEXT_FIELDS or key == 'lang'):
+            section = None
+            data[key] = value
+        elif section:
+            data[section].append(line)      # '-' siz element
+        elif sep:
+            errors.append(f"line {n}: unknown field {key[:40]!r}")
+        else:
+            errors.append(f"line {n}: expected 'field: value', got {line[:40]!r}")
+    return data, errors
+
+
+# ─── Tekshirish ───────────────────────────────────────────────────────────────
+
+def _scalar(v):
+    if isinstance(v, str):
+        return v.strip()
+    # YAML sana va sonlarni o'zi o'giradi (dob: 1995-03-15, year: 2023)
+    if isinstance(v, (int, float, datetime.date)) and not isinstance(v, bool):
+        return str(v)
+    return None
+
+
+def _item(name, item, where, errors):
+    """Bitta bo'lim elementi → suhbatdagi satr ko'rinishi"""
+    sep = ITEM_SEP[name]
+    fields = ITEM_FIELDS[name]
+    if isinstance(item, dict):
+        unknown = sorted(set(item) - set(fields))
+        if unknown:
+            errors.append(f"{where}: unknown fields {', '.join(map(str, unknown))} "
+                          f"(expected {', '.join(fields)})")
+            return None
+        parts = []
+        for f in fields:
+            v = item.get(f)
+            if f == 'description' and isinstance(v, list):
+                v = ', '.join(_scalar(x) or '' for x in v)
+            v = _scalar(v) if v is not None else ''
+            if v is None or (sep == '|' and '|' in v):
+                errors.append(f"{where}.{f}: expected text without '|'")
+                return None
+            parts.append(v)
+        if sep == ':':
+            text = f"{parts[0]}: {parts[1]}"
+        else:
+            text = ' | '.join(parts).rstrip(' |')
+    else:
+        text = _scalar(item)
+        if text is None:
+            errors.append(f"{where}: expected text or an object")
+            return None
+    if sep not in text or not text.split(sep, 1)[0].strip():
+        errors.append(f"{where}: expected '{(' ' + sep + ' ').join(fields)}', got {text[:40]!r}")
+        return None
+    if name == 'languages' and not text.split('|')[1].strip():
+        errors.append(f"{where}: language level is missing")
+        return None
+    return text
+
+
+def to_user_data(obj, errors=None) -> dict:
+    """Tekshiradi va user_data ga keltiradi; barcha xatolar SubmissionError da"""
+    if not isinstance(obj, dict):
+        raise SubmissionError([f"expected an object with CV fields, got {type(obj).__name__}"])
+    data, errors = {}, list(errors or ())
+    for key, value in obj.items():
+        key = str(key).strip().lower()
+        if key == 'lang':
+            if value not in LANGS:
+                errors.append(f"lang: expected one of {', '.join(LANGS)}")
+            else:
+                data['lang'] = value
+        elif key in TEXT_FIELDS:
+            v = _scalar(value) if value is not None else ''
+            if v is None:
+                errors.append(f"{key}: expected text")
+            else:
+                data[key] = v
+        elif key in SECTION_KEYS:
+            name = SECTION_KEYS[key]
+            if name == 'skills' and isinstance(value, dict):
+                # skills: {Backend: "Python, Django"}
+                value = [{'category': k, 'skills': v} for k, v in value.items()]
+            if value is None:
+                value = []
+            if not isinstance(value, list):
+                errors.append(f"{key}: expected a list")
+                continue
+            if len(value) > MAX_ITEMS:
+                errors.append(f"{key}: at most {MAX_ITEMS} items")
+                continue
+            items = [_item(name, x, f"{key}[{i + 1}]", errors) for i, x in enumerate(value)]
+            data[SECTIONS[name][0]] = [x for x in items if x is not None]
+        else:
+            errors.append(f"{key}: unknown field")
+    for key in REQUIRED:
+        if not data.get(key):
+            errors.append(f"{key}: required")
+    if errors:
+        raise SubmissionError(errors)
+    for key in TEXT_FIELDS:
+        data.setdefault(key, '')
+    for _, (list_key, _) in SECTIONS.items():
+        data.setdefault(list_key, [])
+    return data
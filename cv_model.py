@@ -0,0 +1,167 @@
+"""
+CV ma'lumotlari modeli — user_data dagi '|' va ':' bilan ajratilgan satrlar
+bir marta tahlil qilinadi va ikkala renderer (PDF, DOCX) shu modeldan foydalanadi.
+
+Bot har bir bo'lim /done bo'lganda parse_section() ni chaqiradi, shuning uchun
+tasdiqlash paytida faqat chizish qoladi.
+"""
+
+from dataclasses import dataclass
+
+# Dizayn (cv_generator, docx_stream) o'zgarsa oshiring — render cache kalitiga
+# kiradi. Bu yerda turadi, chunki bot cv_generator ni (ReportLab) yuklamaydi.
+TEMPLATE_VERSION = 1
+
+
+@dataclass(slots=True)
+class Education:
+    degree: str
+    institution: str
+    years: str
+    gpa: str
+
+
+@dataclass(slots=True)
+class Work:
+    position: str
+    company: str
+    years: str
+    description: str
+    bullets: tuple      # description vergul bo'yicha bo'lingan
+
+
+@dataclass(slots=True)
+class Skill:
+    cat: str
+    sk: str
+
+
+@dataclass(slots=True)
+class Language:
+    lang: str
+    level: str
+    dots: int           # 1..5, lang_dots dan
+
+
+@dataclass(slots=True)
+class Certificate:
+    name: str
+    org: str
+    year: str
+
+
+# ─── Til darajasi ─────────────────────────────────────────────────────────────
+
+def lang_dots(level):
+    m = {'a1':1,'a2':2,'b1':3,'b2':4,'c1':5,'c2':6,
+         'native':6,'ona tili':6,'родной':6,'beginner':1,
+         'elementary':2,'intermediate':3,'upper intermediate':4,
+         'advanced':5,'proficient':6}
+    return m.get(level.strip().lower(), 3)
+
+
+# ─── Parse funksiyalari ───────────────────────────────────────────────────────
+
+def _parts(item, n):
+    p = [x.strip() for x in item.split('|')]
+    return p + [''] * (n - len(p))
+
+def pe(lst):
+    r=[]
+    for item in lst:
+        p=_parts(item, 4)
+        r.append(Education(p[0], p[1], p[2], p[3]))
+    return tuple(r)
+
+def pw(lst):
+    r=[]
+    for item in lst:
+        p=_parts(item, 4)
+        bullets=tuple(d.strip() for d in p[3].split(',') if d.strip())
+        r.append(Work(p[0], p[1], p[2], p[3], bullets))
+    return tuple(r)
+
+def psk(lst):
+    r=[]
+    for item in lst:
+        if ':' in item:
+            cat,sk=item.split(':',1)
+            r.append(Skill(cat.strip(), sk.strip()))
+    return tuple(r)
+
+def pl(lst):
+    r=[]
+    for item in lst:
+        p=[x.strip() for x in item.split('|')]
+        if len(p)>=2:
+            r.append(Language(p[0], p[1], min(lang_dots(p[1]), 5)))
+    return tuple(r)
+
+def pc(lst):
+    r=[]
+    for item in lst:
+        p=_parts(item, 3)
+        r.append(Certificate(p[0], p[1], p[2]))
+    return tuple(r)
+
+
+# bo'lim nomi → (user_data dagi xom ro'yxat, parser)
+SECTIONS = {
+    'education':    ('education_list', pe),
+    'work':         ('work_list',      pw),
+    'skills':       ('skills_list',    psk),
+    'languages':    ('lang_list',      pl),
+    'certificates': ('cert_list',      pc),
+}
+
+
+def parse_section(data: dict, name: str):
+    """Xom ro'yxatni tahlil qilib data[name] ga yozadi (bot /done da chaqiradi)"""
+    key, parser = SECTIONS[name]
+    data[name] = parser(data.get(key, []))
+    return data[name]
+
+
+# ─── Model ────────────────────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class CVModel:
+    first_name: str = ''
+    last_name: str = ''
+    dob: str = ''
+    nationality: str = ''
+    email: str = ''
+    phone: str = ''
+    address: str = ''
+    linkedin: str = ''
+    github: str = ''
+    website: str = ''
+    objective: str = ''
+    hobbies: str = ''
+    photo: str = None       # fayl yo'li (render paytida — tayyor JPEG bayt ham bo'lishi mumkin)
+    photo_ready: bool = False
+    education: tuple = ()
+    work: tuple = ()
+    skills: tuple = ()
+    languages: tuple = ()
+    certificates: tuple = ()
+
+    @classmethod
+    def from_data(cls, data: dict) -> 'CVModel':
+        """user_data dan model; oldindan tahlil qilingan bo'limlar qayta ishlanmaydi"""
+        if isinstance(data, cls):
+            return data
+        sections = {}
+        for name, (key, parser) in SECTIONS.items():
+            parsed = data.get(name)
+            sections[name] = parsed if parsed is not None else parser(data.get(key, []))
+        return cls(
+            first_name=data.get('first_name', ''), last_name=data.get('last_name', ''),
+            dob=data.get('dob', ''), nationality=data.get('nationality', ''),
+            email=data.get('email', ''), phone=data.get('phone', ''),
+            address=data.get('address', ''), linkedin=data.get('linkedin', ''),
+            github=data.get('github', ''), website=data.get('website', ''),
+            objective=data.get('objective', ''), hobbies=data.get('hobbies', ''),
+            photo=data.get('photo'), photo_ready=bool(data.get('photo_ready')),
+            **sections,
+        )
@@ -0,0 +1,239 @@
+"""
+DOCX ning tez varianti — word/document.xml lxml daraxtisiz, to'g'ridan-to'g'ri
+matn sifatida zipfile ga yoziladi.
+
+Qolgan qismlar (styles, theme, settings, ...) python-docx skeletidan bir marta
+olinadi. Natija generate_docx bilan bayt-ma-bayt bir xil: paragraflar,
+run'lar va o'lcham birliklari python-docx yozganidek tartibda chiqadi.
+"""
+
+import re
+import zipfile
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from cv_generator import S_NAME, docx_skeleton
+from cv_model import CVModel
+
+DOCUMENT = 'word/document.xml'
+_EMPTY_P = '<w:p/></w:tc>'
+_ZIP_TIME = (1980, 1, 1, 0, 0, 0)     # _zip_fixed_times bilan bir xil
+
+# Ranglar (generate_docx dagi RGBColor lar)
+CBLU = '1B3A6B'
+CACC = '2761AB'
+CGLD = 'E9B949'
+CWHT = 'FFFFFF'
+CDRK = '1C1C1C'
+CGRY = '5A5A5A'
+CLBL = '9BB8D4'
+
+# XML 1.0 da ruxsat etilmagan belgilar (lxml bularda ValueError beradi)
+_BAD_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+_parts = None   # (statik qismlar [(nom, bayt)], document.xml boshi, o'rtasi, oxiri)
+
+
+def _package():
+    """Skeletni bir marta saqlab, document.xml ni uchta qismga ajratadi:
+    sidebar katagi oldi, ikki katak orasi va main katagidan keyingisi."""
+    global _parts
+    if _parts is None:
+        doc, _, _ = docx_skeleton()
+        buf = BytesIO()
+        doc.save(buf)
+        static = []
+        with zipfile.ZipFile(buf) as zf:
+            for name in zf.namelist():
+                static.append((name, zf.read(name)))
+        xml = dict(static)[DOCUMENT].decode('utf-8')
+        a = xml.index(_EMPTY_P)                 # sidebar: bo'sh <w:p/> qoladi
+        b = xml.index(_EMPTY_P, a + 1)          # main: birinchi paragraf ism bo'ladi
+        head = xml[:a + len('<w:p/>')]
+        mid  = xml[a + len('<w:p/>'):b]
+        tail = xml[b + len('<w:p/>'):]
+        _parts = (static, head, mid, tail)
+    return _parts
+
+
+# ─── Birliklar (python-docx Pt/Cm → XML qiymati) ─────────────────────────────
+
+def _twips_pt(pt):
+    return round(int(pt * 12700) / 635)
+
+def _twips_cm(cm):
+    return round(int(cm * 360000) / 635)
+
+def _half_pt(pt):
+    return int(int(pt * 12700) / 12700 * 2)
+
+
+# ─── Paragraf va run ──────────────────────────────────────────────────────────
+
+def _text(text):
+    if _BAD_XML.search(text):
+        raise ValueError("All strings must be XML compatible")
+    out, buf = [], []
+
+    def flush():
+        s = ''.join(buf)
+        if s:
+            if len(s.strip()) < len(s):
+                out.append(f'<w:t xml:space="preserve">{escape(s)}</w:t>')
+            else:
+                out.append(f'<w:t>{escape(s)}</w:t>')
+        buf.clear()
+
+    for ch in text:
+        if ch == '\t':
+            flush()
+            out.append('<w:tab/>')
+        elif ch in '\r\n':
+            flush()
+            out.append('<w:br/>')
+        else:
+            buf.append(ch)
+    flush()
+    return ''.join(out)
+
+
+def rn(text, size, bold=False, italic=False, color=CWHT):
+    return ('<w:r><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri"/>'
+            + ('<w:b/>' if bold else '<w:b w:val="0"/>')
+            + ('<w:i/>' if italic else '<w:i w:val="0"/>')
+            + f'<w:color w:val="{color}"/><w:sz w:val="{_half_pt(size)}"/></w:rPr>'
+            + (_text(text) if text else '') + '</w:r>')
+
+
+def para(runs='', sb=0, sa=1, indent=0.4, align='left', border=None):
+    """border — (qalinlik, rang): pastki chiziq"""
+    p = (f'<w:p><w:pPr><w:spacing w:before="{_twips_pt(sb)}" w:after="{_twips_pt(sa)}"/>'
+         f'<w:ind w:left="{_twips_cm(indent)}"/>')
+    if align:
+        p += f'<w:jc w:val="{align}"/>'
+    if border:
+        p += (f'<w:pBdr><w:bottom w:val="single" w:sz="{border[0]}" '
+              f'w:space="1" w:color="{border[1]}"/></w:pBdr>')
+    return p + '</w:pPr>' + runs + '</w:p>'
+
+
+# ─── Hujjat ───────────────────────────────────────────────────────────────────
+
+def _sidebar(cv, out):
+    def sp(text='', size=9, bold=False, italic=False, color=CWHT,
+           sb=0, sa=1, indent=0.4, align='left', border=None):
+        out.append(para(rn(text, size, bold, italic, color) if text else '',
+                        sb, sa, indent, align, border))
+
+    def sb_section(title):
+        sp(title.upper(), size=8, bold=True, color=CGLD, sb=8, sa=1, border=(4, CGLD))
+
+    def sb_item(lbl, v):
+        if v:
+            sp(lbl.upper(), size=6.5, bold=True, color=CLBL, sb=3, sa=0)
+            sp(v, size=9, color=CWHT, sa=2)
+
+    initials = (cv.first_name[:1] + cv.last_name[:1]).upper()
+    sp(initials, size=32, bold=True, color=CGLD, sb=18, sa=6, align='center', indent=0)
+
+    sb_section('Contact')
+    for lbl, key in [('Email','email'),('Phone','phone'),('Address','address'),
+                     ('LinkedIn','linkedin'),('GitHub','github'),('Website','website')]:
+        sb_item(lbl, getattr(cv, key))
+
+    sb_section('Personal')
+    for lbl, key in [('Date of Birth','dob'),('Nationality','nationality')]:
+        sb_item(lbl, getattr(cv, key))
+
+    if cv.languages:
+        sb_section('Languages')
+        for lg in cv.languages:
+            sp(lg.lang, size=9, bold=True, color=CWHT, sb=3, sa=0)
+            bar = '●'*lg.dots + '○'*(5-lg.dots)
+            sp(f"{lg.level}  {bar}", size=8, italic=True, color=CGLD, sa=2)
+
+    if cv.skills:
+        sb_section('Skills')
+        for sk in cv.skills:
+            sp(sk.cat.upper(), size=7.5, bold=True, color=CGLD, sb=3, sa=0)
+            sp(sk.sk, size=9, color=CWHT, sa=2)
+
+
+def _main(cv, out):
+    def mp(runs='', sb=0, sa=2, indent=0.5, border=None):
+        out.append(para(runs, sb, sa, indent, 'left', border))
+
+    def mn_section(title):
+        mp(rn(title.upper(), 11, bold=True, color=CACC), sb=10, sa=2, border=(6, CACC))
+
+    def heading(title, years, sub, sa):
+        runs = rn(title, 10, bold=True, color=CDRK)
+        if years:
+            runs += rn(f"  {years}", 8.5, italic=True, color=CGRY)
+        mp(runs, sb=4, sa=1)
+        if sub:
+            mp(rn(sub, 9, italic=True, color=CGRY), sa=sa)
+        else:
+            mp(sa=sa)
+
+    # ISM — python-docx da katakning birinchi paragrafi (jc siz)
+    out.append(f'<w:p><w:pPr><w:spacing w:before="{_twips_pt(14)}" w:after="{_twips_pt(4)}"/>'
+               f'<w:ind w:left="{_twips_cm(0.5)}"/></w:pPr>'
+               + rn(cv.first_name.upper()+' ', S_NAME, bold=True, color=CBLU)
+               + rn(cv.last_name.upper(), S_NAME, bold=True, color=CACC) + '</w:p>')
+
+    if cv.objective:
+        mp(rn(cv.objective, 9.5, italic=True, color=CGRY), sa=6)
+
+    if cv.education:
+        mn_section('Education')
+        for e in cv.education:
+            heading(e.degree, e.years, e.institution, 4)
+
+    if cv.work:
+        mn_section('Work Experience')
+        for w in cv.work:
+            heading(w.position, w.years, w.company, 2)
+            for desc in w.bullets:
+                mp(rn(f'• {desc}', 9.5, color=CDRK), sa=1, indent=0.8)
+
+    if cv.certificates:
+        mn_section('Certificates')
+        for cert in cv.certificates:
+            t = cert.name
+            if cert.org:  t += f' — {cert.org}'
+            if cert.year: t += f'  ({cert.year})'
+            mp(rn(f'• {t}', 9.5, color=CDRK), sb=2, sa=1, indent=0.8)
+
+    if cv.hobbies:
+        mn_section('Interests')
+        mp(rn(cv.hobbies, 9.5, color=CDRK), sa=2)
+
+
+def generate_docx_stream(data, output_path):
+    """generate_docx bilan bir xil hujjat; output_path — fayl yo'li yoki buffer"""
+    cv = CVModel.from_data(data)
+    static, head, mid, tail = _package()
+    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, blob in static:
+            info = zipfile.ZipInfo(name, _ZIP_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o600 << 16
+            if name != DOCUMENT:
+                zf.writestr(info, blob)
+                continue
+            with zf.open(info, 'w') as f:
+                out = [head]
+                _sidebar(cv, out)
+                out.append(mid)
+                f.write(''.join(out).encode('utf-8'))
+                out = []
+                _main(cv, out)
+                out.append(tail)
+                f.write(''.join(out).encode('utf-8'))
+
+
+def render_docx_stream_bytes(data) -> bytes:
+    buf = BytesIO()
+    generate_docx_stream(data, buf)
+    return buf.getvalue()
@@ -0,0 +1,171 @@
+"""
+Render va yetkazish metrikalari — Prometheus text formatida.
+
+Histogram'lar Prometheus bucket'lari bilan birga oxirgi SAMPLE_WINDOW ta
+qiymatni ham saqlaydi: /stats buyrug'i p50/p95/p99 ni shulardan hisoblaydi.
+Hammasi bitta event loop ichida yangilanadi — lock kerak emas.
+
+Sozlamalar (env):
+  METRICS_HOST  — /metrics tinglanadigan interfeys (standart: faqat lokal)
+  METRICS_PORT  — port (0 = o'chirilgan)
+"""
+
+import math
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9091"))
+
+SAMPLE_WINDOW = 1024
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _fmt_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+
+class Counter:
+
+    def __init__(self, name, help):
+        self.name   = name
+        self.help   = help
+        self.values = {}    # labels → son
+
+    def inc(self, n=1, **labels):
+        key = _labels(labels)
+        self.values[key] = self.values.get(key, 0) + n
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for key, v in sorted(self.values.items()):
+            yield f"{self.name}{_fmt_labels(key)} {v}"
+
+
+class Histogram:
+
+    def __init__(self, name, help, buckets=BUCKETS):
+        self.name    = name
+        self.help    = help
+        self.buckets = buckets
+        self.series  = {}   # labels → [bucket sonlari, yig'indi, soni, oxirgi qiymatlar]
+
+    def observe(self, value, **labels):
+        key = _labels(labels)
+        s = self.series.get(key)
+        if s is None:
+            s = self.series[key] = [[0] * len(self.buckets), 0.0, 0, deque(maxlen=SAMPLE_WINDOW)]
+        i = bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            s[0][i] += 1
+        s[1] += value
+        s[2] += 1
+        s[3].append(value)
+
+    @contextmanager
+    def time(self, **labels):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t, **labels)
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)):
+        """labels → (soni, [kvantillar]) — oxirgi SAMPLE_WINDOW qiymat bo'yicha"""
+        out = {}
+        for key, (_, _, count, recent) in self.series.items():
+            xs = sorted(recent)
+            out[key] = (count, [xs[max(0, math.ceil(q * len(xs)) - 1)] for q in qs])
+        return out
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for key, (counts, total, count, _) in sorted(self.series.items()):
+            acc = 0
+            for le, c in zip(self.buckets, counts):
+                acc += c
+                yield f"{self.name}_bucket{_fmt_labels(key, [('le', le)])} {acc}"
+            yield f"{self.name}_bucket{_fmt_labels(key, [('le', '+Inf')])} {count}"
+            yield f"{self.name}_sum{_fmt_labels(key)} {total}"
+            yield f"{self.name}_count{_fmt_labels(key)} {count}"
+
+
+class Gauge:
+    """Qiymati so'ralganda fn() dan olinadi"""
+
+    def __init__(self, name, help, fn):
+        self.name = name
+        self.help = help
+        self.fn   = fn
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        yield f"{self.name} {self.fn()}"
+
+
+# ─── Bot metrikalari ──────────────────────────────────────────────────────────
+
+PARSE    = Histogram('cv_parse_seconds', "CV ma'lumotlarini tahlil qilish")
+RENDER   = Histogram('cv_render_seconds', "Render (pool navbati bilan), format bo'yicha")
+UPLOAD   = Histogram('cv_upload_seconds', "send_document, format bo'yicha")
+CONFIRM  = Histogram('cv_confirm_seconds', "Tasdiqlashdan oxirgi fayl yetkazilguncha")
+ERRORS   = Counter('cv_errors_total', "Xatolar, bosqich bo'yicha")
+FORMATS  = Counter('cv_format_total', "Tanlangan formatlar")
+CACHE    = Counter('cv_render_cache_total', "Render keshi: hit/miss")
+SHED     = Counter('cv_shed_total', "Qabul qilinmagan ishlar, sabab bo'yicha")
+FILE_ID  = Counter('cv_file_id_total', "Telegram file_id keshi: hit/miss/stale")
+SESSIONS = Counter('cv_sessions_ended_total', "Yakunlangan sessiyalar, sabab bo'yicha")
+
+REGISTRY = [PARSE, RENDER, UPLOAD, CONFIRM, ERRORS, FORMATS, CACHE, SHED, FILE_ID, SESSIONS]
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render_text() -> bytes:
+    lines = []
+    for m in REGISTRY:
+        lines.extend(m.expose())
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def metrics_handler():
+    """webhook.serve_http uchun GET /metrics"""
+
+    async def handle(method, headers, body):
+        if method != 'GET':
+            return 405, 'text/plain; charset=utf-8', b''
+        return 200, 'text/plain; version=0.0.4; charset=utf-8', render_text()
+
+    return handle
+
+
+def summary() -> str:
+    """/stats uchun matn: har histogram bo'yicha p50/p95/p99 (ms)"""
+    out = []
+    for h in (PARSE, RENDER, UPLOAD, CONFIRM):
+        for key, (count, (p50, p95, p99)) in sorted(h.quantiles().items()):
+            label = ','.join(v for _, v in key)
+            name = h.name.replace('_seconds', '') + (f'[{label}]' if label else '')
+            out.append(f"{name}: n={count} p50={p50*1000:.1f} p95={p95*1000:.1f} "
+                       f"p99={p99*1000:.1f} ms")
+    for c in (ERRORS, FORMATS, CACHE, SHED, FILE_ID, SESSIONS):
+        if c.values:
+            out.append(c.name + ': ' + ', '.join(
+                f"{','.join(v for _, v in key) or '-'}={n}" for key, n in sorted(c.values.items())))
+    return '\n'.join(out)
@@ -0,0 +1,439 @@
+"""
+Shablon (templates.py) → render rejasi.
+
+compile_plan(name) shablonni bir marta tahlil qiladi: ranglar HexColor ga,
+uslublar Style ga, koordinatalar tayyor pt qiymatlariga aylanadi va har
+bo'lim uchun chizuvchi funksiya yig'iladi. Natija jarayonda keshlanadi —
+har hujjatda faqat Plan.draw(c, cv) ishlaydi, shablon lug'atlari qayta
+o'qilmaydi.
+
+Bo'lim funksiyasi: op(c, cv, y) → y (ustundagi joriy balandlik).
+Yangi bo'lim turi: SIDEBAR yoki MAIN ga kompilyator qo'shing.
+"""
+
+import os
+from collections import namedtuple
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib import colors
+
+from templates import DEFAULT_TEMPLATE, TEMPLATES
+from textlayout import truncate, wrap
+
+Style = namedtuple('Style', 'font size color')
+
+
+class Plan:
+    """Kompilyatsiya qilingan shablon: sahifa o'lchami va ikki ustun bo'limlari"""
+
+    __slots__ = ('name', 'pagesize', 'background', 'sidebar', 'main')
+
+    def __init__(self, name, pagesize, background, sidebar, main):
+        self.name       = name
+        self.pagesize   = pagesize
+        self.background = background    # (rang, kenglik) — sidebar foni
+        self.sidebar    = sidebar       # [op, ...]
+        self.main       = main
+
+    def draw(self, c, cv):
+        """Bitta CV ni canvas ning joriy sahifasiga chizadi"""
+        page_h = self.pagesize[1]
+        color, width = self.background
+        c.setFillColor(color)
+        c.rect(0, 0, width, page_h, fill=1, stroke=0)
+        y = page_h
+        for op in self.sidebar:
+            y = op(c, cv, y)
+        y = page_h
+        for op in self.main:
+            y = op(c, cv, y)
+
+
+@lru_cache(maxsize=None)
+def compile_plan(name: str = DEFAULT_TEMPLATE) -> Plan:
+    try:
+        tpl = TEMPLATES[name]
+    except KeyError:
+        raise ValueError(f"unknown template {name!r} (available: {', '.join(TEMPLATES)})") from None
+    return _Compiler(tpl).plan()
+
+
+# ─── Kompilyator ──────────────────────────────────────────────────────────────
+
+class _Compiler:
+
+    def __init__(self, tpl):
+        self.tpl    = tpl
+        self.fonts  = tpl['fonts']
+        self.colors = {k: colors.HexColor(v) for k, v in tpl['colors'].items()}
+        self.page_w, self.page_h = tpl['page']
+
+    def color(self, ref):
+        return self.colors[ref] if ref in self.colors else colors.HexColor(ref)
+
+    def style(self, spec):
+        font, size, color = spec
+        return Style(self.fonts.get(font, font), size, self.color(color))
+
+    def plan(self):
+        sb, mn = self.tpl['sidebar'], self.tpl['main']
+        sb_ops = [SIDEBAR[s['type']](self, sb, s) for s in sb['sections']]
+        mn_ops = [MAIN[s['type']](self, sb, mn, s) for s in mn['sections']]
+        return Plan(self.tpl['name'], tuple(self.tpl['page']),
+                    (self.color(sb['background']), sb['width']), sb_ops, mn_ops)
+
+    # ── umumiy bo'laklar ──────────────────────────────────────────────────
+
+    def sb_section(self, sb, title):
+        """Sidebar bo'lim sarlavhasi + chiziq"""
+        spec = sb['section']
+        pad, right = sb['pad'], sb['width'] - sb['pad']
+        gap, rule_gap, after = spec['gap'], spec['rule_gap'], spec['after']
+        st = self.style(spec['title'])
+        rule_color, rule_w = self.color(spec['rule'][0]), spec['rule'][1]
+        title = title.upper()
+
+        def head(c, y):
+            y -= gap
+            c.setFillColor(st.color)
+            c.setFont(st.font, st.size)
+            c.drawString(pad, y, title)
+            y -= rule_gap
+            c.setStrokeColor(rule_color)
+            c.setLineWidth(rule_w)
+            c.line(pad, y, right, y)
+            return y - after
+        return head
+
+    def mn_section(self, sb, mn, title):
+        """Asosiy ustun bo'lim sarlavhasi: marker, nom, chiziq"""
+        spec = mn['section']
+        x = sb['width'] + mn['pad']
+        right = self.page_w - mn['pad']
+        gap, rule_gap, after = spec['gap'], spec['rule_gap'], spec['after']
+        m_color, m_w, m_len, m_dy = spec['marker']
+        m_color, m_x2 = self.color(m_color), x + m_len
+        st = self.style(spec['title'])
+        title_x = x + spec['title_x']
+        rule_color, rule_w = self.color(spec['rule'][0]), spec['rule'][1]
+        title = title.upper()
+
+        def head(c, y):
+            y -= gap
+            c.setStrokeColor(m_color)
+            c.setLineWidth(m_w)
+            c.line(x, y + m_dy, m_x2, y + m_dy)
+            c.setFillColor(st.color)
+            c.setFont(st.font, st.size)
+            c.drawString(title_x, y, title)
+            y -= rule_gap
+            c.setStrokeColor(rule_color)
+            c.setLineWidth(rule_w)
+            c.line(x, y, right, y)
+            return y - after
+        return head
+
+
+def _text(c, lines, x, y, lh):
+    for line in lines:
+        c.drawString(x, y, line)
+        y -= lh
+    return y
+
+
+# ─── Sidebar bo'limlari ───────────────────────────────────────────────────────
+
+def _photo(cc, sb, spec):
+    sz = spec['size']
+    px = (sb['width'] - sz) / 2
+    py = cc.page_h - sz - spec['top']
+    cxp, cyp, r = px + sz/2, py + sz/2, sz/2
+    fill = cc.color(spec['fill'])
+    ring_color, ring_w = cc.color(spec['ring'][0]), spec['ring'][1]
+    ist = cc.style(spec['initials'])
+    iy = cyp - spec['initials_drop']
+    end = py - spec['after']
+
+    def initials(c, cv):
+        c.setFillColor(fill)
+        c.circle(cxp, cyp, r, fill=1, stroke=0)
+        text = (cv.first_name[:1] + cv.last_name[:1]).upper()
+        c.setFillColor(ist.color)
+        c.setFont(ist.font, ist.size)
+        tw = c.stringWidth(text, ist.font, ist.size)
+        c.drawString(cxp - tw/2, iy, text)
+
+    def op(c, cv, y):
+        photo = cv.photo
+        if isinstance(photo, bytes) or (photo and os.path.exists(photo)):
+            try:
+                if isinstance(photo, bytes):
+                    # cv_generator PDF profili uchun tayyorlagan JPEG
+                    from reportlab.lib.utils import ImageReader
+                    img = ImageReader(BytesIO(photo))
+                elif cv.photo_ready:
+                    # photo.prepare_avatar tayyorlagan JPEG — PIL siz joylanadi
+                    img = photo
+                else:
+                    from reportlab.lib.utils import ImageReader
+                    from photo import prepare_avatar
+                    with open(photo, 'rb') as f:
+                        img = ImageReader(BytesIO(prepare_avatar(f.read())))
+                c.saveState()
+                path = c.beginPath()
+                path.circle(cxp, cyp, r)
+                c.clipPath(path, stroke=0, fill=0)
+                c.drawImage(img, px, py, width=sz, height=sz,
+                            preserveAspectRatio=True, mask='auto')
+                c.restoreState()
+            except Exception:
+                initials(c, cv)
+        else:
+            initials(c, cv)
+        # Aylana chegara
+        c.setStrokeColor(ring_color)
+        c.setLineWidth(ring_w)
+        c.circle(cxp, cyp, r, fill=0, stroke=1)
+        return end
+    return op
+
+
+def _fields(cc, sb, spec):
+    head = cc.sb_section(sb, spec['title'])
+    pad, max_w = sb['pad'], sb['width'] - sb['pad']*2
+    lst, vst = cc.style(sb['label']), cc.style(sb['value'])
+    label_after, lh, value_after = sb['label_after'], sb['value_lh'], sb['value_after']
+    fields = [(label.upper(), key) for label, key in spec['fields']]
+
+    def op(c, cv, y):
+        y = head(c, y)
+        for label, key in fields:
+            v = getattr(cv, key)
+            if v:
+                c.setFillColor(lst.color)
+                c.setFont(lst.font, lst.size)
+                c.drawString(pad, y, label)
+                y -= label_after
+                c.setFillColor(vst.color)
+                c.setFont(vst.font, vst.size)
+                y = _text(c, wrap(str(v), vst.font, vst.size, max_w), pad, y, lh)
+                y -= value_after
+        return y
+    return op
+
+
+def _languages(cc, sb, spec):
+    head = cc.sb_section(sb, spec['title'])
+    pad, max_w = sb['pad'], sb['width'] - sb['pad']*2
+    nst, lst = cc.style(spec['name']), cc.style(spec['level'])
+    name_after, after = spec['name_after'], spec['after']
+    dots = spec['dots']
+    x0 = pad + dots['x']
+    xs = [x0 + i*dots['gap'] for i in range(dots['total'])]
+    dy, r = dots['dy'], dots['r']
+    on, off = cc.color(dots['on']), cc.color(dots['off'])
+
+    def op(c, cv, y):
+        if not cv.languages:
+            return y
+        y = head(c, y)
+        for lg in cv.languages:
+            c.setFillColor(nst.color)
+            c.setFont(nst.font, nst.size)
+            c.drawString(pad, y, truncate(str(lg.lang), nst.font, nst.size, max_w))
+            y -= name_after
+            c.setFillColor(lst.color)
+            c.setFont(lst.font, lst.size)
+            c.drawString(pad, y, lg.level)
+            dot_y = y + dy
+            for i, x in enumerate(xs):
+                c.setFillColor(on if i < lg.dots else off)
+                c.circle(x, dot_y, r, fill=1, stroke=0)
+            y -= after
+        return y
+    return op
+
+
+def _skills(cc, sb, spec):
+    head = cc.sb_section(sb, spec['title'])
+    pad, max_w = sb['pad'], sb['width'] - sb['pad']*2
+    cst, vst = cc.style(spec['category']), cc.style(sb['value'])
+    cat_after, lh, after = spec['category_after'], sb['value_lh'], spec['after']
+
+    def op(c, cv, y):
+        if not cv.skills:
+            return y
+        y = head(c, y)
+        for sk in cv.skills:
+            c.setFillColor(cst.color)
+            c.setFont(cst.font, cst.size)
+            c.drawString(pad, y, sk.cat.upper())
+            y -= cat_after
+            c.setFillColor(vst.color)
+            c.setFont(vst.font, vst.size)
+            y = _text(c, wrap(str(sk.sk), vst.font, vst.size, max_w), pad, y, lh)
+            y -= after
+        return y
+    return op
+
+
+SIDEBAR = {
+    'photo':     _photo,
+    'fields':    _fields,
+    'languages': _languages,
+    'skills':    _skills,
+}
+
+
+# ─── Asosiy ustun bo'limlari ──────────────────────────────────────────────────
+
+def _bar(cc, sb, mn, spec):
+    color, x = cc.color(spec['color']), sb['width']
+    y0, w, h = cc.page_h - spec['height'], spec['width'], spec['height']
+
+    def op(c, cv, y):
+        c.setFillColor(color)
+        c.rect(x, y0, w, h, fill=1, stroke=0)
+        return y
+    return op
+
+
+def _name(cc, sb, mn, spec):
+    x = sb['width'] + mn['pad']
+    font, size = cc.fonts.get(spec['font'], spec['font']), spec['size']
+    first, last = cc.color(spec['first']), cc.color(spec['last'])
+    top, after = spec['top'], spec['after']
+
+    def op(c, cv, y):
+        y = cc.page_h - top
+        c.setFillColor(first)
+        c.setFont(font, size)
+        name = cv.first_name.upper()
+        c.drawString(x, y, name)
+        nw = c.stringWidth(name + ' ', font, size)
+        c.setFillColor(last)
+        c.drawString(x + nw, y, cv.last_name.upper())
+        return y - after
+    return op
+
+
+def _objective(cc, sb, mn, spec):
+    x = sb['width'] + mn['pad']
+    max_w = (cc.page_w - sb['width']) - mn['pad']*2
+    st, lh, after = cc.style(spec['style']), mn['body_lh'], spec['after']
+
+    def op(c, cv, y):
+        if cv.objective:
+            c.setFillColor(st.color)
+            c.setFont(st.font, st.size)
+            y = _text(c, wrap(str(cv.objective), st.font, st.size, max_w), x, y, lh)
+        return y - after
+    return op
+
+
+# manba → (sarlavha, pastki sarlavha, yillar, bandlar)
+_ENTRY_FIELDS = {
+    'education': lambda e: (e.degree, e.institution,
+                            e.years + (f'  GPA: {e.gpa}' if e.gpa else ''), ()),
+    'work':      lambda w: (w.position, w.company, w.years, w.bullets),
+}
+
+
+def _entries(cc, sb, mn, spec):
+    head = cc.mn_section(sb, mn, spec['title'])
+    source, fields = spec['source'], _ENTRY_FIELDS[spec['source']]
+    e = mn['entry']
+    x = sb['width'] + mn['pad']
+    right = cc.page_w - mn['pad']
+    max_w = (cc.page_w - sb['width']) - mn['pad']*2
+    tst, dst = cc.style(e['title']), cc.style(e['date'])
+    sst, bst, body = cc.style(e['subtitle']), cc.style(e['bullet']), cc.style(mn['body'])
+    title_after, sub_after, after = e['title_after'], e['subtitle_after'], e['after']
+    bx, bmax, lh = x + e['bullet_indent'], max_w - e['bullet_indent'], mn['body_lh']
+
+    def op(c, cv, y):
+        items = getattr(cv, source)
+        if not items:
+            return y
+        y = head(c, y)
+        for item in items:
+            title, subtitle, years, bullets = fields(item)
+            # Sarlavha + yil
+            c.setFillColor(tst.color)
+            c.setFont(tst.font, tst.size)
+            c.drawString(x, y, title)
+            c.setFillColor(dst.color)
+            c.setFont(dst.font, dst.size)
+            rw = c.stringWidth(years, dst.font, dst.size)
+            c.drawString(right - rw, y, years)
+            y -= title_after
+            # Kompaniya / muassasa
+            if subtitle:
+                c.setFillColor(sst.color)
+                c.setFont(sst.font, sst.size)
+                c.drawString(x, y, subtitle)
+                y -= sub_after
+            for line in bullets:
+                c.setFillColor(bst.color)
+                c.setFont(bst.font, bst.size)
+                c.drawString(x, y, '•')
+                c.setFillColor(body.color)
+                c.setFont(body.font, body.size)
+                y = _text(c, wrap(str(line), body.font, body.size, bmax), bx, y, lh)
+            y -= after
+        return y
+    return op
+
+
+def _certificates(cc, sb, mn, spec):
+    head = cc.mn_section(sb, mn, spec['title'])
+    x = sb['width'] + mn['pad']
+    right = cc.page_w - mn['pad']
+    nst, dst = cc.style(spec['name']), cc.style(mn['entry']['date'])
+    after = spec['after']
+
+    def op(c, cv, y):
+        if not cv.certificates:
+            return y
+        y = head(c, y)
+        for cert in cv.certificates:
+            c.setFillColor(nst.color)
+            c.setFont(nst.font, nst.size)
+            c.drawString(x, y, cert.name + (f'  —  {cert.org}' if cert.org else ''))
+            if cert.year:
+                c.setFillColor(dst.color)
+                c.setFont(dst.font, dst.size)
+                rw = c.stringWidth(cert.year, dst.font, dst.size)
+                c.drawString(right - rw, y, cert.year)
+            y -= after
+        return y
+    return op
+
+
+def _paragraph(cc, sb, mn, spec):
+    head = cc.mn_section(sb, mn, spec['title'])
+    field = spec['field']
+    x = sb['width'] + mn['pad']
+    max_w = (cc.page_w - sb['width']) - mn['pad']*2
+    st, lh = cc.style(mn['body']), mn['body_lh']
+
+    def op(c, cv, y):
+        text = getattr(cv, field)
+        if not text:
+            return y
+        y = head(c, y)
+        c.setFillColor(st.color)
+        c.setFont(st.font, st.size)
+        return _text(c, wrap(str(text), st.font, st.size, max_w), x, y, lh)
+    return op
+
+
+MAIN = {
+    'bar':          _bar,
+    'name':         _name,
+    'objective':    _objective,
+    'entries':      _entries,
+    'certificates': _certificates,
+    'text':         _paragraph,
+}
@@ -0,0 +1,47 @@
+"""
+PDF chiqish profillari — hajm va sifat orasidagi tanlov.
+
+  compact  — mobil internet uchun: kichik rasm; hujjat PDF_COMPACT_MAX_KB
+             dan oshsa rasm JPEG sifati bosqichma-bosqich pasaytiriladi,
+             yetmasa rasm o'rniga bosh harflar chiziladi
+  standard — odatiy natija (320 px, JPEG 92), avvalgi bilan bayt-bayt bir xil
+  print    — bosma uchun: 600 px rasm (48 mm ≈ 300 dpi), JPEG 95
+
+Maydonlar:
+  compress     — sahifa oqimlarini siqish (ReportLab pageCompression)
+  ascii85      — ikkilik oqimlarni (sahifa, rasm) ASCII85 matnga o'girish;
+                 ReportLab odatiy sozlamasi, oqimlar ~25% kattalashadi
+  image_px     — rasm tomoni, piksel (kichik rasm kattalashtirilmaydi)
+  quality      — JPEG sifati
+  max_bytes    — hujjat hajmi chegarasi (faqat compact)
+  min_quality, quality_step — chegaraga sig'dirishda sifat pasayishi
+
+Bot rasmni yuklash paytida joriy profil o'lchamida tayyorlaydi (photo.py),
+shuning uchun render paytida rasm qayta kodlanmaydi. Bu modul ReportLab
+yuklamaydi — bot ham import qiladi.
+
+Sozlamalar (env):
+  PDF_PROFILE         — compact | standard | print
+  PDF_COMPACT_MAX_KB  — compact hujjat hajmi chegarasi, KB
+"""
+
+import os
+
+PDF_PROFILE        = os.getenv("PDF_PROFILE", "standard")
+PDF_COMPACT_MAX_KB = int(os.getenv("PDF_COMPACT_MAX_KB", "32"))
+
+PDF_PROFILES = {
+    'compact': {
+        'compress': 1, 'ascii85': 0, 'image_px': 200, 'quality': 75,
+        'max_bytes': PDF_COMPACT_MAX_KB * 1024, 'min_quality': 25, 'quality_step': 10,
+    },
+    'standard': {'compress': 1, 'ascii85': 1, 'image_px': 320, 'quality': 92},
+    'print':    {'compress': 1, 'ascii85': 0, 'image_px': 600, 'quality': 95},
+}
+
+
+def pdf_profile(name: str = PDF_PROFILE) -> dict:
+    try:
+        return PDF_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"unknown PDF profile {name!r} (available: {', '.join(PDF_PROFILES)})") from None
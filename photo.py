@@ -0,0 +1,69 @@
+"""
+Profil rasmini yuklash paytida bir marta tayyorlash.
+
+Telegram bergan o'lchamlardan keraklisi tanlanadi, xotiraga yuklanadi,
+JPEG draft rejimida kichraytirib o'qiladi, markazdan kvadrat kesiladi va
+AVATAR_PX x AVATAR_PX JPEG sifatida saqlanadi. generate_pdf bu faylni
+PIL siz, to'g'ridan-to'g'ri PDF ga joylaydi. O'lcham va sifat — joriy PDF
+profilidan (pdf_profiles.PDF_PROFILE); boshqa profil uchun render paytida
+shu fayldan qayta tayyorlanadi.
+"""
+
+import os
+from io import BytesIO
+
+from pdf_profiles import pdf_profile
+
+AVATAR_PX      = pdf_profile()['image_px']
+AVATAR_QUALITY = pdf_profile()['quality']
+
+PHOTO_MAX_BYTES  = int(float(os.getenv("PHOTO_MAX_MB", "10")) * 1024 * 1024)
+PHOTO_MAX_PIXELS = int(os.getenv("PHOTO_MAX_PIXELS", str(40_000_000)))
+
+
+class PhotoError(ValueError):
+    """Rasm juda katta yoki o'qib bo'lmaydi"""
+
+
+def pick_size(sizes, target: int = AVATAR_PX):
+    """target dan kichik bo'lmagan eng kichik PhotoSize (bo'lmasa eng kattasi)"""
+    fits = [s for s in sizes if min(s.width, s.height) >= target]
+    if fits:
+        return min(fits, key=lambda s: s.width * s.height)
+    return max(sizes, key=lambda s: s.width * s.height)
+
+
+def prepare_avatar(raw: bytes, px: int = AVATAR_PX, quality: int = AVATAR_QUALITY,
+                   upscale: bool = True) -> bytes:
+    """Istalgan rasmdan PDF ga tayyor kvadrat JPEG yasaydi.
+    upscale=False — rasm px dan kichik bo'lsa kattalashtirilmaydi"""
+    from PIL import Image
+
+    if len(raw) > PHOTO_MAX_BYTES:
+        raise PhotoError(f"photo too large: {len(raw)} bytes")
+    # Sarlavhadagi o'lcham chegaradan katta bo'lsa PIL Image.open da to'xtaydi
+    # (DecompressionBombError) — piksellar dekodlanmaydi
+    Image.MAX_IMAGE_PIXELS = PHOTO_MAX_PIXELS
+    try:
+        img = Image.open(BytesIO(raw))
+        w, h = img.size
+        if w * h > PHOTO_MAX_PIXELS:
+            raise PhotoError(f"photo too large: {w}x{h}")
+
+        # JPEG bo'lsa DCT darajasida kichraytirib dekodlaydi (to'liq o'lcham kerak emas)
+        img.draft('RGB', (px, px))
+        img = img.convert('RGB')
+        w, h = img.size
+        m = min(w, h)
+        img = img.crop(((w-m)//2, (h-m)//2, (w+m)//2, (h+m)//2))
+        if not upscale:
+            px = min(px, m)
+        img = img.resize((px, px))
+        buf = BytesIO()
+        img.save(buf, 'JPEG', quality=quality)
+    except PhotoError:
+        raise
+    except (OSError, Image.DecompressionBombError, ValueError) as e:
+        # UnidentifiedImageError va kesilgan fayl — OSError
+        raise PhotoError(str(e) or type(e).__name__) from e
+    return buf.getvalue()
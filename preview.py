@@ -0,0 +1,199 @@
+"""
+CV ning PNG eskizi — tasdiqlashdan oldin ko'rsatish uchun.
+
+draw_pdf ni o'zgartirmasdan, u ishlatadigan canvas metodlarini PIL rasmga
+chizadigan PreviewCanvas. Joylashuv (qator bo'linishi, qisqartirish)
+textlayout keshidan — PDF bilan bir xil. Shrift sifatida ReportLab bilan
+birga keladigan Vera ishlatiladi: Helvetica metrikasi PIL da yo'q,
+eskiz uchun farq sezilmaydi. Rasm (foto) chizilmaydi — bosh harflar.
+
+Tezlik uchun (jarayon ichida keshlanadi):
+  - har belgi (shrift, o'lcham) bo'yicha bir marta rasterlanadi, so'zlar
+    shu belgilardan bir marta yig'iladi — keyin so'z bitta amal bilan
+    joylanadi, FreeType qatorlarni qayta chizmaydi
+  - PNG palitrasi birinchi eskizdan olinadi; keyingilar shu palitraga
+    ditheringsiz keltiriladi (kvantlash o'n barobar tezroq)
+"""
+
+import os
+from functools import lru_cache
+from io import BytesIO
+
+import reportlab
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import A4
+
+from textlayout import text_width
+
+PREVIEW_WIDTH = int(os.getenv("PREVIEW_WIDTH", "600"))   # piksel
+
+_FONT_DIR = os.path.join(os.path.dirname(reportlab.__file__), 'fonts')
+_FONT_FILES = {
+    'Helvetica':         'Vera.ttf',
+    'Helvetica-Bold':    'VeraBd.ttf',
+    'Helvetica-Oblique': 'VeraIt.ttf',
+}
+# Vera Helvetica'dan kengroq — qatorlar PDF dagidek sig'ishi uchun
+_FONT_SCALE = 0.9
+
+
+_palette = None     # birinchi eskizdan olingan 'P' rasm
+
+
+_WORD_CACHE = 20000   # har shrift uchun
+
+
+def _font_path(name):
+    return os.path.join(_FONT_DIR, _FONT_FILES.get(name, 'Vera.ttf'))
+
+
+@lru_cache(maxsize=8)
+def _units(name):
+    # Kichik o'lchamda getlength hinting bilan butun songa yaxlitlanadi —
+    # kengliklar 1000 px dagi shriftdan olinadi
+    return ImageFont.truetype(_font_path(name), 1000)
+
+
+class _Font:
+    """Belgi va so'z keshi: matn → (niqob yoki None, (dx, dy), kenglik)"""
+
+    def __init__(self, name, px):
+        self.font   = ImageFont.truetype(_font_path(name), px)
+        self.units  = _units(name)
+        self.px     = px
+        self.glyphs = {}
+        self.words  = {}
+
+    def glyph(self, ch):
+        g = self.glyphs.get(ch)
+        if g is None:
+            x0, y0, x1, y1 = self.font.getbbox(ch, anchor='ls')
+            mask = None
+            if x1 > x0 and y1 > y0:
+                mask = Image.new('L', (x1 - x0, y1 - y0))
+                ImageDraw.Draw(mask).text((-x0, -y0), ch, font=self.font, fill=255, anchor='ls')
+            g = self.glyphs[ch] = (mask, (x0, y0), self.units.getlength(ch) * self.px / 1000)
+        return g
+
+    def word(self, text):
+        w = self.words.get(text)
+        if w is None:
+            glyphs, x, boxes = [], 0.0, []
+            for ch in text:
+                g = self.glyph(ch)
+                if g[0] is not None:
+                    left, top = round(x) + g[1][0], g[1][1]
+                    glyphs.append((g[0], left, top))
+                    boxes.append((left, top, left + g[0].width, top + g[0].height))
+                x += g[2]
+            mask, offset = None, (0, 0)
+            if boxes:
+                x0, y0 = min(b[0] for b in boxes), min(b[1] for b in boxes)
+                x1, y1 = max(b[2] for b in boxes), max(b[3] for b in boxes)
+                mask, offset = Image.new('L', (x1 - x0, y1 - y0)), (x0, y0)
+                for g, left, top in glyphs:
+                    mask.paste(255, (left - x0, top - y0, left - x0 + g.width, top - y0 + g.height), g)
+            if len(self.words) >= _WORD_CACHE:
+                self.words.clear()
+            w = self.words[text] = (mask, offset, x)
+        return w
+
+
+@lru_cache(maxsize=64)
+def _font(name, px):
+    return _Font(name, px)
+
+
+def _rgb(color):
+    return tuple(round(v * 255) for v in color.rgb())
+
+
+class PreviewCanvas:
+    """reportlab Canvas ning draw_pdf uchun kerakli qismi, koordinatalar pt da"""
+
+    def __init__(self, width: int = PREVIEW_WIDTH, pagesize=A4):
+        self.scale  = width / pagesize[0]
+        self.height = pagesize[1]
+        self.image  = Image.new('RGB', (width, round(pagesize[1] * self.scale)), 'white')
+        self._draw  = ImageDraw.Draw(self.image)
+        self._fill  = (0, 0, 0)
+        self._line  = (0, 0, 0)
+        self._width = 1
+        self._font  = None
+        self._face  = None      # (reportlab shrift nomi, o'lcham) — PDF dagi kenglik uchun
+        self._stack = []
+
+    def _xy(self, x, y):
+        return x * self.scale, (self.height - y) * self.scale
+
+    # ── holat ──────────────────────────────────────────────────────────────
+
+    def setFillColor(self, color):
+        self._fill = _rgb(color)
+
+    def setStrokeColor(self, color):
+        self._line = _rgb(color)
+
+    def setLineWidth(self, width):
+        self._width = max(1, round(width * self.scale))
+
+    def setFont(self, name, size):
+        self._font = _font(name, max(1, round(size * self.scale * _FONT_SCALE * 2) / 2))
+        self._face = (name, size)
+
+    def saveState(self):
+        self._stack.append((self._fill, self._line, self._width, self._font, self._face))
+
+    def restoreState(self):
+        self._fill, self._line, self._width, self._font, self._face = self._stack.pop()
+
+    def stringWidth(self, text, font, size):
+        return text_width(text, font, size)
+
+    # ── chizish ────────────────────────────────────────────────────────────
+
+    def rect(self, x, y, w, h, fill=1, stroke=1):
+        x0, y0 = self._xy(x, y + h)
+        x1, y1 = self._xy(x + w, y)
+        self._draw.rectangle((x0, y0, x1, y1), fill=self._fill if fill else None,
+                             outline=self._line if stroke else None, width=self._width)
+
+    def circle(self, x, y, r, fill=1, stroke=1):
+        x0, y0 = self._xy(x - r, y + r)
+        x1, y1 = self._xy(x + r, y - r)
+        self._draw.ellipse((x0, y0, x1, y1), fill=self._fill if fill else None,
+                           outline=self._line if stroke else None, width=self._width)
+
+    def line(self, x1, y1, x2, y2):
+        self._draw.line((*self._xy(x1, y1), *self._xy(x2, y2)), fill=self._line, width=self._width)
+
+    def drawString(self, x, y, text):
+        x, y = self._xy(x, y)
+        y = round(y)
+        font = self._font
+        words = text.split(' ')
+        parts = [font.word(w) for w in words]
+        space = font.glyph(' ')[2]
+        # Qator PDF dagidan keng chiqsa — so'zlar orasi qisqartiriladi
+        if len(parts) > 1:
+            over = sum(p[2] for p in parts) + space * (len(parts) - 1) \
+                - text_width(text, *self._face) * self.scale
+            if over > 0:
+                space = max(space / 3, space - over / (len(parts) - 1))
+        for mask, (dx, dy), advance in parts:
+            if mask is not None:
+                self._draw.bitmap((round(x) + dx, y + dy), mask, fill=self._fill)
+            x += advance + space
+
+    # ── natija ─────────────────────────────────────────────────────────────
+
+    def png(self, colors: int = 64) -> bytes:
+        """Palitrali (colors ta rang) siqilgan PNG"""
+        global _palette
+        if _palette is None:
+            # Shablon ranglari doimiy — palitra bir marta tuziladi
+            _palette = self.image.quantize(colors, method=Image.Quantize.FASTOCTREE)
+        img = self.image.quantize(palette=_palette, dither=Image.Dither.NONE)
+        buf = BytesIO()
+        img.save(buf, format='PNG', compress_level=3)
+        return buf.getvalue()
@@ -0,0 +1,134 @@
+"""
+Tayyor CV fayllari uchun kesh (content-addressed).
+
+Kalit — normallashtirilgan user_data maydonlari, rasm baytlari, format va
+shablon versiyasidan olingan sha256. Ikki qavat:
+  - xotirada LRU (RENDER_CACHE_MEM_MB)
+  - diskda, hajmi cheklangan, eng eski fayllar o'chiriladi (RENDER_CACHE_DISK_MB)
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+RENDER_CACHE_DIR     = os.getenv("RENDER_CACHE_DIR", "/tmp/cv_cache")
+RENDER_CACHE_MEM_MB  = float(os.getenv("RENDER_CACHE_MEM_MB", "32"))
+RENDER_CACHE_DISK_MB = float(os.getenv("RENDER_CACHE_DISK_MB", "256"))
+
+# Render natijasiga ta'sir qiladigan maydonlar
+TEXT_FIELDS = ('first_name', 'last_name', 'dob', 'nationality', 'email', 'phone',
+               'address', 'linkedin', 'github', 'website', 'objective', 'hobbies')
+LIST_FIELDS = ('education_list', 'work_list', 'skills_list', 'lang_list', 'cert_list')
+
+
+def cache_key(data: dict, kind: str, version) -> str:
+    norm = {k: str(data.get(k) or '').strip() for k in TEXT_FIELDS}
+    for k in LIST_FIELDS:
+        norm[k] = [str(x).strip() for x in data.get(k) or []]
+    h = hashlib.sha256()
+    h.update(json.dumps([kind, version, norm], ensure_ascii=False, sort_keys=True).encode())
+    photo = data.get('photo')
+    if photo and os.path.exists(photo):
+        with open(photo, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class RenderCache:
+
+    def __init__(self, directory: str = RENDER_CACHE_DIR,
+                 mem_bytes: int = int(RENDER_CACHE_MEM_MB * 1024 * 1024),
+                 disk_bytes: int = int(RENDER_CACHE_DISK_MB * 1024 * 1024)):
+        self.directory  = directory
+        self.mem_bytes  = mem_bytes
+        self.disk_bytes = disk_bytes
+        self._mem       = OrderedDict()   # key → bytes
+        self._mem_size  = 0
+        self._disk      = OrderedDict()   # key → hajm, eskidan yangiga
+        self._disk_size = 0
+        self.hits_mem   = 0
+        self.hits_disk  = 0
+        self.misses     = 0
+        if disk_bytes > 0:
+            os.makedirs(directory, exist_ok=True)
+            self._scan()
+
+    def _scan(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith('.tmp'):
+                os.remove(path)
+                continue
+            st = os.stat(path)
+            entries.append((st.st_mtime, name, st.st_size))
+        for _, name, size in sorted(entries):
+            self._disk[name] = size
+            self._disk_size += size
+
+    def _remember(self, key, content):
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            return
+        if len(content) > self.mem_bytes:
+            return
+        self._mem[key] = content
+        self._mem_size += len(content)
+        while self._mem_size > self.mem_bytes and self._mem:
+            _, old = self._mem.popitem(last=False)
+            self._mem_size -= len(old)
+
+    def get(self, key):
+        content = self._mem.get(key)
+        if content is not None:
+            self._mem.move_to_end(key)
+            self.hits_mem += 1
+            return content
+        if key in self._disk:
+            path = os.path.join(self.directory, key)
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+                os.utime(path)
+            except OSError:
+                self._disk_size -= self._disk.pop(key)
+            else:
+                self._disk.move_to_end(key)
+                self._remember(key, content)
+                self.hits_disk += 1
+                return content
+        self.misses += 1
+        return None
+
+    def put(self, key, content: bytes):
+        self._remember(key, content)
+        if self.disk_bytes <= 0 or key in self._disk:
+            return
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path + '.tmp', 'wb') as f:
+                f.write(content)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.warning(f"Render cache write failed: {e!r}")
+            return
+        self._disk[key] = len(content)
+        self._disk_size += len(content)
+        while self._disk_size > self.disk_bytes and self._disk:
+            old, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            'hits_mem': self.hits_mem, 'hits_disk': self.hits_disk, 'misses': self.misses,
+            'mem_bytes': self._mem_size, 'mem_items': len(self._mem),
+            'disk_bytes': self._disk_size, 'disk_items': len(self._disk),
+        }
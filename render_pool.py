@@ -0,0 +1,105 @@
+"""
+Render executor — PDF/DOCX generatsiyani alohida jarayonlarda bajaradi.
+Bot event loop'i bloklanmaydi: handle_confirm faqat natijani kutadi.
+
+Sozlamalar (env):
+  RENDER_WORKERS  — jarayonlar soni (0 = CPU yadrolari soni)
+  RENDER_QUEUE    — band ishchilar ortida kutishi mumkin bo'lgan ishlar soni
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "0")) or (os.cpu_count() or 1)
+RENDER_QUEUE   = int(os.getenv("RENDER_QUEUE", "16"))
+
+
+def _init_worker():
+    """Ishchi jarayon ishga tushganda: kutubxonalar, shrift jadvallari, DOCX
+    skeleti — birinchi foydalanuvchi bularni kutmaydi. Bot jarayoni o'zi
+    bularning hech birini yuklamaydi."""
+    import PIL.Image                # noqa: F401
+    import cv_generator
+    cv_generator.warm_up()
+
+
+def render(kind: str, model) -> bytes:
+    """Ishchi jarayonda: 'pdf', 'docx' yoki 'png' (eskiz) baytlari
+    (cv_generator shu yerda yuklanadi)"""
+    import cv_generator
+    if kind == 'pdf':
+        return cv_generator.render_pdf_bytes(model)
+    if kind == 'png':
+        return cv_generator.render_preview_bytes(model)
+    return cv_generator.render_docx_bytes(model)
+
+
+def _ping():
+    return os.getpid()
+
+
+class RenderPool:
+    """ProcessPoolExecutor ustidagi yupqa asyncio qobig'i"""
+
+    def __init__(self, workers: int = RENDER_WORKERS, queue_size: int = RENDER_QUEUE):
+        self.workers    = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self._executor  = None
+        # bir vaqtda pool'ga topshirilgan ishlar: ishlayotganlar + navbatdagilar
+        self._slots     = asyncio.Semaphore(self.workers + self.queue_size)
+        self._pending   = 0
+        self.restarts   = 0      # ishchi o'lib, pool qayta yaratilgan marta
+
+    @property
+    def pending(self) -> int:
+        """Hozir pool'da (ishlayotgan yoki navbatda) turgan ishlar soni"""
+        return self._pending
+
+    def start(self):
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=_init_worker)
+        # Jarayonlarni darhol ko'taramiz — birinchi foydalanuvchi kutmasin
+        for _ in range(self.workers):
+            self._executor.submit(_ping)
+        logger.info(f"Render pool: {self.workers} workers, queue {self.queue_size}")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _restart(self, broken):
+        # Bir vaqtda bir nechta ish BrokenProcessPool olsa — pool bir marta yangilanadi
+        if self._executor is not broken:
+            return
+        self.restarts += 1
+        logger.error(f"Render pool broken (a worker died), restarting ({self.restarts})")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self.start()
+
+    async def run(self, fn, *args):
+        """fn(*args) ni ishchi jarayonda bajaradi va natijani qaytaradi.
+        Ishchi jarayon o'lsa (OOM, segfault) ProcessPoolExecutor butunlay
+        ishdan chiqadi — pool qayta yaratiladi va ish bir marta qaytariladi."""
+        if self._executor is None:
+            self.start()
+        async with self._slots:
+            self._pending += 1
+            try:
+                loop = asyncio.get_running_loop()
+                executor = self._executor
+                try:
+                    return await loop.run_in_executor(executor, fn, *args)
+                except BrokenProcessPool:
+                    self._restart(executor)
+                    return await loop.run_in_executor(self._executor, fn, *args)
+            finally:
+                self._pending -= 1
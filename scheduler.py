@@ -0,0 +1,139 @@
+"""
+Render navbati — handle_confirm va render pool orasida.
+
+- bir vaqtda ko'pi bilan RENDER_CONCURRENCY ta ish bajariladi, qolganlari
+  RENDER_JOB_QUEUE gacha navbatda kutadi (FIFO)
+- har foydalanuvchining bittadan ortiq ishi bo'lmaydi (ishlayotgan yoki
+  navbatdagi) — shuning uchun navbat o'z-o'zidan adolatli
+- foydalanuvchi USER_RATE_WINDOW soniyada ko'pi bilan USER_RATE_LIMIT ta ish
+- navbat to'la bo'lsa darhol Busy — bot tarjima qilingan "keyinroq urinib
+  ko'ring" xabarini beradi, so'rov timeout gacha osilib turmaydi
+
+    ticket = scheduler.admit(user_id, on_queued)   # sinxron: joy band qilinadi yoki Busy
+    async with ticket:                             # navbatda bo'lsa: await on_queued(N)
+        ...  # render va yuborish
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+
+RENDER_CONCURRENCY = int(os.getenv("RENDER_CONCURRENCY", "0"))   # 0 = RENDER_WORKERS
+RENDER_JOB_QUEUE   = int(os.getenv("RENDER_JOB_QUEUE", "32"))
+USER_RATE_LIMIT    = int(os.getenv("USER_RATE_LIMIT", "5"))
+USER_RATE_WINDOW   = float(os.getenv("USER_RATE_WINDOW", "60"))
+
+SHED_RETRY_AFTER = 10   # navbat to'la bo'lganda taklif qilinadigan kutish (soniya)
+
+
+class Busy(Exception):
+    """Ish qabul qilinmadi. reason — T dagi kalit: busy_queue, busy_user, busy_rate"""
+
+    def __init__(self, reason: str, retry_after: int = 0):
+        super().__init__(reason)
+        self.reason      = reason
+        self.retry_after = retry_after
+
+
+class Ticket:
+
+    def __init__(self, scheduler, user_id, on_queued=None):
+        self._scheduler = scheduler
+        self.user_id    = user_id
+        self.on_queued  = on_queued
+        self.granted    = asyncio.get_running_loop().create_future()
+
+    @property
+    def position(self) -> int:
+        """Navbatdagi o'rni (1 dan), ish boshlangan bo'lsa 0"""
+        if self.granted.done():
+            return 0
+        return self._scheduler._waiting.index(self) + 1
+
+    async def __aenter__(self):
+        try:
+            if self.on_queued is not None and not self.granted.done():
+                await self.on_queued(self.position)
+            await asyncio.shield(self.granted)
+        except BaseException:
+            self._scheduler._release(self)
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self._scheduler._release(self)
+
+
+class RenderScheduler:
+
+    def __init__(self, concurrency: int, queue_size: int = RENDER_JOB_QUEUE,
+                 rate_limit: int = USER_RATE_LIMIT, rate_window: float = USER_RATE_WINDOW):
+        self.concurrency = max(1, concurrency)
+        self.queue_size  = max(0, queue_size)
+        self.rate_limit  = rate_limit
+        self.rate_window = rate_window
+        self._running    = 0
+        self._waiting    = deque()   # Ticket lar, FIFO
+        self._active     = {}        # user_id → Ticket
+        self._history    = {}        # user_id → deque(boshlanish vaqtlari)
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    def admit(self, user_id, on_queued=None) -> Ticket:
+        """Joy band qiladi yoki Busy ko'taradi. await yo'q — ikki bosish poyga qilmaydi."""
+        if user_id in self._active:
+            raise Busy('busy_user')
+        now = time.monotonic()
+        hist = self._history.get(user_id)
+        if hist is not None:
+            while hist and now - hist[0] >= self.rate_window:
+                hist.popleft()
+            if self.rate_limit and len(hist) >= self.rate_limit:
+                raise Busy('busy_rate', int(self.rate_window - (now - hist[0])) + 1)
+        can_run = self._running < self.concurrency and not self._waiting
+        if not can_run and len(self._waiting) >= self.queue_size:
+            raise Busy('busy_queue', SHED_RETRY_AFTER)
+
+        if hist is None:
+            hist = self._history[user_id] = deque()
+        hist.append(now)
+        ticket = self._active[user_id] = Ticket(self, user_id, on_queued)
+        if can_run:
+            self._running += 1
+            ticket.granted.set_result(None)
+        else:
+            self._waiting.append(ticket)
+        self._forget_idle(now)
+        return ticket
+
+    def _release(self, ticket):
+        if self._active.get(ticket.user_id) is not ticket:
+            return          # allaqachon bo'shatilgan
+        del self._active[ticket.user_id]
+        if ticket.granted.done():
+            self._running -= 1
+        else:
+            self._waiting.remove(ticket)
+            ticket.granted.cancel()
+        while self._waiting and self._running < self.concurrency:
+            nxt = self._waiting.popleft()
+            self._running += 1
+            nxt.granted.set_result(None)
+
+    def _forget_idle(self, now):
+        # rate tarixini cheksiz o'stirmaslik uchun: oynadan chiqqan foydalanuvchilar
+        if len(self._history) > 4 * (self.concurrency + self.queue_size) + 1024:
+            for uid in [u for u, h in self._history.items()
+                        if (not h or now - h[-1] >= self.rate_window) and u not in self._active]:
+                del self._history[uid]
+
+    def stats(self) -> dict:
+        return {'running': self._running, 'waiting': len(self._waiting),
+                'concurrency': self.concurrency, 'queue_size': self.queue_size}
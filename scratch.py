@@ -0,0 +1,109 @@
+"""
+Vaqtinchalik fayllar (foydalanuvchi rasmi) uchun boshqariladigan papka.
+
+- har fayl nomi noyob — bir foydalanuvchining ikki sessiyasi ham, ikki
+  foydalanuvchi ham bir-birining faylini ustidan yozmaydi
+- umumiy hajm SCRATCH_MAX_MB dan oshsa eng eski fayllar o'chiriladi
+- SCRATCH_TTL dan eski fayllar fon vazifasida o'chiriladi
+- suhbat tugaganda yoki /cancel da bot faylni darhol o'chiradi (discard)
+
+Fayl o'chib ketgan bo'lsa render rasmsiz davom etadi.
+
+Sozlamalar (env):
+  SCRATCH_DIR     — papka
+  SCRATCH_MAX_MB  — umumiy hajm chegarasi
+  SCRATCH_TTL     — fayl necha soniya saqlanadi
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+SCRATCH_DIR    = os.getenv("SCRATCH_DIR", "/tmp/cv_scratch")
+SCRATCH_MAX_MB = float(os.getenv("SCRATCH_MAX_MB", "64"))
+SCRATCH_TTL    = float(os.getenv("SCRATCH_TTL", "86400"))
+
+
+class Scratch:
+
+    def __init__(self, directory: str = SCRATCH_DIR,
+                 max_bytes: int = int(SCRATCH_MAX_MB * 1024 * 1024), ttl: float = SCRATCH_TTL):
+        self.directory = os.path.abspath(directory)   # discard taqqoslashi uchun
+        self.max_bytes = max_bytes
+        self.ttl       = ttl
+        self._files    = OrderedDict()   # nom → (hajm, yaratilgan vaqt), eskidan yangiga
+        self._size     = 0
+        self.evicted   = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        # Qayta ishga tushganda: saqlangan sessiyalar eski fayllarga ishora qilishi mumkin
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith('.tmp'):
+                os.remove(path)
+                continue
+            st = os.stat(path)
+            entries.append((st.st_mtime, name, st.st_size))
+        for mtime, name, size in sorted(entries):
+            self._files[name] = (size, mtime)
+            self._size += size
+
+    def write(self, content: bytes, suffix: str = '') -> str:
+        """Yangi noyob fayl yaratadi va to'liq yo'lini qaytaradi"""
+        name = uuid.uuid4().hex + suffix
+        path = os.path.join(self.directory, name)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+        self._files[name] = (len(content), time.time())
+        self._size += len(content)
+        while self._size > self.max_bytes and len(self._files) > 1:
+            self._remove(next(iter(self._files)))
+            self.evicted += 1
+        return path
+
+    def discard(self, path):
+        """Fayl kerak emas. Faqat shu papkadagi fayllar o'chiriladi."""
+        if not path or os.path.abspath(os.path.dirname(path)) != self.directory:
+            return
+        self._remove(os.path.basename(path))
+
+    def _remove(self, name):
+        entry = self._files.pop(name, None)
+        if entry is not None:
+            self._size -= entry[0]
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+    def evict_expired(self) -> int:
+        deadline = time.time() - self.ttl
+        old = [name for name, (_, created) in self._files.items() if created < deadline]
+        for name in old:
+            self._remove(name)
+        self.evicted += len(old)
+        if old:
+            logger.info(f"Scratch: removed {len(old)} expired files")
+        return len(old)
+
+    async def run_eviction(self):
+        while True:
+            await asyncio.sleep(min(self.ttl / 4, 3600))
+            try:
+                self.evict_expired()
+            except Exception as e:
+                logger.error(f"Scratch eviction failed: {e!r}")
+
+    def usage(self) -> dict:
+        return {'files': len(self._files), 'bytes': self._size,
+                'max_bytes': self.max_bytes, 'evicted': self.evicted}
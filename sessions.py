@@ -0,0 +1,135 @@
+"""
+Foydalanuvchi sessiyasi (context.user_data) — ixcham yozuv va muddat.
+
+- Session — dict o'rniga __slots__ li yozuv (ContextTypes(user_data=Session)).
+  dict interfeysi saqlangan, handler'lar o'zgarmaydi; bo'sh maydon joy
+  egallamaydi, noma'lum kalitlar (kamdan-kam) alohida kichik dict da
+- Timeouts — har suhbat kaliti (chat_id, user_id) oxirgi faolligi;
+  SESSION_TIMEOUT dan beri yozmagan foydalanuvchi suhbati yakunlanadi
+  (bot.expire_sessions). ConversationHandler.conversation_timeout JobQueue
+  (APScheduler) talab qiladi — bu yerda u yo'q, shuning uchun o'z tekshiruvi
+
+Sozlamalar (env):
+  SESSION_TIMEOUT  — necha soniya yozmagan suhbat yakunlanadi (0 = o'chirilgan)
+"""
+
+import os
+import sys
+import time
+from collections.abc import MutableMapping
+
+from cv_model import SECTIONS
+from render_cache import LIST_FIELDS, TEXT_FIELDS
+
+SESSION_TIMEOUT = float(os.getenv("SESSION_TIMEOUT", "86400"))
+
+# user_data da uchraydigan barcha kalitlar, suhbat tartibida
+FIELDS = ('lang', 'photo', 'photo_ready') + TEXT_FIELDS + LIST_FIELDS \
+    + tuple(SECTIONS) + ('format',)
+_FIELDS = frozenset(FIELDS)
+
+
+class Session(MutableMapping):
+    """user_data: ma'lum kalitlar slot larda, qolganlari _extra da"""
+
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(self, *args, **kwargs):
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        if key in _FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        try:
+            return self._extra[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key in _FIELDS:
+            setattr(self, key, value)
+        else:
+            try:
+                self._extra[key] = value
+            except AttributeError:
+                self._extra = {key: value}
+
+    def __delitem__(self, key):
+        try:
+            if key in _FIELDS:
+                delattr(self, key)
+            else:
+                del self._extra[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        yield from getattr(self, '_extra', ())
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        # Mapping.get KeyError orqali ishlaydi — bu yo'l har handler'da, tezroq
+        if key in _FIELDS:
+            return getattr(self, key, default)
+        return getattr(self, '_extra', {}).get(key, default)
+
+    def clear(self):
+        for key in __class__.__slots__:
+            if hasattr(self, key):
+                delattr(self, key)
+
+    def __repr__(self):
+        return f"Session({dict(self)!r})"
+
+    def nbytes(self) -> int:
+        """Yozuv va undagi qiymatlar egallagan xotira (taxminan, bayt)"""
+        return sys.getsizeof(self) + sum(_sizeof(v) for v in self.values())
+
+
+def _sizeof(value, depth=0) -> int:
+    size = sys.getsizeof(value)
+    if depth < 3:
+        if isinstance(value, (list, tuple)):
+            size += sum(_sizeof(v, depth + 1) for v in value)
+        elif hasattr(value, '__slots__'):    # cv_model dataclass lari
+            size += sum(_sizeof(getattr(value, k), depth + 1) for k in value.__slots__)
+    return size
+
+
+class Timeouts:
+    """Suhbat kaliti → oxirgi faollik (monotonic). touch — har update da"""
+
+    def __init__(self, timeout: float = SESSION_TIMEOUT):
+        self.timeout = timeout
+        self._seen   = {}
+
+    async def touch(self, update, context):
+        # TypeHandler(Update, ...) — ConversationHandler dan oldingi guruhda
+        if update.effective_chat is not None and update.effective_user is not None:
+            self._seen[(update.effective_chat.id, update.effective_user.id)] = time.monotonic()
+
+    def expired(self, conversations) -> list:
+        """conversations (kalit → holat) dagi muddati o'tgan kalitlar.
+        Qayta ishga tushgandan keyin bazadan yuklangan suhbatlar hisobi
+        birinchi tekshiruvdan boshlanadi."""
+        now = time.monotonic()
+        for key in [k for k in self._seen if k not in conversations]:
+            del self._seen[key]
+        deadline = now - self.timeout
+        return [key for key in list(conversations)
+                if self._seen.setdefault(key, now) < deadline]
+
+    def forget(self, key):
+        self._seen.pop(key, None)
+
+    def __len__(self):
+        return len(self._seen)
@@ -0,0 +1,336 @@
+"""
+Suhbat holatini SQLite (WAL) da saqlash — bot qayta ishga tushganda
+yarim qolgan CV lar yo'qolmaydi.
+
+- Yozuvlar darhol emas, paket (batch) holida bitta tranzaksiyada yoziladi
+- Uzoq vaqt faol bo'lmagan foydalanuvchilar user_data si xotiradan
+  chiqariladi va keyingi xabarda bazadan qayta yuklanadi
+- Suhbat tugaganda yoki muddati o'tganda (bot.end_session, SESSION_TIMEOUT)
+  user_data bazadan ham o'chiriladi
+- Yuborilgan hujjatlarning Telegram file_id lari (FileIdCache) — bir xil
+  fayl qayta yuklanmaydi, havola bilan yuboriladi
+- Ko'p jarayonli rejimda (cluster.py) bitta baza umumiy; har worker faqat
+  o'z foydalanuvchilari (shard_of) suhbatlarini yuklaydi va yozadi
+
+Sozlamalar (env):
+  STATE_DB              — baza fayli yo'li
+  STATE_FLUSH_INTERVAL  — bazaga yozish oralig'i (soniya)
+  SESSION_IDLE_TTL      — necha soniyadan keyin sessiya xotiradan chiqariladi
+  FILE_ID_CACHE_SIZE    — nechta file_id saqlanadi (LRU)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+
+from telegram.ext import BasePersistence, ConversationHandler, PersistenceInput
+from telegram.ext._conversationhandler import PendingState   # ochiq nomi yo'q (PTB 20.7)
+
+logger = logging.getLogger(__name__)
+
+STATE_DB             = os.getenv("STATE_DB", "cv_bot.db")
+STATE_FLUSH_INTERVAL = float(os.getenv("STATE_FLUSH_INTERVAL", "10"))
+SESSION_IDLE_TTL     = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+FILE_ID_CACHE_SIZE   = int(os.getenv("FILE_ID_CACHE_SIZE", "10000"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_data (
+    user_id INTEGER PRIMARY KEY,
+    data    BLOB NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conversations (
+    name  TEXT NOT NULL,
+    key   TEXT NOT NULL,
+    state BLOB NOT NULL,
+    PRIMARY KEY (name, key)
+);
+CREATE TABLE IF NOT EXISTS file_ids (
+    hash    TEXT PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    used    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS file_ids_used ON file_ids (used);
+"""
+
+
+def shard_of(user_id: int, count: int) -> int:
+    """Foydalanuvchi qaysi worker ga tegishli (cluster.py bilan bir xil qoida)"""
+    return user_id % count
+
+
+def connect(path: str = STATE_DB) -> sqlite3.Connection:
+    db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("PRAGMA busy_timeout=5000")
+    db.executescript(_SCHEMA)
+    return db
+
+
+def _pending(application) -> set:
+    """block=False handler i hali tugamagan (holati PendingState) user_id lar.
+    Kalit (chat_id, user_id) — oxirgi element."""
+    return {key[-1]
+            for handlers in application.handlers.values()
+            for handler in handlers if isinstance(handler, ConversationHandler)
+            for key, state in list(handler._conversations.items())
+            if isinstance(state, PendingState) and not state.done()}
+
+
+class FileIdCache:
+    """Yuborilgan hujjat (tarkib + fayl nomi sha256) → Telegram file_id.
+
+    Xotirada LRU, bazada nusxasi — qayta ishga tushganda ham saqlanadi.
+    file_id faqat shu bot uchun amal qiladi. get bazaga yozmaydi: oxirgi
+    ishlatilish vaqti xotirada yig'iladi va persistence flush ida yoziladi."""
+
+    def __init__(self, db: sqlite3.Connection, size: int = FILE_ID_CACHE_SIZE):
+        self.size = max(1, size)
+        self._db  = db
+        self._lru = OrderedDict()   # hash → file_id, eskidan yangiga
+        self._used = {}             # hash → oxirgi ishlatilish, bazaga yozilmagan
+        rows = db.execute("SELECT hash, file_id FROM file_ids ORDER BY used DESC LIMIT ?",
+                          (self.size,)).fetchall()
+        for h, fid in reversed(rows):
+            self._lru[h] = fid
+        if len(rows) == self.size:
+            # size kamaytirilgan bo'lsa — ortiqchasini o'chiramiz
+            db.execute("DELETE FROM file_ids WHERE used < (SELECT MIN(used) FROM "
+                       "(SELECT used FROM file_ids ORDER BY used DESC LIMIT ?))", (self.size,))
+
+    @staticmethod
+    def key(content: bytes, filename: str) -> str:
+        # fayl nomi file_id ga bog'langan — u ham kalitga kiradi
+        h = hashlib.sha256(content)
+        h.update(b'\0' + filename.encode())
+        return h.hexdigest()
+
+    def get(self, key):
+        fid = self._lru.get(key)
+        if fid is not None:
+            self._lru.move_to_end(key)
+            self._used[key] = time.time()
+        return fid
+
+    def put(self, key, file_id: str):
+        self._lru[key] = file_id
+        self._used.pop(key, None)
+        self._lru.move_to_end(key)
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO file_ids VALUES (?, ?, ?)",
+                             (key, file_id, time.time()))
+            while len(self._lru) > self.size:
+                old, _ = self._lru.popitem(last=False)
+                self._used.pop(old, None)
+                self._db.execute("DELETE FROM file_ids WHERE hash = ?", (old,))
+
+    def drop(self, key):
+        """Telegram file_id ni qabul qilmasa"""
+        self._used.pop(key, None)
+        if self._lru.pop(key, None) is not None:
+            self._db.execute("DELETE FROM file_ids WHERE hash = ?", (key,))
+
+    def write_used(self):
+        """Yig'ilgan ishlatilish vaqtlarini yozadi (chaqiruvchi tranzaksiyasida)"""
+        if self._used:
+            used, self._used = self._used, {}
+            self._db.executemany("UPDATE file_ids SET used = ? WHERE hash = ?",
+                                 [(ts, h) for h, ts in used.items()])
+
+    def __len__(self):
+        return len(self._lru)
+
+
+class SQLitePersistence(BasePersistence):
+    """user_data va ConversationHandler holatlari uchun persistence.
+
+    Application har update_interval da o'zgargan ma'lumotlarni beradi;
+    ular avval xotirada yig'iladi, so'ng bitta tranzaksiyada yoziladi.
+    shard=(index, count) — faqat shu worker foydalanuvchilari suhbatlari yuklanadi.
+    """
+
+    def __init__(self, path: str = STATE_DB,
+                 update_interval: float = STATE_FLUSH_INTERVAL,
+                 idle_ttl: float = SESSION_IDLE_TTL, shard: tuple = None):
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=False, callback_data=False),
+            update_interval=update_interval,
+        )
+        self.path      = path
+        self.shard     = shard
+        # Bir yangilanish davridan oldin chiqarib yubormaslik uchun
+        self.idle_ttl  = max(idle_ttl, 2 * update_interval)
+        self._db       = connect(path)
+        self._users    = {}      # user_id → pickle (None = o'chirish)
+        self._convs    = {}      # (name, key) → pickle (None = o'chirish)
+        self._flushing = None
+        self._resident = set()   # user_data si xotirada turgan foydalanuvchilar
+        self._seen     = {}      # user_id → oxirgi faollik (monotonic)
+        self.file_ids  = FileIdCache(self._db)
+
+    # ── Yozish (write-behind) ─────────────────────────────────────────────
+
+    def _schedule_flush(self):
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.create_task(self._flush_soon())
+
+    async def _flush_soon(self):
+        # Shu davrdagi barcha update_* chaqiruvlari yig'ilib olsin
+        await asyncio.sleep(0.5)
+        self._write()
+
+    def _write(self):
+        if not self._users and not self._convs and not self.file_ids._used:
+            return
+        users, self._users = self._users, {}
+        convs, self._convs = self._convs, {}
+        now = time.time()
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO user_data VALUES (?, ?, ?)",
+                [(uid, blob, now) for uid, blob in users.items() if blob is not None])
+            self._db.executemany(
+                "DELETE FROM user_data WHERE user_id = ?",
+                [(uid,) for uid, blob in users.items() if blob is None])
+            self._db.executemany(
+                "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?)",
+                [(n, k, blob) for (n, k), blob in convs.items() if blob is not None])
+            self._db.executemany(
+                "DELETE FROM conversations WHERE name = ? AND key = ?",
+                [(n, k) for (n, k), blob in convs.items() if blob is None])
+            self.file_ids.write_used()
+        logger.debug(f"State flush: {len(users)} users, {len(convs)} conversations")
+
+    async def update_user_data(self, user_id, data):
+        # Session (sessions.py) bazaga oddiy dict bo'lib yoziladi
+        self._users[user_id] = pickle.dumps(dict(data))
+        self._schedule_flush()
+
+    async def drop_user_data(self, user_id):
+        self._users[user_id] = None
+        self._resident.discard(user_id)
+        self._seen.pop(user_id, None)
+        self._schedule_flush()
+
+    async def update_conversation(self, name, key, new_state):
+        k = json.dumps(list(key))
+        # END (block=False handler natijasi) ham yozilmaydi — suhbat tugagan
+        done = new_state is None or new_state == ConversationHandler.END
+        self._convs[(name, k)] = None if done else pickle.dumps(new_state)
+        self._schedule_flush()
+
+    async def flush(self):
+        if self._flushing is not None and not self._flushing.done():
+            self._flushing.cancel()
+        self._write()
+        self._db.close()
+
+    # ── O'qish ────────────────────────────────────────────────────────────
+
+    async def get_user_data(self):
+        # Hech narsa oldindan yuklanmaydi — refresh_user_data da kerak bo'lganda
+        return {}
+
+    async def get_conversations(self, name):
+        rows = self._db.execute(
+            "SELECT key, state FROM conversations WHERE name = ?", (name,)).fetchall()
+        convs = ((tuple(json.loads(k)), s) for k, s in rows)
+        if self.shard is not None:
+            # kalit (chat_id, user_id) — boshqa worker larniki yuklanmaydi
+            index, count = self.shard
+            convs = ((k, s) for k, s in convs if shard_of(k[-1], count) == index)
+        return {k: pickle.loads(s) for k, s in convs}
+
+    def _load_user(self, user_id):
+        if user_id in self._users:
+            blob = self._users[user_id]
+        else:
+            row = self._db.execute(
+                "SELECT data FROM user_data WHERE user_id = ?", (user_id,)).fetchone()
+            blob = row[0] if row else None
+        return pickle.loads(blob) if blob is not None else None
+
+    def stored_user_data(self, user_id) -> dict:
+        """Xotiradan chiqarilgan sessiya (yoki None) — qayta yuklamasdan"""
+        return self._load_user(user_id)
+
+    async def refresh_user_data(self, user_id, user_data):
+        self._seen[user_id] = time.monotonic()
+        if user_id in self._resident:
+            return
+        self._resident.add(user_id)
+        stored = self._load_user(user_id)
+        if stored:
+            user_data.update(stored)
+
+    # ── Faol bo'lmagan sessiyalarni xotiradan chiqarish ────────────────────
+
+    def evict_idle(self, application) -> int:
+        """idle_ttl dan beri faol bo'lmagan user_data larni xotiradan chiqaradi.
+        Ma'lumot bazada qoladi va keyingi update da qayta yuklanadi.
+
+        PTB 20.7 ichki qismlariga tayanadi (requirements.txt shu versiyani
+        qotiradi): Application._user_data, persistence navbatlari va
+        ConversationHandler._conversations. Persistence navbatidagi yoki
+        block=False handler i hali ishlayotgan foydalanuvchi chiqarilmaydi —
+        aks holda update_persistence bo'sh user_data yaratib, bazadagi yozuv
+        ustidan yozadi."""
+        self._write()
+        deadline = time.monotonic() - self.idle_ttl
+        busy = (application._user_ids_to_be_updated_in_persistence
+                | application._user_ids_to_be_deleted_in_persistence
+                | _pending(application))
+        idle = [uid for uid, ts in self._seen.items() if ts < deadline and uid not in busy]
+        for uid in idle:
+            del self._seen[uid]
+            self._resident.discard(uid)
+            # Application da user_data ni "o'chirmasdan" chiqarishning ochiq API si yo'q
+            application._user_data.pop(uid, None)
+        if idle:
+            logger.info(f"Paged out {len(idle)} idle sessions")
+        return len(idle)
+
+    async def run_eviction(self, application):
+        while True:
+            await asyncio.sleep(self.idle_ttl / 4)
+            try:
+                self.evict_idle(application)
+            except Exception as e:
+                logger.error(f"Session eviction failed: {e!r}")
+
+    # ── Ishlatilmaydigan ma'lumot turlari ──────────────────────────────────
+
+    async def get_chat_data(self):
+        return {}
+
+    async def get_bot_data(self):
+        return {}
+
+    async def get_callback_data(self):
+        return None
+
+    async def update_chat_data(self, chat_id, data):
+        pass
+
+    async def update_bot_data(self, data):
+        pass
+
+    async def update_callback_data(self, data):
+        pass
+
+    async def drop_chat_data(self, chat_id):
+        pass
+
+    async def refresh_chat_data(self, chat_id, chat_data):
+        pass
+
+    async def refresh_bot_data(self, bot_data):
+        pass
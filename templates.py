@@ -0,0 +1,116 @@
+"""
+CV dizaynlari — kod emas, ma'lumot: sahifa, o'lchamlar, ranglar, shriftlar
+va bo'limlar tartibi. pdf_plan.compile_plan() har shablonni bir marta render
+rejasiga (tayyor koordinatalar va uslublar) aylantiradi.
+
+Qoidalar:
+  - o'lchamlar pt da (mm bilan ko'paytirib yozilgan)
+  - ranglar — 'colors' dagi nom yoki '#RRGGBB'
+  - uslub — (shrift roli, o'lcham, rang): ('bold', 7.5, 'gold')
+  - bo'lim turlari — pdf_plan.SIDEBAR va pdf_plan.MAIN kalitlari
+
+Yangi dizayn: EUROPASS dan nusxa olib o'zgartiring va TEMPLATES ga qo'shing.
+"""
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+
+EUROPASS = {
+    'name': 'europass',
+    'page': A4,
+    'fonts': {
+        'regular': 'Helvetica',
+        'bold':    'Helvetica-Bold',
+        'italic':  'Helvetica-Oblique',
+    },
+    'colors': {
+        'bg':      '#1B3A6B',   # sidebar fon
+        'accent':  '#2761AB',   # asosiy ko'k
+        'gold':    '#E9B949',
+        'white':   '#FFFFFF',
+        'dark':    '#1C1C1C',
+        'gray':    '#5A5A5A',
+        'rule':    '#E8EEF6',   # bo'limlar orasidagi chiziq
+        'label':   '#9BB8D4',   # sidebar yorliqlari
+        'dot_off': '#334F7A',   # til darajasi — bo'sh doira
+    },
+
+    # ── Sidebar ──────────────────────────────────────────────────────────
+    'sidebar': {
+        'width':      63 * mm,
+        'pad':        7 * mm,
+        'background': 'bg',
+        'section': {
+            'gap':       9 * mm,
+            'title':     ('bold', 7.5, 'gold'),
+            'rule_gap':  3,
+            'rule':      ('gold', 0.5),
+            'after':     4.5,
+        },
+        'label':      ('bold', 6.5, 'label'),
+        'label_after': 3.5 * mm,
+        'value':      ('regular', 8.5, 'white'),
+        'value_lh':   3.8 * mm,
+        'value_after': 1.5 * mm,
+        'sections': [
+            {'type': 'photo', 'size': 48 * mm, 'top': 10 * mm, 'after': 7 * mm,
+             'fill': 'accent', 'ring': ('gold', 2.5),
+             'initials': ('bold', 26, 'gold'), 'initials_drop': 9},
+            {'type': 'fields', 'title': 'Contact', 'fields': [
+                ('Email', 'email'), ('Phone', 'phone'), ('Address', 'address'),
+                ('LinkedIn', 'linkedin'), ('GitHub', 'github'), ('Website', 'website'),
+            ]},
+            {'type': 'fields', 'title': 'Personal', 'fields': [
+                ('Date of Birth', 'dob'), ('Nationality', 'nationality'),
+            ]},
+            {'type': 'languages', 'title': 'Languages',
+             'name': ('bold', 9, 'white'), 'name_after': 3.8 * mm,
+             'level': ('italic', 8, 'gold'), 'after': 6 * mm,
+             'dots': {'x': 24 * mm, 'dy': 1.5, 'r': 2.5, 'gap': 7, 'total': 5,
+                      'on': 'gold', 'off': 'dot_off'}},
+            {'type': 'skills', 'title': 'Skills',
+             'category': ('bold', 7.5, 'gold'), 'category_after': 3.5 * mm,
+             'after': 2 * mm},
+        ],
+    },
+
+    # ── Asosiy ustun ─────────────────────────────────────────────────────
+    'main': {
+        'pad': 7 * mm,
+        'section': {
+            'gap':       6 * mm,
+            'marker':    ('accent', 1.5, 4 * mm, 1 * mm),   # rang, qalinlik, uzunlik, balandlik
+            'title':     ('bold', 11, 'dark'),
+            'title_x':   5.5 * mm,
+            'rule_gap':  2 * mm,
+            'rule':      ('rule', 0.8),
+            'after':     4 * mm,
+        },
+        'entry': {
+            'title':          ('bold', 10, 'dark'),
+            'date':           ('italic', 8.5, 'gray'),
+            'title_after':    4.5 * mm,
+            'subtitle':       ('bold', 8.5, 'accent'),
+            'subtitle_after': 4 * mm,
+            'bullet':         ('bold', 9.5, 'accent'),
+            'bullet_indent':  4.5 * mm,
+            'after':          2 * mm,
+        },
+        'body':    ('regular', 9.5, 'dark'),
+        'body_lh': 4.5 * mm,
+        'sections': [
+            {'type': 'bar', 'color': 'gold', 'width': 4, 'height': 36 * mm},
+            {'type': 'name', 'top': 11 * mm, 'font': 'bold', 'size': 19,
+             'first': 'bg', 'last': 'accent', 'after': 6 * mm},
+            {'type': 'objective', 'style': ('italic', 9.5, 'gray'), 'after': 3 * mm},
+            {'type': 'entries', 'title': 'Education', 'source': 'education'},
+            {'type': 'entries', 'title': 'Work Experience', 'source': 'work'},
+            {'type': 'certificates', 'title': 'Certificates',
+             'name': ('bold', 9.5, 'dark'), 'after': 5 * mm},
+            {'type': 'text', 'title': 'Interests', 'field': 'hobbies'},
+        ],
+    },
+}
+
+TEMPLATES = {t['name']: t for t in (EUROPASS,)}
+DEFAULT_TEMPLATE = 'europass'
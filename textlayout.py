@@ -0,0 +1,92 @@
+"""
+Matnni qatorlarga bo'lish va qisqartirish (PDF uchun).
+
+- Har bir belgi kengligi shrift bo'yicha bir marta o'lchanadi va keshlanadi
+- So'zlar bir marta o'lchanadi, qatorlar bitta greedy o'tishda yig'iladi
+- Qisqartirish — prefiks kengliklari bo'yicha binary search
+- Natijalar (text, font, size, max_w) kaliti bilan LRU keshda
+
+Kengliklar shriftning 1000 birlik tizimida butun son sifatida yig'iladi va
+oxirida 0.001*size ga ko'paytiriladi — ReportLab stringWidth bilan aynan bir
+xil natija, shuning uchun qator bo'linishlari avvalgidek qoladi.
+"""
+
+from functools import lru_cache
+from itertools import accumulate
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+ELLIPSIS = '...'
+
+_glyphs = {}   # font → {belgi: kenglik (1000 birlikda)}
+
+
+def _table(font):
+    table = _glyphs.get(font)
+    if table is None:
+        table = _glyphs[font] = {}
+    return table
+
+
+def _units(text, font):
+    table = _table(font)
+    total = 0
+    for ch in text:
+        w = table.get(ch)
+        if w is None:
+            w = table[ch] = round(stringWidth(ch, font, 1000), 6)
+        total += w
+    return total
+
+
+def warm(fonts, chars):
+    """Belgi kengliklarini oldindan hisoblash (render jarayoni ishga tushganda)"""
+    for font in fonts:
+        _units(chars, font)
+
+
+def text_width(text, font, size):
+    return _units(text, font) * 0.001 * size
+
+
+@lru_cache(maxsize=4096)
+def wrap(text, font, size, max_w):
+    """Qatorlar ro'yxati (tuple). Bitta so'z max_w dan uzun bo'lsa, u alohida qatorda qoladi."""
+    words = text.split()
+    if not words:
+        return ()
+    space = _units(' ', font)
+    scale = 0.001 * size
+    lines, line, lw = [], [], 0
+    for w in words:
+        ww = _units(w, font)
+        if line and (lw + space + ww) * scale > max_w:
+            lines.append(' '.join(line))
+            line, lw = [w], ww
+        elif line:
+            line.append(w)
+            lw += space + ww
+        else:
+            line, lw = [w], ww
+    lines.append(' '.join(line))
+    return tuple(lines)
+
+
+@lru_cache(maxsize=4096)
+def truncate(text, font, size, max_w):
+    """max_w ga sig'masa, oxiridan qisqartirib '...' qo'shadi"""
+    scale = 0.001 * size
+    if _units(text, font) * scale <= max_w:
+        return text
+    table = _table(font)
+    ell = _units(ELLIPSIS, font)
+    prefix = list(accumulate((table[ch] for ch in text), initial=0))
+    # (prefix[i] + ellipsis) * scale <= max_w bo'ladigan eng katta i
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if (prefix[mid] + ell) * scale <= max_w:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + ELLIPSIS
@@ -0,0 +1,198 @@
+"""
+Webhook rejimi — Telegram update larini lokal HTTP server orqali qabul qiladi
+va polling'dagi kabi o'sha Application ga uzatadi.
+
+POST so'rov tanasi bitta update (Telegram shunday yuboradi) yoki update lar
+massivi bo'lishi mumkin — massiv test/yuklama uchun ommaviy yuborish.
+
+Telegram bilan ulanish sozlamalari ham shu yerda — bot.py ham, cluster.py
+front jarayoni ham (bot.py ni import qilmasdan) ishlatadi.
+
+Sozlamalar (env):
+  BOT_TOKEN       — bot tokeni
+  BOT_API_URL     — o'zimizning Bot API server (telegram-bot-api) yoki yuklama
+                    testi uchun, masalan "http://127.0.0.1:8081/bot"
+  WEBHOOK_URL     — ochiq HTTPS manzil; berilsa bot webhook rejimida ishlaydi
+  WEBHOOK_SECRET  — X-Telegram-Bot-Api-Secret-Token tekshiruvi uchun
+  WEBHOOK_HOST    — tinglanadigan interfeys
+  PORT            — tinglanadigan port (Railway o'zi beradi)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from telegram import Update
+
+logger = logging.getLogger(__name__)
+
+BOT_TOKEN      = os.getenv("BOT_TOKEN", "8516447460:AAG3YTQiXrtUAl4316hOFUCz0KHfYHSSgi0")
+BOT_API_URL    = os.getenv("BOT_API_URL", "")
+WEBHOOK_URL    = os.getenv("WEBHOOK_URL", "")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBHOOK_HOST   = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT   = int(os.getenv("PORT", "8080"))
+
+MAX_BODY = 16 * 1024 * 1024
+
+# Suhbat faqat shu update turlarini ishlatadi
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found',
+            405: 'Method Not Allowed'}
+
+
+def api_urls() -> dict:
+    """Bot / ApplicationBuilder uchun base_url va base_file_url (BOT_API_URL bo'lsa)"""
+    if not BOT_API_URL:
+        return {}
+    root, _, tail = BOT_API_URL.rpartition('/')
+    return {'base_url': BOT_API_URL, 'base_file_url': f"{root}/file/{tail}"}
+
+
+# ─── Minimal HTTP/1.1 server ──────────────────────────────────────────────────
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, _ = line.decode('latin-1').split(' ', 2)
+    headers = {}
+    while True:
+        h = await reader.readline()
+        if h in (b'\r\n', b'\n', b''):
+            break
+        k, _, v = h.decode('latin-1').partition(':')
+        headers[k.strip().lower()] = v.strip()
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY:
+        raise ValueError('body too large')
+    body = await reader.readexactly(length) if length else b''
+    return method, urlparse(target).path, headers, body
+
+
+def _response(status, body=b'', content_type='text/plain; charset=utf-8', keep_alive=True):
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+async def serve_http(routes: dict, host: str, port: int):
+    """routes: path → async handler(method, headers, body) → (status, content_type, body)"""
+
+    async def on_client(reader, writer):
+        try:
+            while True:
+                try:
+                    req = await _read_request(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                except ValueError:
+                    # buzilgan so'rov yoki juda katta tana
+                    writer.write(_response(400, keep_alive=False))
+                    break
+                if req is None:
+                    break
+                method, path, headers, body = req
+                handler = routes.get(path)
+                if handler is None:
+                    status, ctype, out = 404, 'text/plain; charset=utf-8', b''
+                else:
+                    try:
+                        status, ctype, out = await handler(method, headers, body)
+                    except Exception as e:
+                        logger.error(f"HTTP handler error on {path}: {e!r}")
+                        status, ctype, out = 400, 'text/plain; charset=utf-8', b''
+                keep = headers.get('connection', '').lower() != 'close'
+                writer.write(_response(status, out, ctype, keep))
+                await writer.drain()
+                if not keep:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(on_client, host, port)
+
+
+# ─── Telegram webhook ─────────────────────────────────────────────────────────
+
+def payload_handler(put):
+    """Webhook endpoint: bitta update yoki update lar massivi; har biri (dict)
+    put(item) ga beriladi"""
+
+    async def handle(method, headers, body):
+        if method != 'POST':
+            return 405, 'text/plain; charset=utf-8', b''
+        if WEBHOOK_SECRET and headers.get('x-telegram-bot-api-secret-token') != WEBHOOK_SECRET:
+            return 403, 'text/plain; charset=utf-8', b''
+        payload = json.loads(body)
+        items = payload if isinstance(payload, list) else [payload]
+        for item in items:
+            await put(item)
+        return 200, 'application/json', json.dumps({'accepted': len(items)}).encode()
+
+    return handle
+
+
+def update_handler(app):
+    """Update larni shu Application navbatiga qo'yadi"""
+
+    async def put(item):
+        await app.update_queue.put(Update.de_json(item, app.bot))
+
+    return payload_handler(put)
+
+
+def stop_event():
+    """SIGINT/SIGTERM da o'rnatiladigan Event"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    return stop
+
+
+@asynccontextmanager
+async def running(app):
+    """Application.run_polling dagi hayot sikli, updater siz: initialize →
+    post_init → start ... stop → post_stop → shutdown → post_shutdown"""
+    await app.initialize()
+    if app.post_init:
+        await app.post_init(app)
+    await app.start()
+    try:
+        yield app
+    finally:
+        await app.stop()
+        if app.post_stop:
+            await app.post_stop(app)
+        await app.shutdown()
+        if app.post_shutdown:
+            await app.post_shutdown(app)
+
+
+async def run_webhook(app, allowed_updates):
+    """Application.run_polling ning webhook muqobili (xuddi shu hayot sikli bilan)"""
+    stop = stop_event()
+    async with running(app):
+        await app.bot.set_webhook(
+            WEBHOOK_URL,
+            allowed_updates=allowed_updates,
+            secret_token=WEBHOOK_SECRET or None,
+        )
+        path = urlparse(WEBHOOK_URL).path or '/'
+        server = await serve_http({path: update_handler(app)}, WEBHOOK_HOST, WEBHOOK_PORT)
+        logger.info(f"Webhook listening on {WEBHOOK_HOST}:{WEBHOOK_PORT}{path}")
+        try:
+            await stop.wait()
+        finally:
+            server.close()
+            await server.wait_closed()